@@ -0,0 +1,210 @@
+"""
+bench_page_objects.py
+
+Micro-benchmarks for the page-object actions, run against the local stand-in site
+so the numbers measure our code and the browser rather than the live GUVI servers.
+
+Every case runs `warmup` untimed iterations, then `iterations` timed ones.
+Percentiles are compared with a stored baseline JSON and the run exits with
+status 1 when any case's p50 or p95 got slower than the configured threshold.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.benchmarks.bench_page_objects
+    python -m Project1_Guvi_Automation.benchmarks.bench_page_objects --save-baseline
+    python -m Project1_Guvi_Automation.benchmarks.bench_page_objects --case login_submit --iterations 50
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+from Project1_Guvi_Automation.config_reader import get_config, project_path
+from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.pages.login_page import Login_Page
+from Project1_Guvi_Automation.pages.signup_page import Signup_Page
+from Project1_Guvi_Automation.pages.dashboard_page import Dashboard_Page
+from Project1_Guvi_Automation.utils.driver_factory import create_driver
+from Project1_Guvi_Automation.utils.run_history import percentile
+from Project1_Guvi_Automation.utils.standin_site import StandInSite
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+# ---------------------- BENCHMARK CASES ----------------------
+# Each case is (prepare, action): prepare puts the browser in the starting state
+# and is not timed, action is the page-object work being measured.
+
+def _open_home(driver):
+    driver.get(get_config("guvi", "url"))
+
+
+def _open_sign_in(driver):
+    driver.get(get_config("login_guvi", "url"))
+
+
+def _open_register(driver):
+    driver.get(get_config("signup_guvi", "url"))
+
+
+def _open_dashboard(driver):
+    driver.get(get_config("dashboard_guvi", "url"))
+
+
+def bench_navigate_to_url(driver):
+    Home_Page(driver).navigate_to_url()
+
+
+def bench_get_title(driver):
+    Home_Page(driver).get_title()
+
+
+def bench_login_submit(driver):
+    loginpage = Login_Page(driver)
+    loginpage.enter_username(get_config("login_guvi", "valid_username"))
+    loginpage.enter_password(get_config("login_guvi", "valid_password"))
+    loginpage.click_login()
+    loginpage.wait_login_load()
+
+
+def bench_signup_form_fill(driver):
+    signup = Signup_Page(driver)
+    signup.enter_name(get_config("signup_guvi", "name"))
+    signup.enter_email(get_config("signup_guvi", "email"))
+    signup.enter_password(get_config("signup_guvi", "password"))
+    signup.enter_mobile_number(get_config("signup_guvi", "mobile"))
+    signup.click_signup()
+    signup.enter_current_profile_dropdown()
+    signup.enter_degree_dropdown()
+    signup.enter_year_passed_out(get_config("signup_guvi", "year"))
+    signup.click_submit()
+    signup.signup_success_message()
+
+
+def bench_menu_verification(driver):
+    results = Home_Page(driver).verify_and_click_menu_items()
+    failed = {name: status for name, status in results.items() if status != "Passed"}
+    assert not failed, f"Menu verification failed: {failed}"
+
+
+def bench_logout(driver):
+    dashboard = Dashboard_Page(driver)
+    dashboard.click_logout_dropdown()
+    dashboard.click_logout()
+    dashboard.wait_logout_load()
+
+
+CASES = {
+    "navigate_to_url": (_open_register, bench_navigate_to_url),
+    "get_title": (_open_home, bench_get_title),
+    "login_submit": (_open_sign_in, bench_login_submit),
+    "signup_form_fill": (_open_register, bench_signup_form_fill),
+    "menu_verification": (_open_home, bench_menu_verification),
+    "logout": (_open_dashboard, bench_logout),
+}
+
+
+# ---------------------- RUNNING ----------------------
+
+def run_case(driver, name, warmup, iterations):
+    """Run one case and return its timing statistics in milliseconds."""
+    prepare, action = CASES[name]
+    samples = []
+    for i in range(warmup + iterations):
+        prepare(driver)
+        start = time.perf_counter()
+        action(driver)
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+
+    stats = {
+        "iterations": iterations,
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min": min(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
+    logger.info(f"{name}: p50={stats['p50']:.1f} ms p95={stats['p95']:.1f} ms")
+    return stats
+
+
+def compare(results, baseline, threshold):
+    """
+    Return the list of regressions: cases whose p50 or p95 is more than
+    `threshold` (0.2 = 20%) slower than the baseline.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        for key in ("p50", "p95"):
+            if base[key] and stats[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name} {key}: {stats[key]:.1f} ms vs baseline {base[key]:.1f} ms "
+                                   f"(+{(stats[key] / base[key] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the page-object actions against the stand-in site")
+    parser.add_argument("--browser", default=get_config("benchmark", "browser", "chrome"))
+    parser.add_argument("--iterations", type=int, default=int(get_config("benchmark", "iterations", "20")))
+    parser.add_argument("--warmup", type=int, default=int(get_config("benchmark", "warmup", "3")))
+    parser.add_argument("--threshold", type=float, default=float(get_config("benchmark", "threshold", "0.2")),
+                        help="allowed slowdown before failing, 0.2 = 20%%")
+    parser.add_argument("--baseline", default=get_config("benchmark", "baseline_path", "benchmarks/baseline.json"))
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    args = parser.parse_args(argv)
+
+    baseline_path = project_path(args.baseline)
+    results = {}
+    with StandInSite():
+        driver = create_driver(args.browser, headless=not args.headed)
+        try:
+            # Same waits as the setup fixture so timings match the test suite
+            driver.implicitly_wait(10)
+            for name in args.case or CASES:
+                results[name] = run_case(driver, name, args.warmup, args.iterations)
+        finally:
+            driver.quit()
+
+    print(f"{'case':<20}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for name, stats in results.items():
+        print(f"{name:<20}{stats['p50']:>10.1f}{stats['p90']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "browser": args.browser,
+                "platform": platform.platform(),
+                "created_at": time.time(),
+                "cases": results,
+            }, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, run with --save-baseline first")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -1,18 +1,94 @@
+import os
 from configparser import ConfigParser
 
-def get_config(section, key):
+# Folder of this project, used to resolve config.ini and relative artifact paths
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def project_path(path):
+    """
+     Returns path unchanged when it is absolute, otherwise relative to the project folder.
+     Lets command line tools run from any working directory.
+     """
+    return path if os.path.isabs(path) else os.path.join(PROJECT_DIR, path)
+
+# Folder the files written by a run go to instead of the project folder (see set_artifacts_dir)
+_artifacts = {"dir": None}
+
+def set_artifacts_dir(path):
+    """
+     Resolves relative artifact paths (artifact_path) under path instead of the project folder; None restores it.
+     Lets runs in parallel, e.g. the browser matrix cells, keep their history, caches and traces apart.
+     """
+    _artifacts["dir"] = os.path.abspath(path) if path else None
+    if path:
+        os.makedirs(_artifacts["dir"], exist_ok=True)
+
+def artifact_path(path):
+    """
+     Like project_path, for a file or folder the run writes: relative to the artifacts folder when one is set.
+     """
+    if os.path.isabs(path) or _artifacts["dir"] is None:
+        return project_path(path)
+    return os.path.join(_artifacts["dir"], path)
+
+# Values that replace config.ini entries at runtime, e.g. the local stand-in site URLs
+_overrides = {}
+
+# Parsed config.ini and the modification time it was read at; page objects call
+# get_config for every locator, so the file is parsed again only when it changes
+_cache = {"mtime": None, "config": None}
+
+def set_config_overrides(overrides):
+    """
+     Replaces config.ini values for the running process.
+     overrides is a dict like {"guvi": {"url": "http://127.0.0.1:8000/"}}; pass {} to clear.
+     """
+    _overrides.clear()
+    for section, values in overrides.items():
+        _overrides[section] = dict(values)
+
+def get_config(section, key, fallback=None):
     """
      Fetches a specific configuration value from the config.ini file.
+     If a fallback is given it is returned when the section or key is missing.
 
      Example:
          get_config('browser_name', 'browser')
          'chrome'
      """
-    # Create a ConfigParser instance to read the configuration file
-    config= ConfigParser()
+    # Runtime overrides win over the file
+    if key in _overrides.get(section, {}):
+        return _overrides[section][key]
+
+    config = _load_config()
 
-    # Read the 'config.ini' file from the current project directory
-    config.read("config.ini")
+    # Optional settings fall back to their default value
+    if fallback is not None and not config.has_option(section, key):
+        return fallback
 
     # Return the specific value from the given section and key
-    return config[section][key]
\ No newline at end of file
+    return config[section][key]
+
+def screenshots_dir():
+    """
+     Folder the tests save their screenshots to. driver.save_screenshot("screenshots/...") is relative
+     to the working folder (a matrix cell's folder, for one), so [visual_diff] screenshots_dir is too.
+     """
+    return os.path.abspath(get_config("visual_diff", "screenshots_dir", "screenshots"))
+
+def _load_config():
+    """
+     Returns the parsed config.ini, reading the file again only when it was modified.
+     """
+    path = project_path("config.ini")
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if _cache["config"] is None or _cache["mtime"] != mtime:
+        # Create a ConfigParser instance and read the 'config.ini' file from the project directory
+        config = ConfigParser()
+        config.read(path)
+        _cache["config"], _cache["mtime"] = config, mtime
+    return _cache["config"]
@@ -59,6 +59,196 @@ def create_config():
         "url": "https://www.guvi.in/courses/?current_tab=myCourses"
     }
 
+    # Run history database used for trend, regression and flakiness queries
+    config["run_history"]={
+        "enabled": "true",
+        "db_path": "test_history.db",
+        "baseline_runs": "10",
+        "regression_factor": "1.5"
+    }
+
+    # Change-impact test selection map (page-object methods/locators per test)
+    config["impact"]={
+        "map_path": "impact_map.json"
+    }
+
+    # Browserless HTTP fast tier settings (seconds)
+    config["http_tier"]={
+        "timeout": "5"
+    }
+
+    # Streaming HTML report: number of results per page/chunk file
+    config["stream_report"]={
+        "chunk_size": "500"
+    }
+
+    # Pre-warmed browser profile templates
+    # clone_mode options: auto, reflink, hardlink, copy
+    config["browser_profile"]={
+        "enabled": "false",
+        "profiles_dir": "profiles",
+        "clone_mode": "auto",
+        "consent_selectors": ""
+    }
+
+    # Page-object micro-benchmarks (threshold 0.2 = fail when 20% slower than baseline)
+    config["benchmark"]={
+        "browser": "chrome",
+        "iterations": "20",
+        "warmup": "3",
+        "threshold": "0.2",
+        "baseline_path": "benchmarks/baseline.json"
+    }
+
+    # Per-test time budget shared by all page-object waits (0 = no budget)
+    config["time_budget"]={
+        "default_seconds": "0"
+    }
+
+    # Wait backend of the page objects: polling (WebDriverWait) or observer (in-browser MutationObserver)
+    config["waits"]={
+        "backend": "polling"
+    }
+
+    # Ring-buffer screencast saved only for failing tests (Chromium browsers)
+    config["screencast"]={
+        "enabled": "false",
+        "fps": "2",
+        "seconds": "10",
+        "quality": "50",
+        "output_dir": "screencasts"
+    }
+
+    # Visual regression check of the screenshots (method pixel or ssim, workers 0 = one per CPU)
+    config["visual_diff"]={
+        "screenshots_dir": "screenshots",
+        "baseline_dir": "visual_baselines",
+        "diff_dir": "visual_diffs",
+        "masks_path": "visual_masks.json",
+        "method": "pixel",
+        "tolerance": "16",
+        "max_diff_ratio": "0.001",
+        "min_ssim": "0.995",
+        "hash_threshold": "0",
+        "workers": "0"
+    }
+
+    # Browser matrix runner (launch profiles: default, headless, warm)
+    config["matrix"]={
+        "browsers": "chrome,firefox,edge",
+        "launch_profiles": "default",
+        "max_workers": "3",
+        "output_dir": "matrix_results"
+    }
+
+    # Browser CPU/memory sampling per test (recycle_rss_mb 0 = never recycle the session)
+    config["resources"]={
+        "enabled": "false",
+        "interval": "1",
+        "leak_min_tests": "4",
+        "leak_growth_mb": "20",
+        "recycle_rss_mb": "0"
+    }
+
+    # Soak / endurance mode (window_seconds = length of a reporting window)
+    config["soak"]={
+        "minutes": "60",
+        "sessions": "1",
+        "window_seconds": "300",
+        "think_time": "0",
+        "output_path": "soak_results.jsonl"
+    }
+
+    # Browser-level load generation (stages = sessions:seconds, limits are per host)
+    config["load"]={
+        "stages": "1:60,2:60,4:60",
+        "think_min": "1",
+        "think_max": "3",
+        "spawn_interval": "2",
+        "max_browsers": "16",
+        "memory_per_browser_mb": "400",
+        "sessions_per_cpu": "1",
+        "max_cpu_percent": "85",
+        "degrade_factor": "1.5",
+        "max_error_rate": "0.05",
+        "output_path": "load_results.json"
+    }
+    # Synthetic monitoring daemon: check:interval_seconds pairs and the in-memory retention
+    config["monitor"]={
+        "host": "127.0.0.1",
+        "port": "9109",
+        "checks": "homepage:60,valid_login:300,dobby:120",
+        "retention_runs": "1000",
+        "retention_minutes": "1440"
+    }
+    # Start-up profiler: longest acceptable start-up before the browser launch, rows per table
+    config["startup_profile"]={
+        "budget_seconds": "1",
+        "top": "15"
+    }
+    # Navigation planner: relative cost of a full URL load, an in-app click and a step back in history
+    config["navigation"]={
+        "load_cost": "5",
+        "click_cost": "2",
+        "back_cost": "1",
+        "history": "10"
+    }
+    # Self-healing locators: cache of the fallback strategies that matched when a primary locator broke
+    config["healing"]={
+        "enabled": "true",
+        "cache_path": "locator_cache.json"
+    }
+    # Pre-flight check before browsers launch: seconds for all checks, free space needed, TLS expiry warning
+    config["preflight"]={
+        "enabled": "true",
+        "timeout": "1",
+        "url_timeout": "10",
+        "min_free_mb": "500",
+        "cert_warn_days": "14"
+    }
+    # Network profiles for --network-profile / network_profile markers: latency_ms, download_kbps, upload_kbps (or offline)
+    config["network_profiles"]={
+        "offline": "offline",
+        "3g": "563, 1475, 675",
+        "slow_4g": "150, 1600, 750",
+        "high_latency": "1000, 10000, 5000"
+    }
+    # Step timings recorded per network profile, last keep_runs values per step
+    config["network"]={
+        "timings_path": "network_timings.json",
+        "keep_runs": "20"
+    }
+    # --multi-tab: tabs of the shared browser and seconds each check may wait for one condition
+    config["multi_tab"]={
+        "tabs": "3",
+        "wait_seconds": "30"
+    }
+    # WebDriver command tracing (--trace-commands): Chrome trace file and the most commands kept in it
+    config["command_trace"]={
+        "enabled": "false",
+        "output_path": "webdriver_trace.json",
+        "max_events": "200000"
+    }
+
+    # Overlays hidden at document start so they can't intercept clicks (utils/overlays.py):
+    # comma-separated CSS selectors, and the seconds an intercepted click costs (the page-object wait)
+    config["overlays"]={
+        "enabled": "true",
+        "selectors": "#ym-auto-pop-up-content, #onetrust-consent-sdk, .cookie-banner, [class*='cookie-consent'], "
+                     ".modal-backdrop, [class*='promo-modal']",
+        "interception_cost_seconds": "30"
+    }
+
+    # Per-test action traces for offline debugging (utils/action_trace.py): archives kept for failed or all tests,
+    # DOM snapshots when actions up to snapshot_depth end (0 = top-level), keys typed in mask_steps steps masked
+    config["action_trace"]={
+        "enabled": "true",
+        "output_dir": "traces",
+        "keep": "failed",
+        "snapshot_depth": "0",
+        "mask_steps": "password"
+    }
+
     # Write the configuration data to config.ini file
     with open("config.ini", "w") as configfile:
         config.write(configfile)
@@ -1,16 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+import time
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.edge.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from Project1_Guvi_Automation.config_reader import get_config # <-- To read browser from config.ini
+from Project1_Guvi_Automation.config_reader import artifact_path, get_config, project_path, screenshots_dir, set_artifacts_dir # <-- To read browser from config.ini
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils import healing
+from Project1_Guvi_Automation.utils.run_history import RunRecorder
+from Project1_Guvi_Automation.utils import impact_map
+from Project1_Guvi_Automation.utils.stream_report import StreamReport, new_screenshots
+from Project1_Guvi_Automation.utils.driver_factory import LAUNCH_PROFILES, create_driver, restart_session
+from Project1_Guvi_Automation.utils import browser_profile
+from Project1_Guvi_Automation.utils import network_profiles
+from Project1_Guvi_Automation.utils import overlays
+from Project1_Guvi_Automation.utils import action_trace
+from Project1_Guvi_Automation.utils.screencast import ScreencastRecorder
 import logging
+# Selenium's webdriver package (utils.deadline) and urllib3 (utils.http_tier) are imported
+# where they are used, so collection and browserless runs don't pay for them
 
 # Configure logging inside setup
 logger = logging.getLogger(__name__)
 
+# Keys for objects shared between hooks during a session
+run_recorder_key = pytest.StashKey()
+impact_recorded_key = pytest.StashKey()
+stream_report_key = pytest.StashKey()
+test_started_key = pytest.StashKey()
+report_notes_key = pytest.StashKey()
+standin_site_key = pytest.StashKey()
+session_started_key = pytest.StashKey()
+recycle_key = pytest.StashKey()
+collection_times_key = pytest.StashKey()
+healed_locators_key = pytest.StashKey()
+network_profile_key = pytest.StashKey()
+network_timings_key = pytest.StashKey()
+command_tracer_key = pytest.StashKey()
+redundant_commands_key = pytest.StashKey()
+overlay_counts_key = pytest.StashKey()
+
 def pytest_addoption(parser):
     """
     Pytest hook to add a command-line option for browser name.
@@ -19,6 +48,86 @@ def pytest_addoption(parser):
     parser.addoption(
         "--browser-name",default = 'chrome', help="This will take browser name from user"
     )
+    parser.addoption(
+        "--launch-profile", default="default", choices=LAUNCH_PROFILES,
+        help="How to start the browser: default, headless or warm (from the pre-warmed profile template)"
+    )
+    parser.addoption(
+        "--no-history", action="store_true", default=False,
+        help="Do not record this run into the run history database"
+    )
+    parser.addoption(
+        "--record-impact", action="store_true", default=False,
+        help="Record which page-object methods and locators each test uses into the impact map"
+    )
+    parser.addoption(
+        "--impact-since", default=None, metavar="GIT_REF",
+        help="Run only the tests affected by the changes since the given git ref"
+    )
+    parser.addoption(
+        "--http-gate", action="store_true", default=False,
+        help="Run the http_tier tests in a separate process first and stop if any of them fails"
+    )
+    parser.addoption(
+        "--stream-report", default=None, metavar="DIR",
+        help="Stream results into a paginated HTML report in DIR while the tests run"
+    )
+    parser.addoption(
+        "--profile-template", action="store_true", default=False,
+        help="Start each browser from a clone of the pre-warmed profile template"
+    )
+    parser.addoption(
+        "--standin-site", action="store_true", default=False,
+        help="Run against the local stand-in of the GUVI pages instead of www.guvi.in"
+    )
+    parser.addoption(
+        "--time-budget", type=float, default=None, metavar="SECONDS",
+        help="Time budget of every test without a time_budget marker (0 = no budget)"
+    )
+    parser.addoption(
+        "--screencast", action="store_true", default=False,
+        help="Keep the last seconds of a low-rate screencast in memory and save them when a test fails"
+    )
+    parser.addoption(
+        "--resources", action="store_true", default=False,
+        help="Sample browser CPU/memory per test, flag steady memory growth and recycle bloated sessions"
+    )
+    parser.addoption(
+        "--visual-diff", action="store_true", default=False,
+        help="Compare the screenshots taken in this run with their baselines and link the diffs in the report"
+    )
+    parser.addoption(
+        "--collection-profile", default=None, metavar="PATH",
+        help="Write the time spent collecting each test module to PATH as JSON (used by utils/startup_profile.py)"
+    )
+    parser.addoption(
+        "--no-preflight", action="store_true", default=False,
+        help="Skip the pre-flight check of config, URLs, browser/driver and disk space"
+    )
+    parser.addoption(
+        "--network-profile", default=None, metavar="NAME",
+        help="Emulate a network profile of config.ini [network_profiles] for tests without a network_profile marker"
+    )
+    parser.addoption(
+        "--multi-tab", action="store_true", default=False,
+        help="Run the read_only checks interleaved in the tabs of one browser instead of one after another"
+    )
+    parser.addoption(
+        "--trace-commands", action="store_true", default=False,
+        help="Count and time every WebDriver command per test and page-object step and write a Chrome trace file"
+    )
+    parser.addoption(
+        "--keep-overlays", action="store_true", default=False,
+        help="Leave the pop-ups, cookie banners and promo modals of config.ini [overlays] on the pages"
+    )
+    parser.addoption(
+        "--no-action-trace", action="store_true", default=False,
+        help="Do not record the page-object actions and DOM snapshots of the tests for offline debugging"
+    )
+    parser.addoption(
+        "--artifacts-dir", default=None, metavar="DIR",
+        help="Write the run history, locator cache, network timings and traces into DIR instead of the project folder"
+    )
 
 @pytest.fixture(scope='class') # set up and tear down
 def setup(request):
@@ -28,39 +137,60 @@ def setup(request):
     Steps:
     1. Read browser name from command line or config.ini
     2. Launch the respective browser using WebDriverManager
+       (from a clone of the pre-warmed profile template when enabled)
     3. Maximize window and set implicit wait
-    4. Return driver instance to the test
-    5. Quit driver after test completes
+    4. Start the ring-buffer screencast, the resource sampler and the action recorder when enabled
+    5. Return driver instance to the test
+    6. Quit driver after test completes
     """
     driver = None
+    profile_dir = None
+    screencast = None
+    sampler = None
+    recorder = None
     try:
         # Get browser from Command line first, else from config file
         browser_name = request.config.getoption("--browser-name") or get_config("browser_name", "browser")
         logger.info(f"Selected browser: {browser_name}")
-        browser = browser_name.lower()
-
-        # Initialize the driver based on browser name
-        if browser == 'chrome':
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-            logger.info("Launched Chrome browser")
 
-        elif browser == 'firefox':
-            driver = webdriver.Firefox(service=Service(GeckoDriverManager().install()))
-            logger.info("Launched Firefox browser")
+        launch_profile = request.config.getoption("--launch-profile")
 
-        elif browser == 'edge':
-            driver = webdriver.Edge()
-            logger.info("Launched Edge browser")
+        # Start from a copy of the pre-warmed profile template, building it on first use
+        if use_profile_template(request.config) or launch_profile == "warm":
+            if browser_profile.load_metadata(browser_name) is None:
+                browser_profile.build_template(browser_name, keep_existing=True)
+            profile_dir = browser_profile.clone_template(browser_name)
 
-        else:
-            raise ValueError(f"Unsupported browser: {browser_name}")
+        # Initialize the driver based on browser name
+        driver = create_driver(browser_name, user_data_dir=profile_dir, headless=launch_profile == "headless")
+        trace_commands(request.config, driver)
 
         # Browser window setup
         driver.maximize_window()
         driver.implicitly_wait(10)
 
+        if profile_dir:
+            report_first_paint(request.config, driver, browser_name)
+
+        if use_screencast(request.config):
+            screencast = ScreencastRecorder(
+                driver,
+                fps=float(get_config("screencast", "fps", "2")),
+                seconds=float(get_config("screencast", "seconds", "10")),
+                quality=int(get_config("screencast", "quality", "50")),
+            ).start()
+
+        if use_resource_monitor(request.config):
+            from Project1_Guvi_Automation.utils.resource_monitor import ResourceSampler
+            sampler = ResourceSampler(driver, interval=float(get_config("resources", "interval", "1"))).start()
+
+        recorder = record_actions(request.config, driver)
+
         # Attach the driver to the class so page objects can access it
         request.cls.driver = driver
+        request.cls.screencast = screencast
+        request.cls.resource_sampler = sampler
+        request.cls.action_recorder = recorder
 
         # Yield to test, then teardown
         yield driver
@@ -71,15 +201,297 @@ def setup(request):
         raise
 
     finally:
-        # Quit the browser after test completion
+        # Quit the browser after test completion; command wrappers come off in reverse order
+        if recorder:
+            recorder.detach()
+        if screencast:
+            screencast.stop()
+        if sampler:
+            sampler.stop()
+            report_memory_growth(request.config, request.node.nodeid, sampler)
         if driver:
             logging.info("Closing the browser")
             driver.quit()
+        if profile_dir:
+            browser_profile.remove_clone(profile_dir)
+
+
+def use_profile_template(config):
+    """True when sessions should start from the profile template (CLI flag or config.ini)."""
+    return config.getoption("--profile-template") or get_config("browser_profile", "enabled", "false").lower() == "true"
+
+
+def use_screencast(config):
+    """True when failing tests should save a screencast (CLI flag or config.ini)."""
+    return config.getoption("--screencast") or get_config("screencast", "enabled", "false").lower() == "true"
+
+
+def use_resource_monitor(config):
+    """True when browser CPU/memory should be sampled per test (CLI flag or config.ini)."""
+    return config.getoption("--resources") or get_config("resources", "enabled", "false").lower() == "true"
+
+
+def use_command_trace(config):
+    """True when the WebDriver commands should be traced (CLI flag or config.ini)."""
+    return config.getoption("--trace-commands") or get_config("command_trace", "enabled", "false").lower() == "true"
 
 
-def pytest_configure():
+def trace_commands(config, driver):
+    """Send the commands of a new driver through the session's command tracer, when tracing."""
+    tracer = config.stash.get(command_tracer_key, None)
+    if tracer:
+        tracer.attach(driver)
+
+
+def use_action_trace(config):
+    """True when the tests' page-object actions should be recorded (config.ini, unless --no-action-trace)."""
+    return not config.getoption("--no-action-trace") and get_config("action_trace", "enabled", "true").lower() == "true"
+
+
+def record_actions(config, driver):
+    """Return an ActionRecorder following a new driver, or None when not recording."""
+    if not use_action_trace(config):
+        return None
+    return action_trace.ActionRecorder(
+        driver,
+        snapshot_depth=int(get_config("action_trace", "snapshot_depth", "0")),
+        mask_steps=[name.strip() for name in get_config("action_trace", "mask_steps", "password").split(",")
+                    if name.strip()],
+    ).attach()
+
+
+def save_action_trace(item, report):
+    """Write the recorded actions of the test to its archive (failed tests only, unless [action_trace] keep = all)."""
+    recorder = getattr(item.cls, "action_recorder", None)
+    if not recorder or recorder.test != item.nodeid:
+        return
+    recorder.end_test()
+    if not report.failed and get_config("action_trace", "keep", "failed").lower() != "all":
+        return
+    folder = artifact_path(get_config("action_trace", "output_dir", "traces"))
+    try:
+        path = recorder.save(os.path.join(folder, action_trace.archive_name(item.nodeid)), item.nodeid, report.outcome)
+    except OSError as e:
+        logger.warning(f"Could not write the action trace of {item.nodeid}: {e}")
+        return
+    report.sections.append(("action trace", f"{len(recorder.actions)} actions, {len(recorder.snapshots)} DOM snapshots "
+                                            f"in {path}\nStep through it with: python -m "
+                                            f"Project1_Guvi_Automation.utils.action_trace {path} --html --open"))
+    item.user_properties.append(("action_trace", path))
+
+
+def use_overlay_suppression(config):
+    """True when click-intercepting overlays should be hidden (config.ini, unless --keep-overlays)."""
+    return not config.getoption("--keep-overlays") and get_config("overlays", "enabled", "true").lower() == "true"
+
+
+@pytest.fixture(scope="session")
+def overlay_suppression(request):
+    """Function hiding the overlays in the current tab of a driver, a no-op when suppression is off."""
+    if not use_overlay_suppression(request.config):
+        return lambda driver: None
+    return overlays.suppress
+
+
+@pytest.fixture(autouse=True)
+def suppressed_overlays(request, overlay_suppression):
+    """
+    Hide the overlays of config.ini [overlays] from the pages of the test's browser,
+    or show them for tests marked keep_overlays.
+    """
+    driver = getattr(request.cls, "driver", None) if request.cls else None
+    if driver is not None and use_overlay_suppression(request.config):
+        try:
+            if request.node.get_closest_marker("keep_overlays"):
+                overlays.release(driver)
+            else:
+                overlay_suppression(driver)
+        except Exception as e:
+            logger.warning(f"Could not set up the overlay suppression: {e}")
+    yield
+
+
+def report_overlays(item, report):
+    """Attach the overlays hidden during the test and the clicks they would have intercepted."""
+    driver = getattr(item.cls, "driver", None) if item.cls else None
+    if driver is None or not use_overlay_suppression(item.config):
+        return
+    try:
+        counts = overlays.take_counts(driver)
+    except Exception as e:
+        logger.debug(f"Could not read the overlay counts: {e}")
+        return
+    if not counts:
+        return
+    report.sections.append(("overlays", overlays.summary(counts)))
+    hidden = sum(c["hidden"] for c in counts.values())
+    clicks = sum(c["clicks"] for c in counts.values())
+    item.user_properties.append(("overlays_hidden", hidden))
+    item.user_properties.append(("intercepted_clicks_prevented", clicks))
+    totals = item.config.stash.setdefault(overlay_counts_key, [0, 0])
+    totals[0] += hidden
+    totals[1] += clicks
+
+
+def report_commands(item, report, steps):
+    """Attach the WebDriver commands of the test to its report and add the test and its steps to the trace."""
+    tracer = item.config.stash.get(command_tracer_key, None)
+    if not tracer:
+        return
+    commands, redundant = tracer.take_test(item.nodeid)
+    started = item.stash.get(test_started_key, time.time())
+    tracer.add_span(item.nodeid, "test", started, time.time() - started)
+    for step in steps:
+        if step.duration is not None:
+            tracer.add_span(step.name, "step", step.started, step.duration)
+    if not commands:
+        return
+    report.sections.append(("webdriver commands", tracer.test_summary(commands, redundant)))
+    item.user_properties.append(("webdriver_commands", sum(count for count, _ in commands.values())))
+    if redundant:
+        item.user_properties.append(("redundant_commands", sum(redundant.values())))
+        item.config.stash.setdefault(redundant_commands_key, []).extend(
+            (item.nodeid, step, what, count) for (step, what), count in redundant.items())
+
+
+def export_command_trace(config):
+    """Write the Chrome trace file of the run and summarise it in the report."""
+    from pathlib import Path
+
+    tracer = config.stash.get(command_tracer_key, None)
+    if not tracer or not tracer.histograms:
+        return
+    redundant = config.stash.get(redundant_commands_key, [])
+    path = tracer.export(artifact_path(get_config("command_trace", "output_path", "webdriver_trace.json")), redundant)
+    total = sum(h.count for h in tracer.histograms.values())
+    wire = sum(h.total for h in tracer.histograms.values()) / 1000
+    add_report_note(config, f"WebDriver commands: {total} round trips, {wire:.1f}s on the wire, "
+                            f"{sum(r[3] for r in redundant)} redundant (trace: {os.path.basename(path)})",
+                    Path(path).as_uri())
+
+
+def report_memory_growth(config, name, sampler):
+    """Add a report note when the memory of a browser session grew steadily from test to test."""
+    from Project1_Guvi_Automation.utils.resource_monitor import MB, leak_suspected
+
+    rss = [usage.rss_end for usage in sampler.history]
+    suspected, growth = leak_suspected(
+        rss,
+        min_tests=int(get_config("resources", "leak_min_tests", "4")),
+        min_growth_mb=float(get_config("resources", "leak_growth_mb", "20")),
+    )
+    if suspected:
+        add_report_note(config, f"Possible browser memory leak in {name}: +{growth:.0f} MB per test over "
+                                f"{len(rss)} tests ({rss[0] / MB:.0f} -> {rss[-1] / MB:.0f} MB)")
+
+
+def record_resources(item, report):
+    """Add the browser CPU/memory used by the test to its report and mark bloated sessions for recycling."""
+    sampler = getattr(item.cls, "resource_sampler", None)
+    if not sampler:
+        return
+    usage = sampler.end_test()
+    if usage is None:
+        return
+    report.sections.append(("browser resources", usage.summary()))
+    item.user_properties.append(("browser_rss_mb", round(usage.rss_end / (1024 * 1024))))
+    item.user_properties.append(("browser_cpu_s", round(usage.cpu_seconds, 2)))
+
+    limit_mb = float(get_config("resources", "recycle_rss_mb", "0"))
+    if limit_mb and usage.rss_end / (1024 * 1024) > limit_mb:
+        item.stash[recycle_key] = True
+
+
+def save_screencast(item, report):
+    """Write the buffered screencast frames when the test failed, drop them otherwise."""
+    screencast = getattr(item.cls, "screencast", None)
+    if not screencast:
+        return
+    if report.failed:
+        path = screencast.flush(artifact_path(get_config("screencast", "output_dir", "screencasts")), item.name)
+        if path:
+            item.user_properties.append(("screencast", path))
+    else:
+        screencast.discard()
+
+
+def report_healed_locators(item, report):
+    """Attach the locators that only matched through a fallback candidate to the test's report."""
+    events = healing.take_events()
+    if not events:
+        return
+    lines = [f"{name}: primary {primary} failed, matched with {candidate}"
+             for name, (primary, candidate) in sorted(events.items())]
+    report.sections.append(("healed locators", "\n".join(lines)))
+    item.user_properties.append(("healed_locators", ", ".join(sorted(events))))
+    item.config.stash.setdefault(healed_locators_key, {}).update(events)
+
+
+def report_first_paint(config, driver, browser_name):
+    """
+    Measure the first paint of the homepage in the freshly cloned profile and report it
+    next to the cold first paint measured when the template was built.
+    """
+    try:
+        warm = browser_profile.measure_first_paint(driver, get_config("guvi", "url"))
+        cold = (browser_profile.load_metadata(browser_name) or {}).get("cold", {})
+        add_report_note(
+            config,
+            f"First contentful paint ({browser_name}): cold {cold.get('first_contentful_paint_ms')} ms, "
+            f"warm {warm['first_contentful_paint_ms']} ms; load cold {cold.get('load_ms')} ms, "
+            f"warm {warm['load_ms']} ms"
+        )
+    except Exception as e:
+        logger.warning(f"Could not measure first paint: {e}")
+
+
+def add_report_note(config, text, link=None):
+    """Add a session level line to the HTML reports (pytest-html summary and --stream-report)."""
+    logger.info(text)
+    config.stash.setdefault(report_notes_key, []).append((text, link))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Show the session notes (profile timings, ...) at the top of the pytest-html report."""
+    for text, link in session.config.stash.get(report_notes_key, []):
+        prefix.append(f'<p><a href="{link}">{text}</a></p>' if link else f"<p>{text}</p>")
+
+
+@pytest.fixture(scope="module")
+def tab_browser(request):
+    """
+    One browser for the multi_tab checks, with the "none" page load strategy so a page
+    load doesn't block the commands sent to the other tabs (utils/tabs.py).
+    """
+    browser_name = request.config.getoption("--browser-name") or get_config("browser_name", "browser")
+    driver = create_driver(browser_name, headless=request.config.getoption("--launch-profile") == "headless",
+                           page_load_strategy="none")
+    trace_commands(request.config, driver)
+    driver.maximize_window()
+    try:
+        yield driver
+    finally:
+        logging.info("Closing the multi-tab browser")
+        driver.quit()
+
+
+@pytest.fixture(scope="session")
+def http_client():
+    """
+    Pooled keep-alive HTTP client for the browserless fast tier (@pytest.mark.http_tier).
+    Shared by the whole session so every GUVI page reuses the same connections.
+    """
+    from Project1_Guvi_Automation.utils.http_tier import HttpClient
+    client = HttpClient(timeout=float(get_config("http_tier", "timeout", "5")))
+    yield client
+    client.close()
+
+
+def pytest_configure(config):
     """
     Pytest to configure logging before tests start.
+    Also registers the custom markers used by the suite.
     Configure the root logger to log INFO and above level messages to both file and console.
     Sets up both file and console handlers with a common formatter.
     """
@@ -101,4 +513,467 @@ def pytest_configure():
         logger.info("Logging configured successfully")
 
     except Exception as e:
-        print(f"Failed to configure logging: {e}")
\ No newline at end of file
+        print(f"Failed to configure logging: {e}")
+
+    # Before anything opens the history database or the caches
+    set_artifacts_dir(config.getoption("artifacts_dir"))
+
+    # Markers used by the suite
+    config.addinivalue_line(
+        "markers", "depends_on(*test_names): test needs the browser state left by the named tests"
+    )
+    config.addinivalue_line(
+        "markers", "http_tier: browserless check run with the pooled HTTP client, no browser launched"
+    )
+    config.addinivalue_line(
+        "markers", "time_budget(seconds): total time the test may spend, shared by all page-object waits"
+    )
+    config.addinivalue_line(
+        "markers", "network_profile(name): run the test under a network profile of config.ini [network_profiles]"
+    )
+    config.addinivalue_line(
+        "markers", "read_only: test only reads the anonymous site, --multi-tab runs it as a multi_tab check instead"
+    )
+    config.addinivalue_line(
+        "markers", "multi_tab: check run interleaved with the others in the tabs of one browser (--multi-tab)"
+    )
+    config.addinivalue_line(
+        "markers", "keep_overlays: leave the pop-ups and banners of config.ini [overlays] on the pages"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Narrow down and gate the collected tests before any browser is launched:
+    - --multi-tab swaps the read_only tests for their multi_tab checks (and the reverse without it)
+    - --impact-since selects the tests affected by a git diff
+    - the pre-flight check stops the session when the environment is broken
+    - --http-gate runs the http_tier tests first, in their own process
+    """
+    select_multi_tab(config, items)
+    if config.getoption("--impact-since"):
+        select_impacted_tests(config, items)
+    if use_preflight(config) and items:
+        run_preflight(config, items)
+    if config.getoption("--http-gate") and not config.option.collectonly:
+        run_http_gate(config, items)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Time the collection of each test module (import, classes, parametrize) for --collection-profile."""
+    if not collector.config.getoption("--collection-profile") or not isinstance(collector, (pytest.Module, pytest.Class)):
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    times = collector.config.stash.setdefault(collection_times_key, {})
+    module = collector.nodeid.split("::")[0]
+    times[module] = times.get(module, 0.0) + time.perf_counter() - start
+
+
+def pytest_collection_finish(session):
+    """Save the collection timings of --collection-profile."""
+    path = session.config.getoption("--collection-profile")
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "collection_seconds": time.time() - session.config.stash[session_started_key],
+            "items": len(session.items),
+            "modules": session.config.stash.get(collection_times_key, {}),
+        }, f, indent=2)
+
+
+def select_multi_tab(config, items):
+    """
+    Keep either the read_only tests (default) or the multi_tab checks covering them (--multi-tab).
+    A read_only test named in a depends_on marker of a kept test is kept too: the kept test needs its browser state.
+    """
+    dropped = "read_only" if config.getoption("--multi-tab") else "multi_tab"
+    kept = {item.nodeid for item in items if not item.get_closest_marker(dropped)}
+
+    # Follow depends_on markers transitively, within the class sharing the browser
+    pending = [item for item in items if item.nodeid in kept]
+    while pending:
+        item = pending.pop()
+        for marker in item.iter_markers("depends_on"):
+            for candidate in items:
+                if (getattr(candidate, "originalname", candidate.name) in marker.args and candidate.cls is item.cls
+                        and candidate.nodeid not in kept):
+                    kept.add(candidate.nodeid)
+                    pending.append(candidate)
+
+    deselected = [item for item in items if item.nodeid not in kept]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item not in deselected]
+
+
+def select_impacted_tests(config, items):
+    """
+    Run only the tests affected by the git diff against --impact-since.
+    Falls back to the full suite when no impact map exists or when shared code changed.
+    """
+    since = config.getoption("--impact-since")
+    data = impact_map.load_map(project_path(get_config("impact", "map_path", "impact_map.json")))
+    if data is None:
+        logger.warning("No impact map recorded yet (run with --record-impact), running the full suite")
+        return
+
+    impact = impact_map.analyse_diff(since)
+    logger.info(f"Changes since {since}: {impact.describe()}")
+    if impact.full_suite_reason:
+        return
+
+    selected, deselected = impact_map.select(items, impact, data["tests"])
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    logger.info(f"Impact selection: running {len(selected)} of {len(selected) + len(deselected)} tests")
+
+
+def use_preflight(config):
+    if config.option.collectonly or config.getoption("--no-preflight"):
+        return False
+    return get_config("preflight", "enabled", "true").lower() == "true"
+
+
+def run_preflight(config, items):
+    """
+    Check config.ini, the configured URLs, the browser/driver and the disk space concurrently
+    (utils/preflight.py). Any error stops the session with one diagnosis before a browser is launched.
+    The browser is checked only when a selected test launches one.
+    """
+    from Project1_Guvi_Automation.utils import preflight
+
+    browser_name = None
+    if any("setup" in item.fixturenames or "tab_browser" in item.fixturenames for item in items):
+        browser_name = config.getoption("--browser-name") or get_config("browser_name", "browser")
+    start = time.perf_counter()
+    findings = preflight.run_checks(browser_name)
+    logger.info(f"Pre-flight check took {time.perf_counter() - start:.2f}s")
+
+    if preflight.failed(findings):
+        pytest.exit(f"Pre-flight check failed, no browser launched:\n{preflight.diagnosis(findings)}", returncode=1)
+    for finding in findings:
+        if finding.level == "warning":
+            add_report_note(config, f"Pre-flight warning ({finding.check}): {finding.message}")
+
+
+def run_http_gate(config, items):
+    """
+    Run the http_tier tests in a separate pytest process ahead of the browser suite.
+    A failure there means the site is down or broken, so the session stops before launching browsers.
+    On success the http_tier tests are removed from this session since they already ran.
+    """
+    tier_items = [item for item in items if item.get_closest_marker("http_tier")]
+    if not tier_items:
+        return
+
+    paths = sorted({str(item.path) for item in tier_items})
+    # The pre-flight check already ran in this session (or is off)
+    args = ["-q", "-m", "http_tier", "--no-history", "--no-preflight", "-p", "no:cacheprovider"]
+    # The stand-in site's URLs are overrides of this process only: the gate starts its own stand-in
+    if config.getoption("--standin-site"):
+        args.append("--standin-site")
+    if config.getoption("--artifacts-dir"):
+        args += ["--artifacts-dir", config.getoption("--artifacts-dir")]
+    logger.info(f"Running HTTP fast tier gate: {len(tier_items)} checks")
+    result = subprocess.run([sys.executable, "-m", "pytest", *args, *paths], cwd=config.invocation_params.dir)
+    if result.returncode != 0:
+        pytest.exit("HTTP fast tier failed, browser suite not started", returncode=1)
+
+    config.hook.pytest_deselected(items=tier_items)
+    items[:] = [item for item in items if item not in tier_items]
+
+
+def pytest_sessionstart(session):
+    """
+    Open a new run in the history database (config.ini [run_history])
+    so outcomes and step timings of this session can be compared with earlier runs.
+    """
+    config = session.config
+    config.stash[session_started_key] = time.time()
+
+    # Point every page object at the local stand-in site before tests are collected
+    if config.getoption("--standin-site"):
+        config.stash[standin_site_key] = network_profiles.ThrottledSite().__enter__()
+
+    if use_command_trace(config) and not config.option.collectonly:
+        from Project1_Guvi_Automation.utils.command_trace import CommandTracer
+        config.stash[command_tracer_key] = CommandTracer(int(get_config("command_trace", "max_events", "200000")))
+
+    if config.getoption("--network-profile"):
+        try:
+            network_profiles.load_profile(config.getoption("--network-profile"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+
+    # The streaming report doesn't depend on the run history
+    report_dir = config.getoption("--stream-report")
+    if report_dir and not config.option.collectonly:
+        config.stash[stream_report_key] = StreamReport(
+            report_dir, chunk_size=int(get_config("stream_report", "chunk_size", "500"))
+        )
+
+    if config.getoption("--no-history") or config.option.collectonly or get_config("run_history", "enabled", "true").lower() != "true":
+        return
+    try:
+        recorder = RunRecorder(
+            artifact_path(get_config("run_history", "db_path", "test_history.db")),
+            browser=config.getoption("--browser-name"),
+            metadata={"args": list(config.invocation_params.args)}
+        )
+        config.stash[run_recorder_key] = recorder
+    except Exception as e:
+        # History is optional, never fail the run because of it
+        logger.warning(f"Run history disabled: {e}")
+
+
+def write_history(config, method, *args):
+    """
+    Call a write method of the run's RunRecorder. A failed write (locked or broken database)
+    stops the history for the rest of the run with a warning instead of failing the run.
+    """
+    recorder = config.stash.get(run_recorder_key, None)
+    if not recorder:
+        return
+    try:
+        getattr(recorder, method)(*args)
+    except Exception as e:
+        logger.warning(f"Run history disabled after a failed write: {e}")
+        del config.stash[run_recorder_key]
+        try:
+            recorder.conn.close()
+        except Exception:
+            pass
+
+
+def pytest_runtest_setup(item):
+    """Start recording page-object steps for the test about to run."""
+    item.stash[test_started_key] = time.time()
+    step_timer.begin_test(item.nodeid)
+
+
+def time_budget_seconds(item):
+    """Budget of a test: its time_budget marker, else --time-budget, else config.ini (0 = none)."""
+    marker = item.get_closest_marker("time_budget")
+    if marker:
+        return float(marker.args[0])
+    seconds = item.config.getoption("--time-budget")
+    if seconds is None:
+        seconds = float(get_config("time_budget", "default_seconds", "0"))
+    return seconds
+
+
+def pytest_runtest_call(item):
+    """
+    Start the test's time budget. The browser's implicit wait and page load timeout
+    are capped by it too, so no single command can outlast the whole test.
+    Also starts the browser resource sampling and the action recording of the test when enabled.
+    """
+    sampler = getattr(item.cls, "resource_sampler", None)
+    if sampler:
+        sampler.begin_test(item.nodeid)
+    recorder = getattr(item.cls, "action_recorder", None)
+    if recorder:
+        recorder.begin_test(item.nodeid)
+
+    seconds = time_budget_seconds(item)
+    if seconds <= 0:
+        return
+    from Project1_Guvi_Automation.utils import deadline
+    deadline.start_budget(seconds)
+    driver = getattr(item.cls, "driver", None)
+    if driver:
+        driver.implicitly_wait(min(10, seconds))
+        driver.set_page_load_timeout(seconds)
+
+
+def network_profile_of(item):
+    """Network profile of a test: its network_profile marker, else --network-profile, else None."""
+    marker = item.get_closest_marker("network_profile")
+    name = marker.args[0] if marker else item.config.getoption("--network-profile")
+    return network_profiles.load_profile(name) if name else None
+
+
+@pytest.fixture(autouse=True)
+def network_conditions(request):
+    """
+    Emulate the test's network profile for its browser (DevTools on Chromium)
+    or, for other browsers and browserless tests, through the stand-in site.
+    """
+    profile = network_profile_of(request.node)
+    if profile is None:
+        yield
+        return
+    driver = getattr(request.cls, "driver", None) if request.cls else None
+    clear = network_profiles.apply(profile, driver=driver, site=request.config.stash.get(standin_site_key, None))
+    if clear:
+        request.node.stash[network_profile_key] = profile.name
+    try:
+        yield
+    finally:
+        if clear:
+            try:
+                clear()
+            except Exception as e:
+                logger.warning(f"Could not clear network profile {profile.name}: {e}")
+
+
+def report_network_profile(item, report, steps):
+    """Attach the step timings under the emulated network profile and keep them for the per-profile summary."""
+    name = item.stash.get(network_profile_key, None)
+    if name is None:
+        return
+    report.sections.append((f"network profile {name}", network_profiles.summary(steps) or "no page-object steps"))
+    item.user_properties.append(("network_profile", name))
+    for step in steps:
+        if step.duration is not None:
+            timings = item.config.stash.setdefault(network_timings_key, {}).setdefault(name, {})
+            timings.setdefault(step.name, []).append(step.duration)
+
+
+def end_time_budget(item, report, steps):
+    """Stop the test's time budget, restore the browser timeouts and add the budget to the report."""
+    if time_budget_seconds(item) <= 0:
+        return
+    from Project1_Guvi_Automation.utils import deadline
+    budget = deadline.end_budget()
+    if budget is None:
+        return
+    driver = getattr(item.cls, "driver", None)
+    if driver:
+        try:
+            driver.implicitly_wait(10)
+            driver.set_page_load_timeout(300)
+        except Exception as e:
+            logger.warning(f"Could not restore browser timeouts: {e}")
+    report.sections.append(("time budget", budget.summary(steps)))
+    item.user_properties.append(("time_budget", f"{budget.elapsed():.1f}s of {budget.total:.0f}s"))
+    if budget.exhausted_in:
+        logger.error(f"{item.nodeid}: time budget of {budget.total:.0f}s exhausted in {budget.exhausted_in}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Store each test outcome, its duration and the page-object steps it executed
+    in the run history database, in the impact map when --record-impact is given
+    and in the streaming report when --stream-report is given.
+    """
+    outcome = yield
+    report = outcome.get_result()
+
+    # Tests are recorded once: from the call phase, or from setup when it failed/skipped
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        steps = step_timer.end_test()
+        end_time_budget(item, report, steps)
+        report_healed_locators(item, report)
+        report_network_profile(item, report, steps)
+        report_commands(item, report, steps)
+        report_overlays(item, report)
+        save_screencast(item, report)
+        save_action_trace(item, report)
+        record_resources(item, report)
+        write_history(item.config, "record_result", item.nodeid, report.outcome, report.duration, steps)
+        if item.config.getoption("--record-impact") and report.passed:
+            recorded = item.config.stash.setdefault(impact_recorded_key, {})
+            recorded[impact_map.project_nodeid(item)] = {step.name for step in steps}
+
+        stream_report = item.config.stash.get(stream_report_key, None)
+        if stream_report:
+            started = item.stash.get(test_started_key, time.time())
+            stream_report.add_result(
+                item.nodeid,
+                "error" if report.when == "setup" and report.failed else report.outcome,
+                report.duration,
+                screenshots=new_screenshots(screenshots_dir(), started),
+                longrepr=report.longreprtext if report.failed else None,
+                properties=item.user_properties,
+            )
+
+
+def pytest_runtest_teardown(item, nextitem):
+    """Recycle a bloated browser before the next test of the same class uses it."""
+    if not item.stash.get(recycle_key, False) or nextitem is None or nextitem.cls is not item.cls:
+        return
+    driver = item.cls.driver
+    logger.warning(f"Browser memory above [resources] recycle_rss_mb after {item.nodeid}, recycling the session")
+    try:
+        restart_session(driver)
+        driver.maximize_window()
+        driver.implicitly_wait(10)
+        item.cls.resource_sampler.reset_history()
+        add_report_note(item.config, f"Browser session recycled after {item.nodeid} (memory above threshold)")
+    except Exception as e:
+        logger.exception(f"Could not recycle the browser session: {e}")
+
+
+def run_visual_diff(config):
+    """Compare the screenshots written during this run with their baselines and report the differences."""
+    from pathlib import Path
+    from Project1_Guvi_Automation.utils import visual_diff
+
+    folder = screenshots_dir()
+    names = [os.path.basename(path) for path in new_screenshots(folder, config.stash[session_started_key])]
+    try:
+        results = visual_diff.compare_all(names, screenshots_dir=folder)
+    except Exception as e:
+        logger.warning(f"Visual diff failed: {e}")
+        return
+
+    for result in results:
+        if result["status"] == "diff":
+            add_report_note(config, f"Visual diff: {result['name']} differs from its baseline (score {result['score']:.4f})",
+                            Path(result["diff"]).as_uri())
+        elif result["status"] in ("new", "size"):
+            add_report_note(config, f"Visual diff: {result['name']} {'has no baseline' if result['status'] == 'new' else 'changed size: ' + result['score']}")
+    if results:
+        matched = sum(1 for result in results if result["status"] == "match")
+        index = os.path.join(artifact_path(get_config("visual_diff", "diff_dir", "visual_diffs")), "index.html")
+        add_report_note(config, f"Visual diff: {matched} of {len(results)} screenshots match their baselines",
+                        Path(index).as_uri())
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Close the run history and the streaming report, and save the impact map."""
+    write_history(session.config, "finish", exitstatus)
+
+    if session.config.getoption("--visual-diff") and not session.config.option.collectonly:
+        run_visual_diff(session.config)
+
+    # Healed locators still work, but only through a fallback: list them so the primaries get fixed
+    for name, (primary, candidate) in sorted(session.config.stash.get(healed_locators_key, {}).items()):
+        add_report_note(session.config, f"Locator healed: {name} primary {primary} no longer matches, "
+                                         f"{candidate} does; update the primary locator")
+
+    export_command_trace(session.config)
+
+    hidden, clicks = session.config.stash.get(overlay_counts_key, (0, 0))
+    if hidden:
+        cost = float(get_config("overlays", "interception_cost_seconds", "30"))
+        add_report_note(session.config, f"Overlays hidden: {hidden}, clicks that would have been intercepted: {clicks} "
+                                         f"(up to {clicks * cost:.0f}s of click retries saved)")
+
+    timings = session.config.stash.get(network_timings_key, None)
+    if timings:
+        path = network_profiles.save_timings(timings)
+        for name, steps in sorted(timings.items()):
+            add_report_note(session.config, f"Network profile {name}: {sum(len(s) for s in steps.values())} step timings "
+                                             f"saved to {os.path.basename(path)} (compare with utils/network_profiles.py)")
+
+    stream_report = session.config.stash.get(stream_report_key, None)
+    if stream_report:
+        for text, link in session.config.stash.get(report_notes_key, []):
+            stream_report.add_note(text, link)
+        stream_report.close()
+
+    site = session.config.stash.get(standin_site_key, None)
+    if site:
+        site.__exit__(None, None, None)
+
+    recorded = session.config.stash.get(impact_recorded_key, None)
+    if recorded:
+        impact_map.save_map(project_path(get_config("impact", "map_path", "impact_map.json")), recorded)
@@ -1,10 +1,12 @@
 from selenium.webdriver.common.by import By
 import logging
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from Project1_Guvi_Automation.utils.deadline import BudgetedWait
+from Project1_Guvi_Automation.utils import conditions as EC
 from selenium.common.exceptions import (NoSuchElementException,TimeoutException)
 from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils.step_timer import timed_step
 from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.utils import navigation
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -14,13 +16,16 @@ class Dashboard_Page(Home_Page):
         Page Object for the Dashboard Page.
         Inherits from Home_Page and contains actions specific to the dashboard.
         """
-    def __init__(self,driver):
+    # Name of this page in the navigation graph (utils/navigation.py)
+    PAGE = "dashboard"
+
+    def __init__(self,driver,window=None):
         """Initialize dashboard Page elements and load configuration values."""
 
-        # Create WebDriverWait instance for waiting on elements
-        self.wait = WebDriverWait(driver, 30)
+        # Create BudgetedWait instance for waiting on elements (capped by the test's time budget)
+        self.wait = BudgetedWait(driver, 30)
         # Call parent constructor to initialize driver
-        super().__init__(driver)
+        super().__init__(driver, window)
 
         # Load expected dashboard page title from config.ini
         self.url = get_config("dashboard_guvi", "url")
@@ -33,6 +38,7 @@ class Dashboard_Page(Home_Page):
 
    # ----------------- LOGOUT ACTION------------------------
 
+    @timed_step
     def click_logout_dropdown(self):
         """ Click on the profile dropdown to open it. """
         try:
@@ -44,6 +50,7 @@ class Dashboard_Page(Home_Page):
             logger.error(f"Failed to click logout dropdown: {e}")
             raise AssertionError(f"Logout dropdown not clickable: {e}")
 
+    @timed_step
     def click_logout(self):
         """ Click the logout button from the dropdown."""
         try:
@@ -55,6 +62,7 @@ class Dashboard_Page(Home_Page):
             logger.error(f"Logout button click failed: {e}")
             raise AssertionError(f"Logout process failed: {e}")
 
+    @timed_step
     def wait_logout_load(self):
         """
               Wait until the page redirects back to the login/home page after logout.
@@ -62,6 +70,7 @@ class Dashboard_Page(Home_Page):
         try:
             # Wait until URL is the expected homepage URL after logout
             self.wait.until(EC.url_to_be(get_config("guvi", "url")))
+            navigation.visited(self.driver, "home")
             logger.info("Logout successful, redirected to homepage.")
 
         except TimeoutException as e:
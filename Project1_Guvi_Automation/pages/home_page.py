@@ -1,26 +1,37 @@
 from selenium.webdriver.common.by import By
 import logging
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from Project1_Guvi_Automation.utils.deadline import BudgetedWait
+from Project1_Guvi_Automation.utils import conditions as EC
 from selenium.common.exceptions import (NoSuchElementException,TimeoutException)
 from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils.step_timer import timed_step
+from Project1_Guvi_Automation.utils.element_state import query_states
+from Project1_Guvi_Automation.utils import navigation
+from Project1_Guvi_Automation.utils.healing import HealingLocator
+from Project1_Guvi_Automation.utils import tabs
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
 class Home_Page():
-    def __init__(self,driver):
+    # Name of this page in the navigation graph (utils/navigation.py)
+    PAGE = "home"
+
+    def __init__(self,driver,window=None):
         """
             Page Object Model (POM) class for the GUVI Home Page.
             It contains:
                 - All locators on the homepage
                 - Reusable actions (methods) to interact with homepage elements
                 - Assertions to verify UI behavior
+            window is the handle of the tab the page lives in when several tabs
+            share the browser (utils/tabs.py), None for a single window.
             """
-        # Store driver instance
+        # Store driver instance and the page's window
         self.driver=driver
-        # WebDriverWait to use throughout the class (default 30 sec)
-        self.wait = WebDriverWait(self.driver, 30)
+        self.window=window
+        # BudgetedWait to use throughout the class (default 30 sec, capped by the test's time budget)
+        self.wait = BudgetedWait(self.driver, 30)
 
         # Load config values from config.ini
         self.url = get_config("guvi", "url")
@@ -29,19 +40,37 @@ class Home_Page():
         self.course_url=get_config("guvi","course_url")
 
         # -------Locators------
+        # Locators that depend on generated class names or positions are HealingLocators:
+        # the primary first, then fallbacks by id, CSS, text and page structure (utils/healing.py)
+
         # Header buttons
-        self.login_button=(By.LINK_TEXT, "Login")
-        self.signup_button=(By.XPATH,"//a[text()='Sign up']")
+        self.login_button=HealingLocator("Home_Page.login_button", (By.LINK_TEXT, "Login"),
+                                         (By.CSS_SELECTOR, "a[href*='sign-in']"))
+        self.signup_button=HealingLocator("Home_Page.signup_button", (By.XPATH,"//a[text()='Sign up']"),
+                                          (By.CSS_SELECTOR, "a[href*='register']"),
+                                          (By.XPATH, "//a[normalize-space()='Sign up']"))
 
         # Top menu items
         self.Menu_items={
-            "Courses":(By.XPATH,"//a[contains(@class,'rwl3jt-0 my-2')]"),
-            "Live_class":(By.XPATH,"//p[text()='LIVE Classes']"),
-            "Practice":(By.XPATH,"//p[@id='practiceslink']")
+            "Courses":HealingLocator("Home_Page.Menu_items.Courses", (By.XPATH,"//a[contains(@class,'rwl3jt-0 my-2')]"),
+                                     (By.CSS_SELECTOR, "header a[href*='/courses']"),
+                                     (By.XPATH, "//a[normalize-space()='Courses']"),
+                                     (By.XPATH, "(//header//nav//a)[1]")),
+            "Live_class":HealingLocator("Home_Page.Menu_items.Live_class", (By.XPATH,"//p[text()='LIVE Classes']"),
+                                        (By.XPATH, "//*[normalize-space()='LIVE Classes']")),
+            "Practice":HealingLocator("Home_Page.Menu_items.Practice", (By.XPATH,"//p[@id='practiceslink']"),
+                                      (By.ID, "practiceslink"),
+                                      (By.XPATH, "//p[normalize-space()='Practice']"))
         }
         # Dropdown elements for menu items
-        self.live_class_dropdown = (By.XPATH, "(//ul[@class='⭐️rwl3jt-0 list-none'])[5]")
-        self.practice_dropdown = (By.XPATH, "(//ul[@class='⭐️rwl3jt-0 list-none'])[6]")
+        self.live_class_dropdown = HealingLocator("Home_Page.live_class_dropdown",
+                                                  (By.XPATH, "(//ul[@class='⭐️rwl3jt-0 list-none'])[5]"),
+                                                  (By.XPATH, "//p[text()='LIVE Classes']/following::ul[1]"),
+                                                  (By.XPATH, "(//ul[contains(@class,'list-none')])[5]"))
+        self.practice_dropdown = HealingLocator("Home_Page.practice_dropdown",
+                                                (By.XPATH, "(//ul[@class='⭐️rwl3jt-0 list-none'])[6]"),
+                                                (By.XPATH, "//p[@id='practiceslink']/following::ul[1]"),
+                                                (By.XPATH, "(//ul[contains(@class,'list-none')])[6]"))
 
         # Dobby virtual assistant elements
         self.iframe_dobby=(By.CSS_SELECTOR, "iframe[title='chat window']")
@@ -50,12 +79,20 @@ class Home_Page():
 
     # ---------------------- BASIC PAGE ACTIONS ----------------------
 
+    def focus(self):
+        """Send the next WebDriver commands to this page's tab (no-op for a single window)."""
+        if self.window:
+            tabs.focus(self.driver, self.window)
+
+    @timed_step
     def navigate_to_url(self):
         """Navigate to the homepage URL and wait for it to load."""
         try:
+            self.focus()
             logger.info(f"Navigating to URL: {self.url}")
             self.driver.get(self.url)
             self.wait.until(EC.url_to_be(self.url))
+            navigation.visited(self.driver, self.PAGE)
             logger.info(f"Successfully navigated to: {self.url}")
 
         except TimeoutException as e:
@@ -63,6 +100,32 @@ class Home_Page():
             raise AssertionError(f"Failed to navigate to URL: {e}")
 
 
+    @timed_step
+    def ensure_on(self):
+        """
+        Bring the browser to this page by the cheapest route (URL load, in-app click or back).
+        Does nothing when the browser is already here and the page's form hasn't been used.
+        """
+        self.focus()
+        navigation.ensure_on(self.driver, self.PAGE)
+
+    @timed_step
+    def start_loading(self):
+        """
+        Start loading the page URL in this page's tab. Returns at once when the browser
+        uses the "none" page load strategy; wait for loaded() before using the page.
+        """
+        self.focus()
+        logger.info(f"Loading URL: {self.url}")
+        self.driver.get(self.url)
+        navigation.visited(self.driver, self.PAGE)
+
+    def loaded(self, driver):
+        """Condition: the page URL has finished loading (to yield in utils/tabs.py checks)."""
+        return driver.current_url == self.url and driver.execute_script("return document.readyState") == "complete"
+
+
+    @timed_step
     def get_title(self):
         """Return the page title after verifying it contains expected text."""
         try:
@@ -77,6 +140,7 @@ class Home_Page():
 
     # ---------------------- LOGIN BUTTON ----------------------
 
+    @timed_step
     def get_login_button(self):
         """Locate and return the Login button element."""
         try:
@@ -90,12 +154,14 @@ class Home_Page():
             raise AssertionError(f"Login button not found: {e}")
 
 
+    @timed_step
     def click_login_button(self):
         """Click the Login button and verify navigation to sign-in page."""
         try:
              logger.info("Attempting to click Login button")
              self.get_login_button().click()
              self.wait.until(EC.url_contains("sign-in"))
+             navigation.visited(self.driver, "login")
              logger.info("Clicked on Login button and navigated to sign-in page")
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -105,6 +171,7 @@ class Home_Page():
 
     # ---------------------- SIGNUP BUTTON ----------------------
 
+    @timed_step
     def get_signup_button(self):
         """Locate and return the Sign up button element."""
         try:
@@ -117,12 +184,14 @@ class Home_Page():
             logger.error(f"Sign up button not found: {e}")
             raise AssertionError(f"Sign up button not found: {e}")
 
+    @timed_step
     def click_signup_button(self):
         """Click the Sign up button and verify navigation to register page."""
         try:
             logger.info("Attempting to click Sign up button")
             self.get_signup_button().click()
             self.wait.until(EC.url_contains("register"))
+            navigation.visited(self.driver, "signup")
             logger.info("Clicked on Sign up button and navigated to register page")
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -132,6 +201,21 @@ class Home_Page():
 
     # ---------------------- MENU ITEMS VERIFICATION ----------------------
 
+    @timed_step
+    def click_courses_menu(self):
+        """Click the Courses menu item and wait for the courses page to load."""
+        try:
+            logger.info("Attempting to click Courses menu item")
+            self.wait.until(EC.element_to_be_clickable(self.Menu_items["Courses"])).click()
+            self.wait.until(EC.url_to_be(self.course_url))
+            navigation.visited(self.driver, "courses")
+            logger.info("Clicked on Courses menu item and navigated to courses page")
+
+        except (NoSuchElementException, TimeoutException) as e:
+            logger.error(f"Courses menu item click failed: {e}")
+            raise AssertionError(f"Courses menu item not found: {e}")
+
+    @timed_step
     def verify_and_click_menu_items(self):
         """
         Verify top menu items are visible, enabled, and clickable.
@@ -160,25 +244,29 @@ class Home_Page():
                     logger.info("Verifying Courses navigation")
                     self.wait.until(EC.url_to_be(self.course_url))
                     assert self.driver.current_url== self.course_url, f"Clicking '{name}' did not navigate"
+                    navigation.visited(self.driver, "courses")
                     logger.info("Courses page navigation verified")
 
                     # Go back to homepage
                     self.driver.back()
                     self.wait.until(EC.url_to_be(get_config("guvi","url")))
+                    navigation.went_back(self.driver)
                     self.wait.until(EC.element_to_be_clickable(locator))
 
                 elif name == "Live_class":
                     # Verify Live Class dropdown
                     logger.info("Verifying Live Classes dropdown")
-                    dropdown = self.wait.until(EC.visibility_of_element_located(self.live_class_dropdown))
-                    assert dropdown.is_displayed() and dropdown.is_enabled(), "Live Classes dropdown not visible or enabled"
+                    self.wait.until(EC.visibility_of_element_located(self.live_class_dropdown))
+                    dropdown = self.menu_snapshot()["Live_class_dropdown"]
+                    assert dropdown.displayed and dropdown.enabled, "Live Classes dropdown not visible or enabled"
                     logger.info("Live Classes dropdown is visible and enabled")
 
                 elif name == "Practice":
                     # Verify Practice dropdown
                     logger.info("Verifying Practice dropdown")
-                    dropdown = self.wait.until(EC.visibility_of_element_located(self.practice_dropdown))
-                    assert dropdown.is_displayed() and dropdown.is_enabled(), "Practice dropdown not visible or enabled"
+                    self.wait.until(EC.visibility_of_element_located(self.practice_dropdown))
+                    dropdown = self.menu_snapshot()["Practice_dropdown"]
+                    assert dropdown.displayed and dropdown.enabled, "Practice dropdown not visible or enabled"
                     logger.info("Practice dropdown is visible and enabled")
 
                 results[name] = "Passed"
@@ -192,6 +280,7 @@ class Home_Page():
 
     # ---------------------- DOBBY VIRTUAL ASSISTANT ----------------------
 
+    @timed_step
     def verify_dobby_virtual_assistant(self):
         """
         Verify that the Dobby virtual assistant icon is present on the page.
@@ -210,6 +299,7 @@ class Home_Page():
             logger.error(f"Dobby assistant not found: {e}")
             raise AssertionError(f"Dobby assistant not found: {e}")
 
+    @timed_step
     def click_dobby_virtual_assistant(self):
         """
             Click the Dobby virtual assistant icon,
@@ -232,15 +322,16 @@ class Home_Page():
 
             # wait for the chatbox inside iframe
             logger.info("Waiting for Dobby chatbox inside iframe")
-            chatbox = self.wait.until(EC.visibility_of_element_located(self.dobby_chatbox))
+            self.wait.until(EC.visibility_of_element_located(self.dobby_chatbox))
 
-            # Verify chatbox visibility
-            assert chatbox.is_displayed() and chatbox.is_enabled(), \
+            # Verify chatbox visibility and read its title in one call
+            chatbox = query_states(self.driver, {"chatbox": self.dobby_chatbox})["chatbox"]
+            assert chatbox.displayed and chatbox.enabled, \
                 "Dobby chatbox is not displayed or not enabled"
             logger.info("Dobby assistant chatbox is fully visible")
 
             # Get and log chatbox title
-            chatbox_title = chatbox.text.strip()
+            chatbox_title = chatbox.text
             logger.info(f"Dobby assistant chatbox title: {chatbox_title}")
 
             # Switch back to the main page
@@ -251,4 +342,26 @@ class Home_Page():
 
         except (NoSuchElementException, TimeoutException) as e:
             logger.error(f"Dobby chatbox not found or not loaded: {e}")
-            raise AssertionError(f"Dobby chatbox not found: {e}")
\ No newline at end of file
+            raise AssertionError(f"Dobby chatbox not found: {e}")
+
+    # ---------------------- SNAPSHOTS ----------------------
+    # State of a group of elements (found, displayed, enabled, text, rect, attributes)
+    # read in a single WebDriver call, for assertions that check several properties.
+
+    @timed_step
+    def header_snapshot(self):
+        """Return the state of the Login and Sign up buttons: {"login": ..., "signup": ...}."""
+        return query_states(self.driver, {"login": self.login_button, "signup": self.signup_button}, ["href"])
+
+    @timed_step
+    def menu_snapshot(self):
+        """Return the state of the menu items and of the Live Classes / Practice dropdowns."""
+        locators = dict(self.Menu_items)
+        locators["Live_class_dropdown"] = self.live_class_dropdown
+        locators["Practice_dropdown"] = self.practice_dropdown
+        return query_states(self.driver, locators)
+
+    @timed_step
+    def dobby_snapshot(self):
+        """Return the state of the Dobby assistant icon and of its chat iframe (if opened)."""
+        return query_states(self.driver, {"icon": self.click_dobby_assistant, "iframe": self.iframe_dobby}, ["title"])
\ No newline at end of file
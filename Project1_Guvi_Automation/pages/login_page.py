@@ -1,10 +1,12 @@
 from selenium.webdriver.common.by import By
 import logging
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from Project1_Guvi_Automation.utils.deadline import BudgetedWait
+from Project1_Guvi_Automation.utils import conditions as EC
 from selenium.common.exceptions import (NoSuchElementException,TimeoutException)
 from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils.step_timer import timed_step
 from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.utils import navigation
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -15,13 +17,16 @@ class Login_Page(Home_Page):
         Provides methods to interact with login fields, submit login form,
         and capture any error messages.
         """
-    def __init__(self,driver):
+    # Name of this page in the navigation graph (utils/navigation.py)
+    PAGE = "login"
+
+    def __init__(self,driver,window=None):
         """
                 Initialize the login page with driver and wait.
                 Load the login URL from configuration file.
                 """
-        self.wait = WebDriverWait(driver, 10)
-        super().__init__(driver)
+        self.wait = BudgetedWait(driver, 10)
+        super().__init__(driver, window)
 
         # Load from config.ini
         self.url = get_config("login_guvi", "url")
@@ -38,11 +43,13 @@ class Login_Page(Home_Page):
 
     # --------LOGIN ACTIONS-----------------------
 
+    @timed_step
     def enter_username(self,username):
         """ Enter the provided username/email into the username field. """
         try:
             # Wait until username field is visible, then send keys
             self.wait.until(EC.visibility_of_element_located(self.username_input)).send_keys(username)
+            navigation.touched(self.driver)
             logger.info(f"Entered username: {username}")
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -50,11 +57,13 @@ class Login_Page(Home_Page):
             raise AssertionError(f"Username/email field not found: {e}")
 
 
+    @timed_step
     def enter_password(self,password):
         """ Enter the provided password into the password field."""
         try:
             # Wait until password field is visible, then send keys
             self.wait.until(EC.visibility_of_element_located(self.password_input)).send_keys(password)
+            navigation.touched(self.driver)
             logger.info("Entered password on Login page")
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -63,6 +72,7 @@ class Login_Page(Home_Page):
 
     #  ---- SUBMIT BUTTON------
 
+    @timed_step
     def click_login(self):
         """ Click on the Login button to submit the login form."""
         try:
@@ -75,11 +85,13 @@ class Login_Page(Home_Page):
             raise AssertionError(f"Login button not found: {e}")
 
 
+    @timed_step
     def wait_login_load(self):
         """ Wait for the login to complete and the URL to contain 'courses'."""
         try:
             # Wait until the page URL contains 'courses' indicating successful login
             self.wait.until(EC.url_contains("courses"))
+            navigation.visited(self.driver, "dashboard")
             logger.info("Login successful, navigated to user Home page.")
 
         except TimeoutException as e:
@@ -87,6 +99,7 @@ class Login_Page(Home_Page):
             raise AssertionError(f"Login not successful: {e}")
 
 
+    @timed_step
     def get_error_message(self):
         """Return whichever error is visible. Checks for both email and password errors."""
         errors = [
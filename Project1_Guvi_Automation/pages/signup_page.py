@@ -1,25 +1,29 @@
 from selenium.webdriver.common.by import By
 import logging
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from Project1_Guvi_Automation.utils.deadline import BudgetedWait
+from Project1_Guvi_Automation.utils import conditions as EC
 from selenium.common.exceptions import (NoSuchElementException,TimeoutException)
 from selenium.webdriver.support.select import Select
 from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils.step_timer import timed_step
 from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.utils import navigation
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 class Signup_Page(Home_Page):
+    # Name of this page in the navigation graph (utils/navigation.py)
+    PAGE = "signup"
 
-    def __init__(self,driver):
+    def __init__(self,driver,window=None):
         """Initialize Signup Page elements and load configuration values."""
 
-        # Create WebDriverWait instance for waiting on elements
-        self.wait = WebDriverWait(driver, 10)
+        # Create BudgetedWait instance for waiting on elements (capped by the test's time budget)
+        self.wait = BudgetedWait(driver, 10)
 
         # Call parent constructor to initialize driver
-        super().__init__(driver)
+        super().__init__(driver, window)
 
         # Get the signup page URL from config.ini
         self.url = get_config("signup_guvi", "url")
@@ -39,40 +43,48 @@ class Signup_Page(Home_Page):
 
     # ---------- FORM FIELD ACTIONS ----------
 
+    @timed_step
     def enter_name(self,name):
         """Enter the full name into the name field."""
         try:
             self.wait.until(EC.visibility_of_element_located(self.name_input)).send_keys(name)
+            navigation.touched(self.driver)
             logger.info(f"Entered username: {name}")
 
         except (NoSuchElementException, TimeoutException) as e:
             logger.error(f"Failed to enter name: {e}")
             raise AssertionError(f"Name field not found: {e}")
 
+    @timed_step
     def enter_email(self, email):
         """Enter the email into the email field."""
         try:
             self.wait.until(EC.visibility_of_element_located(self.email_input)).send_keys(email)
+            navigation.touched(self.driver)
             logger.info(f"Entered email: {email}")
 
         except (NoSuchElementException, TimeoutException) as e:
             logger.error(f"Failed to enter email: {e}")
             raise AssertionError(f"Email field not found: {e}")
 
+    @timed_step
     def enter_password(self, password):
         """Enter the password into the password field."""
         try:
             self.wait.until(EC.visibility_of_element_located(self.password_input)).send_keys(password)
+            navigation.touched(self.driver)
             logger.info(f"Entered password: {password}")
 
         except (NoSuchElementException, TimeoutException) as e:
             logger.error(f"Failed to enter password: {e}")
             raise AssertionError(f"Password field not found: {e}")
 
+    @timed_step
     def enter_mobile_number(self, number):
         """Enter the mobile number into the mobile number field."""
         try:
             self.wait.until(EC.visibility_of_element_located(self.mobile_number_input)).send_keys(number)
+            navigation.touched(self.driver)
             logger.info(f"Entered mobile number: {number}")
 
         except (NoSuchElementException, TimeoutException) as e:
@@ -81,10 +93,12 @@ class Signup_Page(Home_Page):
 
     # --------------------- BUTTONS ---------------------
 
+    @timed_step
     def click_signup(self):
         """Click the Sign Up button."""
         try:
             self.wait.until(EC.element_to_be_clickable(self.signup_button)).click()
+            navigation.touched(self.driver)
             logger.info("Clicked Sign Up button")
 
         except TimeoutException as e:
@@ -93,6 +107,7 @@ class Signup_Page(Home_Page):
 
     # --------------------- DROPDOWNS ---------------------
 
+    @timed_step
     def enter_current_profile_dropdown(self):
         """Select 'Looking for a career' from Current Profile dropdown."""
         try:
@@ -106,6 +121,7 @@ class Signup_Page(Home_Page):
             raise AssertionError(f"Current Profile dropdown not found: {e}")
 
 
+    @timed_step
     def enter_degree_dropdown(self):
         """Select 'B.E. / B.Tech. Computer Science' from Degree dropdown."""
         try:
@@ -120,6 +136,7 @@ class Signup_Page(Home_Page):
 
     # --------------------- OTHER FIELDS ---------------------
 
+    @timed_step
     def enter_year_passed_out(self,year):
         """Enter the passing year."""
         try:
@@ -130,10 +147,12 @@ class Signup_Page(Home_Page):
             logger.error(f"Failed to enter passing year: {e}")
             raise AssertionError(f"Year field not found: {e}")
 
+    @timed_step
     def click_submit(self):
         """Click the Submit button."""
         try:
             self.wait.until(EC.element_to_be_clickable(self.submit_button)).click()
+            navigation.touched(self.driver)
             logger.info("Clicked Submit button")
 
         except TimeoutException as e:
@@ -142,6 +161,7 @@ class Signup_Page(Home_Page):
 
     # --------------------- VALIDATIONS ---------------------
 
+    @timed_step
     def signup_success_message(self):
         """Verify if signup success message is displayed."""
         try:
@@ -154,11 +174,13 @@ class Signup_Page(Home_Page):
             logger.error(f"Signup success message not found: {e}")
             raise AssertionError(f"Success message not found: {e}")
 
+    @timed_step
     def click_login_signup_page(self):
         """Click the Login link on the signup page and wait for login page to load."""
         try:
             self.wait.until(EC.element_to_be_clickable(self.signup_login)).click()
             self.wait.until(EC.url_contains("sign-in"))
+            navigation.visited(self.driver, "login")
             logger.info("Navigated to Login page from Signup page")
 
         except TimeoutException as e:
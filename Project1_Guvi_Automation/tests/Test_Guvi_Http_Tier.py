@@ -0,0 +1,72 @@
+import pytest
+import logging
+from Project1_Guvi_Automation.config_reader import get_config
+
+# Set up logger for this test module
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.http_tier
+class Test_Guvi_Http_Tier:
+    """
+        Browserless fast tier for the GUVI site.
+        Verifies status codes, redirects, the page title and the key header links
+        straight from the HTML, without launching a browser.
+        Run it alone with:  pytest -m http_tier tests/Test_Guvi_Http_Tier.py
+        """
+
+    def test_ht1_validate_url(self, http_client):
+        """
+            Fast tier for Test Case 1: the GUVI URL answers 200 and ends on the configured URL.
+            """
+        expected_url = get_config("guvi", "url")
+        page = http_client.fetch(expected_url)
+
+        assert page.status == 200, f"Unexpected status {page.status} for {expected_url}"
+        assert page.url == expected_url, f"URL mismatch, redirected to {page.url}"
+        logger.info(f"GUVI URL answered {page.status} in {page.elapsed * 1000:.0f} ms")
+
+    def test_ht2_validate_title(self, http_client):
+        """
+            Fast tier for Test Case 2: the homepage <title> matches the configured title.
+            """
+        page = http_client.fetch(get_config("guvi", "url"))
+
+        assert page.title == get_config("guvi", "title"), f"Title mismatch: '{page.title}'"
+        logger.info(f"Title matched successfully: {page.title}")
+
+    @pytest.mark.parametrize("section", ["guvi", "login_guvi", "signup_guvi"])
+    def test_ht3_validate_status_and_redirects(self, http_client, section):
+        """
+            Every configured page answers 200 within a short redirect chain.
+            """
+        url = get_config(section, "url")
+        page = http_client.fetch(url)
+
+        assert page.status == 200, f"{url} answered {page.status} after redirects {page.redirects}"
+        assert len(page.redirects) <= 2, f"{url} redirect chain too long: {page.redirects}"
+        logger.info(f"{url} answered {page.status} after {len(page.redirects)} redirects")
+
+    def test_ht4_validate_plain_http_redirects_to_https(self, http_client):
+        """
+            The plain HTTP homepage redirects to the configured HTTPS homepage.
+            Skipped when the configured URL is plain HTTP already (the local stand-in site).
+            """
+        expected_url = get_config("guvi", "url")
+        if not expected_url.startswith("https://"):
+            pytest.skip(f"{expected_url} is not HTTPS, there is no redirect to check")
+        page = http_client.fetch(expected_url.replace("https://", "http://", 1))
+
+        assert page.redirects, "Plain HTTP request was not redirected"
+        assert page.url == expected_url, f"Redirected to {page.url} instead of {expected_url}"
+        logger.info(f"HTTP redirect chain: {page.redirects}")
+
+    def test_ht5_validate_login_and_signup_links(self, http_client):
+        """
+            Fast tier for Test Cases 3 and 4: the homepage HTML contains the Login and Sign up links.
+            """
+        page = http_client.fetch(get_config("guvi", "url"), wanted_links=("Login", "Sign up"))
+
+        assert page.has_link("Login"), "Login link not found in homepage HTML"
+        assert page.has_link("Sign up"), "Sign up link not found in homepage HTML"
+        logger.info(f"Login -> {page.links['Login']}, Sign up -> {page.links['Sign up']}")
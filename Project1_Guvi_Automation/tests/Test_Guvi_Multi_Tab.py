@@ -0,0 +1,148 @@
+import pytest
+import logging
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.utils import conditions as EC
+from Project1_Guvi_Automation.utils import navigation, overlays, step_timer
+from Project1_Guvi_Automation.utils.tabs import TabScheduler
+
+# Set up logger for this test module
+logger = logging.getLogger(__name__)
+
+
+# ---------------------- READ-ONLY CHECKS ----------------------
+# The read_only tests of Test_Guvi_Page_automation.py as checks for utils/tabs.py:
+# each yields the condition it waits for, so the other tabs keep working meanwhile.
+
+def tc1_url(tab):
+    """TC1: the GUVI homepage loads at the configured URL."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+    assert tab.driver.current_url == get_config("guvi", "url"), "URL mismatch,Page not loaded successfully"
+
+
+def tc2_title(tab):
+    """TC2: the homepage title matches config.ini."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+    yield EC.title_contains("GUVI | Learn to code")
+    assert tab.driver.title == get_config("guvi", "title"), "Title mismatch"
+
+
+def tc3_login_button(tab):
+    """TC3: the Login button is displayed and enabled and opens the login page."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+    login_button = yield EC.element_to_be_clickable(homepage.login_button)
+    state = homepage.header_snapshot()["login"]
+    assert state.displayed and state.enabled, "Login button is not displayed or not enabled"
+
+    login_button.click()
+    yield EC.url_contains("sign-in")
+    navigation.visited(tab.driver, "login")
+    assert tab.driver.current_url == get_config("login_guvi", "url"), "URL mismatch, page not loaded successfully"
+
+
+def tc4_signup_button(tab):
+    """TC4: the Sign up button is displayed and enabled and opens the register page."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+    signup_button = yield EC.element_to_be_clickable(homepage.signup_button)
+    state = homepage.header_snapshot()["signup"]
+    assert state.displayed and state.enabled, "signup button not displayed and enabled"
+
+    signup_button.click()
+    yield EC.url_contains("register")
+    navigation.visited(tab.driver, "signup")
+    expected_url = get_config("signup_guvi", "url")
+    assert tab.driver.current_url == expected_url, \
+        f"URL mismatch: expected '{expected_url}', got '{tab.driver.current_url}'"
+
+
+def tc8_menu_items(tab):
+    """TC8: Courses opens the courses page, LIVE Classes and Practice open their dropdowns."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+
+    courses = yield EC.element_to_be_clickable(homepage.Menu_items["Courses"])
+    courses.click()
+    yield EC.url_to_be(homepage.course_url)
+    navigation.visited(tab.driver, "courses")
+    tab.driver.back()
+    yield homepage.loaded
+    navigation.went_back(tab.driver)
+
+    for name, dropdown_locator, key in (("Live_class", homepage.live_class_dropdown, "Live_class_dropdown"),
+                                        ("Practice", homepage.practice_dropdown, "Practice_dropdown")):
+        menu = yield EC.element_to_be_clickable(homepage.Menu_items[name])
+        menu.click()
+        yield EC.visibility_of_element_located(dropdown_locator)
+        dropdown = homepage.menu_snapshot()[key]
+        assert dropdown.displayed and dropdown.enabled, f"{name} dropdown not visible or enabled"
+
+
+def tc9_dobby(tab):
+    """TC9: the Dobby assistant is displayed and enabled and opens its chat window."""
+    homepage = Home_Page(tab.driver, window=tab.handle)
+    homepage.start_loading()
+    yield homepage.loaded
+    # The tab is shared with the other checks: show the Dobby widget in this document only
+    overlays.restore(tab.driver)
+    yield EC.element_to_be_clickable(homepage.click_dobby_assistant)
+    dobby = homepage.dobby_snapshot()["icon"]
+    assert dobby.displayed and dobby.enabled, "Dobby assistant not displayed or enabled"
+
+    # The chat window is read inside its iframe in one go: the frame doesn't survive a yield
+    actual_title = homepage.click_dobby_virtual_assistant()
+    expected_title = get_config("guvi", "dobby_title")
+    assert actual_title == expected_title, \
+        f"Chatbox title mismatch: expected '{expected_title}', got '{actual_title}'"
+
+
+CHECKS = {
+    "tc1_url": tc1_url,
+    "tc2_title": tc2_title,
+    "tc3_login_button": tc3_login_button,
+    "tc4_signup_button": tc4_signup_button,
+    "tc8_menu_items": tc8_menu_items,
+    "tc9_dobby": tc9_dobby,
+}
+
+
+@pytest.fixture(scope="module")
+def tab_results(tab_browser, overlay_suppression):
+    """Run every check once, interleaved in the tabs of the shared browser."""
+    scheduler = TabScheduler(
+        tab_browser,
+        tabs=int(get_config("multi_tab", "tabs", "3")),
+        wait_seconds=float(get_config("multi_tab", "wait_seconds", "30")),
+        screenshots_dir="screenshots",
+        on_open=overlay_suppression,
+    )
+    return scheduler.run(CHECKS)
+
+
+@pytest.mark.multi_tab
+class Test_Guvi_Multi_Tab:
+    """
+        Read-only checks of the anonymous GUVI homepage (TC1-TC4, TC8, TC9)
+        run interleaved in the tabs of a single browser.
+        Run them with:  pytest --multi-tab
+        """
+
+    @pytest.mark.parametrize("check", list(CHECKS))
+    def test_read_only_check(self, tab_results, check):
+        """
+            Reports the outcome of one check: its page-object steps are recorded
+            for this test and its failure, if any, is raised again.
+            """
+        outcome = tab_results[check]
+        step_timer.swap_steps(list(outcome.steps))
+        logger.info(f"Check {check} ran in tab {outcome.tab} in {outcome.duration:.2f}s")
+        if outcome.error is not None:
+            raise outcome.error
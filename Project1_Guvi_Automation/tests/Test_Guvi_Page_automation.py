@@ -18,6 +18,7 @@ class Test_Guvi_Automation_Page:
         registeration login and logout
         """
 
+    @pytest.mark.read_only
     def test_tc1_validate_url(self, setup):
         """
                Test Case 1: Verify whether the given GUVI URL loads successfully.
@@ -55,6 +56,8 @@ class Test_Guvi_Automation_Page:
             raise
 
 
+    @pytest.mark.read_only
+    @pytest.mark.depends_on("test_tc1_validate_url")
     def test_tc2_validate_title(self, setup):
         """
             Test Case 2 : Verify the title of the GUVI homepage
@@ -93,6 +96,9 @@ class Test_Guvi_Automation_Page:
             driver.save_screenshot(r"screenshots/TC2_Verify_title_Error.png")
             raise
 
+    @pytest.mark.read_only
+    @pytest.mark.depends_on("test_tc1_validate_url")
+    @pytest.mark.time_budget(120)
     def test_tc8_validate_homepage_menu_items(self, setup):
         """
             Test Case 8:  Verify the visibility and click functionality of homepage menu items
@@ -134,6 +140,9 @@ class Test_Guvi_Automation_Page:
             driver.save_screenshot(r"screenshots/TC8_Verify_menu_items_Error.png")
             raise
 
+    @pytest.mark.read_only
+    @pytest.mark.keep_overlays
+    @pytest.mark.depends_on("test_tc1_validate_url")
     def test_tc9_validate_dobby_assistant(self, setup):
         """
             Test Case 9 : Verify Dobby Virtual Assistant on GUVI homepage
@@ -147,9 +156,10 @@ class Test_Guvi_Automation_Page:
         try:
 
             # Check if the Dobby bot icon is present and visible
-            dobby = homepage.verify_dobby_virtual_assistant()
+            homepage.verify_dobby_virtual_assistant()
+            dobby = homepage.dobby_snapshot()["icon"]
 
-            assert dobby.is_displayed() and dobby.is_enabled(), \
+            assert dobby.displayed and dobby.enabled, \
                 "Dobby assistant not displayed or enabled"
             logger.info("Dobby assistant is visible on the homepage")
 
@@ -178,6 +188,8 @@ class Test_Guvi_Automation_Page:
             driver.save_screenshot(r"screenshots/TC9_Verify_dobby_Error.png")
             raise
 
+    @pytest.mark.read_only
+    @pytest.mark.depends_on("test_tc1_validate_url")
     def test_tc4_validate_signup_button_functionality(self, setup):
         """
             Test Case: TC4 - Validate the functionality of the 'Sign Up' button on the homepage.
@@ -192,15 +204,16 @@ class Test_Guvi_Automation_Page:
         try:
             logger.info("Validate Sign Up button functionality")
 
-            # Step 1: Get the Sign Up button element from the homepage
-            signup_button = homepage.get_signup_button()
+            # Step 1: Wait for the Sign Up button and read its state from the homepage header
+            homepage.get_signup_button()
+            signup_button = homepage.header_snapshot()["signup"]
 
             # Step 2: Verify the Sign Up button is both visible and enabled and prints result
-            assert signup_button.is_displayed() and signup_button.is_enabled(), \
+            assert signup_button.displayed and signup_button.enabled, \
                 "signup button not displayed and enabled"
             logger.info("signup button is displayed and enabled")
-            print('signup button displayed:', signup_button.is_displayed())
-            print('signup button Enabled:', signup_button.is_enabled())
+            print('signup button displayed:', signup_button.displayed)
+            print('signup button Enabled:', signup_button.enabled)
 
             # Step 3: Click on the Sign Up button
             homepage.click_signup_button()
@@ -228,18 +241,18 @@ class Test_Guvi_Automation_Page:
             driver.save_screenshot(r"screenshots/TC4_Verify_signup_Error.png")
             raise
 
+    @pytest.mark.depends_on("test_tc4_validate_signup_button_functionality")
     def test_tc5_validate_signin_via_signup_functionality(self, setup):
         """
             Test Case 5: Sign In via Sign Up Flow
             Steps:
             1. Fill out the sign-up form with valid user details.
             2. Submit the form and verify successful registration.
-            3. Navigate back to homepage and click the Sign Up button again.
+            3. Return to a fresh Sign Up page by the cheapest route (back to the homepage and Sign Up).
             4. From the Sign Up page, click on the 'Login' link to navigate to the login page.
             5. Validate navigation URLs at each step and capture screenshots.
             """
         driver = setup
-        homepage = Home_Page(driver)
 
         try:
             logger.info("Sign In via Sign Up flow")
@@ -268,12 +281,12 @@ class Test_Guvi_Automation_Page:
             # Step 5: Validate current URL after signup
             assert driver.current_url==get_config("signup_guvi","url"),"URL mismatch after signup"
 
-            # Step 6: Navigate back to homepage
-            driver.back()
-
-            # Step 7: Click 'Sign Up' button on homepage again
-            homepage.click_signup_button()
+            # Step 6: Return to a fresh Sign Up page (the form above was used); the navigation
+            #         planner picks the cheapest route, normally back to the homepage and Sign Up
+            signup.ensure_on()
 
+            # Step 7: The Sign Up page is fresh again
+            assert driver.current_url == get_config("signup_guvi", "url"), "URL mismatch on return to Sign Up"
 
             # Step 8: Click 'Login' link from the signup page
             signup.click_login_signup_page()
@@ -300,6 +313,8 @@ class Test_Guvi_Automation_Page:
 
 
 
+    @pytest.mark.read_only
+    @pytest.mark.depends_on("test_tc1_validate_url")
     def test_tc3_validate_login_button_functionality(self, setup):
         """
             Test Case 3: Validate Login Button Functionality
@@ -315,15 +330,16 @@ class Test_Guvi_Automation_Page:
         try:
             logger.info("Validate Login button functionality")
 
-            # Step 1: Get the Login button element from homepage
-            login_button = homepage.get_login_button()
+            # Step 1: Wait for the Login button and read its state from the homepage header
+            homepage.get_login_button()
+            login_button = homepage.header_snapshot()["login"]
 
             # Step 2: Check if login button is displayed and enabled
-            assert login_button.is_displayed() and login_button.is_enabled(), \
+            assert login_button.displayed and login_button.enabled, \
                 "Login button is not displayed or not enabled"
             logger.info("Login button is displayed and enabled")
-            print('Login button displayed:', login_button.is_displayed())
-            print('Login button enabled:', login_button.is_enabled())
+            print('Login button displayed:', login_button.displayed)
+            print('Login button enabled:', login_button.enabled)
 
             # Step 3: Click on the Login button
             homepage.click_login_button()
@@ -474,6 +490,7 @@ class Test_Guvi_Automation_Page:
             raise
 
 
+    @pytest.mark.depends_on("test_tc6_validate_login_valid_credentials")
     def test_tc10_validate_logout_functionality(self, setup):
         """
             Test Case 10: Validate Logout Functionality
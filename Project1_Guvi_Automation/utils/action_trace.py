@@ -0,0 +1,543 @@
+"""
+action_trace.py
+
+Records what the page objects did during a test, so a failure can be
+investigated without running the browser again.
+
+An ActionRecorder follows one browser and records, per test:
+    - every @timed_step page-object action (utils/step_timer.py), with its
+      timing, outcome and error
+    - the WebDriver commands each action sent: the locators it resolved and
+      the element each one resolved to, the clicks, the keys typed (masked in
+      password steps), the URLs loaded
+    - a snapshot of the DOM when a top-level action ends ([action_trace]
+      snapshot_depth), the page's scripts removed. The browser sends the page
+      only when its hash changed since the last snapshot
+At the end of the test the recording is written to one compressed archive,
+<[action_trace] output_dir>/<test>.zip:
+    trace.json             the test, its actions and the elements they used
+    snapshots/0000.html    the first DOM snapshot
+    snapshots/0001.json    every later snapshot as a delta of the one before
+The deltas are computed only when an archive is written, by default only for
+failed tests ([action_trace] keep = failed).
+
+Step through an archive offline:
+    python -m Project1_Guvi_Automation.utils.action_trace traces/<test>.zip
+    python -m Project1_Guvi_Automation.utils.action_trace traces/<test>.zip --action 4
+    python -m Project1_Guvi_Automation.utils.action_trace traces/<test>.zip --html --open
+"""
+import argparse
+import difflib
+import html
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils.command_trace import (ELEMENT_KEY, FIND_COMMANDS, SCRIPT_COMMANDS, SCRIPT_NAME,
+                                                          command_error)
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Action collecting the commands the test code sends itself, outside any page-object step
+TEST_CODE = "(test code)"
+
+# Describes the elements resolved since the last snapshot and returns the page when its hash changed:
+# [url, hash, html or null, [description, ...]]
+SNAPSHOT_JS = """
+var described = arguments[1].map(function (el) {
+    var attributes = Array.prototype.map.call(el.attributes, function (a) {
+        return " " + a.name + '="' + a.value + '"';
+    }).join("");
+    var text = (el.innerText || "").trim().replace(/\\s+/g, " ").slice(0, 80);
+    return "<" + el.tagName.toLowerCase() + attributes + ">" + text;
+});
+var page = document.documentElement.outerHTML, hash = 0;
+for (var i = 0; i < page.length; i++) hash = (hash * 31 + page.charCodeAt(i)) | 0;
+hash = page.length + ":" + hash;
+return [document.URL, hash, hash === arguments[0] ? null : page, described];
+"""
+
+# A snapshot is diffed as a list of chunks ending with ">", about one tag each:
+# line diffs don't work on minified pages written on a single line
+CHUNK = re.compile(r"(?<=>)")
+SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script>", re.S | re.I)
+
+
+class Action:
+    """One page-object action, or a run of commands of the test code."""
+
+    def __init__(self, name, depth, started):
+        self.name = name
+        self.depth = depth
+        self.started = started
+        self.duration = None
+        self.ok = None
+        self.error = None
+        self.commands = []
+        self.url = None
+        self.snapshot = None      # index of the DOM snapshot taken when the action ended
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "started": self.started,
+            "duration": self.duration,
+            "ok": self.ok,
+            "error": self.error,
+            "commands": self.commands,
+            "url": self.url,
+            "snapshot": self.snapshot,
+        }
+
+
+class ActionRecorder:
+    """
+    Records the tests run in the browser driver, between begin_test() and end_test().
+    Only the commands of the thread that began the test are recorded, not those of
+    background samplers (screencast, resources) sharing the driver.
+
+    snapshot_depth - DOM snapshot when an action up to this nesting depth ends (0 = top-level actions)
+    mask_steps - the keys typed in actions whose name contains one of these are masked
+    """
+
+    def __init__(self, driver, snapshot_depth=0, mask_steps=("password",)):
+        self.driver = driver
+        self.snapshot_depth = snapshot_depth
+        self.mask_steps = [name.lower() for name in mask_steps]
+        self.test = None
+        self._execute = None
+        self._reset()
+
+    def _reset(self):
+        self.actions = []
+        self.snapshots = []       # distinct DOM snapshots, scripts removed
+        self.elements = {}        # element reference -> {"locator": ..., "description": ...}
+        self.started = time.time()
+        self._hash = None
+        self._open = []           # actions of the steps still running
+        self._pending = []        # elements resolved since the last snapshot, to describe
+        self._own = False         # the recorder is sending its own commands
+        self._thread = threading.get_ident()
+
+    # ----------------- RECORDING ------------------------
+
+    def attach(self):
+        """Start following the driver's commands and the page-object steps."""
+        executor = self.driver.command_executor
+        # Restored on detach when another wrapper (utils/command_trace.py) was there first
+        execute = self._execute = vars(executor).get("execute")
+        if execute is None:
+            execute = executor.execute
+
+        def recorded_execute(command, params):
+            if self.test is None or self._own or threading.get_ident() != self._thread:
+                return execute(command, params)
+            details = self._details(command, params)
+            start = time.perf_counter()
+            response = execute(command, params)
+            self._command(details, time.perf_counter() - start, response)
+            return response
+
+        executor.execute = recorded_execute
+        step_timer.add_listener(self._on_step)
+        return self
+
+    def detach(self):
+        step_timer.remove_listener(self._on_step)
+        executor = self.driver.command_executor
+        if self._execute is not None:
+            executor.execute = self._execute
+        elif "execute" in vars(executor):
+            del executor.execute
+        self._execute = None
+
+    def begin_test(self, nodeid):
+        self._reset()
+        self.test = nodeid
+
+    def end_test(self):
+        """Stop recording; the recording stays available to save()."""
+        self.test = None
+        self._open = []
+
+    def _on_step(self, event, step, args):
+        if self.test is None or threading.get_ident() != self._thread:
+            return
+        if not args or getattr(args[0], "driver", None) is not self.driver:
+            return
+        try:
+            if event == "start":
+                action = Action(step.name, step.depth, step.started)
+                self.actions.append(action)
+                self._open.append(action)
+            elif self._open:
+                action = self._open.pop()
+                action.duration = step.duration
+                action.ok = step.ok
+                if not step.ok:
+                    # Called from the finally of the step: the exception is still being raised
+                    error = sys.exc_info()[1]
+                    if error is not None:
+                        message = str(error).strip().splitlines()
+                        action.error = f"{type(error).__name__}: {message[0] if message else ''}"
+                if step.depth <= self.snapshot_depth:
+                    self._snapshot(action)
+        except Exception as e:
+            # Recording must never change the outcome of a test
+            logger.debug(f"Action trace: could not record step {step.name}: {e}")
+
+    def _details(self, command, params):
+        """What to keep of a command, read before execute() consumes the path parameters."""
+        params = params or {}
+        details = {"command": command}
+        element = params.get("id")
+        if isinstance(element, dict):            # switchToFrame takes an element reference
+            element = element.get(ELEMENT_KEY)
+        if element:
+            details["element"] = element
+        if command in FIND_COMMANDS:
+            details["locator"] = f"{params.get('using')}={params.get('value')}"
+        elif command == "sendKeysToElement":
+            masked = any(name in action.name.lower() for action in self._open for name in self.mask_steps)
+            details["text"] = "***" if masked else params.get("text")
+        elif command == "get":
+            details["url"] = params.get("url")
+        elif command in SCRIPT_COMMANDS:
+            script = params.get("script", "")
+            match = SCRIPT_NAME.match(script)
+            details["command"] = f"{SCRIPT_COMMANDS[command]}:{match.group(1)}" if match else SCRIPT_COMMANDS[command]
+            if not match:
+                details["script"] = script[:120]
+            args = params.get("args") or []
+            if args and isinstance(args[0], dict) and ELEMENT_KEY in args[0]:
+                details["element"] = args[0][ELEMENT_KEY]
+        return details
+
+    def _command(self, details, seconds, response):
+        if self._open:
+            action = self._open[-1]
+        else:
+            # Consecutive commands sent outside page-object steps make one test-code action
+            last = self.actions[-1] if self.actions else None
+            if last is None or last.name != TEST_CODE:
+                last = Action(TEST_CODE, 0, time.time())
+                self.actions.append(last)
+            action = last
+        details["ms"] = round(seconds * 1000, 1)
+        error = command_error(response)
+        if error:
+            details["error"] = error
+        elif "locator" in details and isinstance(response, dict):
+            value = response.get("value")
+            found = [value] if isinstance(value, dict) else value if isinstance(value, list) else []
+            resolved = [element.get(ELEMENT_KEY) for element in found if isinstance(element, dict)]
+            details["resolved"] = resolved[:20]
+            details["found"] = len(resolved)
+            for element in resolved[:20]:
+                if element not in self.elements:
+                    self.elements[element] = {"locator": details["locator"], "description": None}
+                    self._pending.append(element)
+        action.commands.append(details)
+
+    def _snapshot(self, action):
+        self._own = True
+        try:
+            try:
+                result = self.driver.execute_script(SNAPSHOT_JS, self._hash,
+                                                    [{ELEMENT_KEY: element} for element in self._pending])
+            except Exception:
+                # An element of the action went stale (it navigated away): snapshot the page alone
+                result = self.driver.execute_script(SNAPSHOT_JS, self._hash, [])
+                result[3] = [None] * len(self._pending)
+        except Exception as e:
+            logger.debug(f"Action trace: no DOM snapshot after {action.name}: {e}")
+            return
+        finally:
+            self._own = False
+
+        url, digest, page, described = result
+        for element, description in zip(self._pending, described):
+            self.elements[element]["description"] = description
+        self._pending = []
+        if page is not None:
+            self.snapshots.append(SCRIPT_TAG.sub("<script></script>", page))
+            self._hash = digest
+        action.url = url
+        action.snapshot = len(self.snapshots) - 1 if self.snapshots else None
+
+    # ----------------- ARCHIVE ------------------------
+
+    def save(self, path, nodeid, outcome):
+        """Write the recording of the last test to the archive path and return it."""
+        trace = {
+            "test": nodeid,
+            "outcome": outcome,
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "actions": [action.as_dict() for action in self.actions],
+            "elements": self.elements,
+            "snapshots": len(self.snapshots),
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("trace.json", json.dumps(trace, indent=1))
+            previous = None
+            for index, page in enumerate(self.snapshots):
+                chunks = CHUNK.split(page)
+                if previous is None:
+                    archive.writestr(f"snapshots/{index:04d}.html", page)
+                else:
+                    archive.writestr(f"snapshots/{index:04d}.json", json.dumps(delta(previous, chunks)))
+                previous = chunks
+        os.replace(tmp, path)
+        return path
+
+
+def archive_name(nodeid):
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + ".zip"
+
+
+def delta(old, new):
+    """Changes turning the chunk list old into new: [[start, end, replacement chunks], ...] in order."""
+    matcher = difflib.SequenceMatcher(None, old, new)
+    return [[i1, i2, new[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def apply_delta(old, changes):
+    chunks, position = [], 0
+    for start, end, replacement in changes:
+        chunks += old[position:start]
+        chunks += replacement
+        position = end
+    return chunks + old[position:]
+
+
+# ----------------- VIEWER ------------------------
+
+def load(path):
+    """Return (trace, [chunk list of each snapshot]) of an archive."""
+    with zipfile.ZipFile(path) as archive:
+        trace = json.loads(archive.read("trace.json"))
+        snapshots = []
+        for index in range(trace["snapshots"]):
+            if index == 0:
+                snapshots.append(CHUNK.split(archive.read("snapshots/0000.html").decode("utf-8")))
+            else:
+                changes = json.loads(archive.read(f"snapshots/{index:04d}.json"))
+                snapshots.append(apply_delta(snapshots[-1], changes))
+    return trace, snapshots
+
+
+def snapshot_of(trace, index):
+    """Index of the DOM snapshot showing the page after action index: its own, else the last one before."""
+    for action in reversed(trace["actions"][:index + 1]):
+        if action["snapshot"] is not None:
+            return action["snapshot"]
+    return None
+
+
+def _describe_command(command, elements):
+    parts = [f"{command['command']:<28}{command['ms']:>8.1f} ms"]
+    if "locator" in command:
+        parts.append(command["locator"])
+        if command.get("found") is not None:
+            parts.append(f"-> {command['found']} found")
+    if "element" in command:
+        element = elements.get(command["element"], {})
+        parts.append(f"on {element.get('description') or element.get('locator') or command['element'][:8]}")
+    for key in ("url", "text", "script"):
+        if key in command:
+            parts.append(f"{key}={command[key]!r}")
+    if "error" in command:
+        parts.append(f"ERROR {command['error']}")
+    return "  ".join(parts)
+
+
+def print_actions(trace):
+    print(f"{trace['test']}  {trace['outcome']}  {trace['duration']:.2f}s  "
+          f"{len(trace['actions'])} actions, {trace['snapshots']} DOM snapshots")
+    for index, action in enumerate(trace["actions"]):
+        state = "ok" if action["ok"] else "FAILED" if action["ok"] is False else ""
+        duration = f"{action['duration']:.3f}s" if action["duration"] is not None else ""
+        marker = f"[dom {action['snapshot']}]" if action["snapshot"] is not None else ""
+        name = "  " * action["depth"] + action["name"]
+        print(f"{index:>4}  {name:<56}{duration:>9}  {state:<7}{len(action['commands']):>4} cmds  {marker}")
+        if action["error"]:
+            print(f"      {action['error']}")
+
+
+def print_action(trace, snapshots, index, lines):
+    """Details of one action and the DOM changes of its snapshot."""
+    action = trace["actions"][index]
+    print(f"{index}: {action['name']}  ({'ok' if action['ok'] else 'FAILED' if action['ok'] is False else 'running'})")
+    if action["error"]:
+        print(f"error: {action['error']}")
+    if action["url"]:
+        print(f"url: {action['url']}")
+    for command in action["commands"]:
+        print(f"  {_describe_command(command, trace['elements'])}")
+    number = action["snapshot"]
+    if number is None:
+        return
+    previous = snapshots[number - 1] if number else []
+    diff = list(difflib.unified_diff(previous, snapshots[number], f"dom {number - 1}", f"dom {number}", n=1, lineterm=""))
+    print(f"\nDOM snapshot {number}: {len(diff)} diff lines" + (f" (first {lines})" if len(diff) > lines else ""))
+    for line in diff[:lines]:
+        print(line[:200])
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>__TITLE__ (__OUTCOME__)</title>
+<style>
+body { margin: 0; font: 13px sans-serif; display: flex; height: 100vh; }
+#actions { width: 40%; overflow: auto; border-right: 1px solid #ccc; }
+#actions div { padding: 3px 6px; cursor: pointer; white-space: nowrap; }
+#actions div.selected { background: #dde8f8; }
+#actions .failed { color: #b00020; }
+#detail { flex: 1; display: flex; flex-direction: column; min-width: 0; }
+#info { padding: 6px 10px; max-height: 40%; overflow: auto; border-bottom: 1px solid #ccc; }
+#info pre { margin: 4px 0; white-space: pre-wrap; font-size: 12px; }
+iframe { flex: 1; border: 0; width: 100%; }
+</style></head>
+<body>
+<div id="actions"></div>
+<div id="detail"><div id="info"></div><iframe id="page" sandbox></iframe></div>
+<script>
+var trace = __TRACE__;
+var base = __BASE__;
+var deltas = __DELTAS__;
+var pages = [], selected = 0;
+
+function page(number) {
+    if (pages[number] === undefined) {
+        if (number === 0) {
+            pages[0] = base;
+        } else {
+            var old = page(number - 1), chunks = [], position = 0;
+            deltas[number - 1].forEach(function (change) {
+                chunks = chunks.concat(old.slice(position, change[0]), change[2]);
+                position = change[1];
+            });
+            pages[number] = chunks.concat(old.slice(position));
+        }
+    }
+    return pages[number];
+}
+
+function text(value) {
+    var div = document.createElement("div");
+    div.textContent = value;
+    return div.innerHTML;
+}
+
+function show(index) {
+    selected = index;
+    var rows = document.querySelectorAll("#actions div");
+    rows.forEach(function (row, i) { row.className = (i === index ? "selected " : "") + (trace.actions[i].ok === false ? "failed" : ""); });
+    rows[index].scrollIntoView({block: "nearest"});
+    var action = trace.actions[index], lines = [];
+    lines.push("<b>" + text(action.name) + "</b> " + (action.duration === null ? "" : action.duration.toFixed(3) + "s"));
+    if (action.error) lines.push("<pre class='failed'>" + text(action.error) + "</pre>");
+    if (action.url) lines.push("url: " + text(action.url));
+    lines.push("<pre>" + action.commands.map(function (c) { return text(describe(c)); }).join("\\n") + "</pre>");
+    document.getElementById("info").innerHTML = lines.join("<br>");
+
+    var number = null;
+    for (var i = index; i >= 0 && number === null; i--) number = trace.actions[i].snapshot;
+    document.getElementById("page").srcdoc = number === null ? "<p>No DOM snapshot yet</p>" : page(number).join("");
+}
+
+function describe(c) {
+    var parts = [c.command, c.ms.toFixed(1) + " ms"];
+    if (c.locator) parts.push(c.locator + (c.found === undefined ? "" : " -> " + c.found + " found"));
+    if (c.element) {
+        var element = trace.elements[c.element] || {};
+        parts.push("on " + (element.description || element.locator || c.element.slice(0, 8)));
+    }
+    ["url", "text", "script"].forEach(function (key) { if (c[key] !== undefined) parts.push(key + "=" + JSON.stringify(c[key])); });
+    if (c.error) parts.push("ERROR " + c.error);
+    return parts.join("  ");
+}
+
+var list = document.getElementById("actions");
+trace.actions.forEach(function (action, index) {
+    var row = document.createElement("div");
+    row.style.paddingLeft = (6 + 16 * action.depth) + "px";
+    row.textContent = index + "  " + action.name + (action.duration === null ? "" : "  " + action.duration.toFixed(2) + "s")
+        + (action.snapshot === null ? "" : "  \\u25a3");
+    row.onclick = function () { show(index); };
+    list.appendChild(row);
+});
+document.onkeydown = function (event) {
+    if (event.key === "ArrowDown" && selected < trace.actions.length - 1) { show(selected + 1); event.preventDefault(); }
+    if (event.key === "ArrowUp" && selected > 0) { show(selected - 1); event.preventDefault(); }
+};
+if (trace.actions.length) show(0);
+</script>
+</body></html>
+"""
+
+
+def _embed(value):
+    # JSON inside a <script>: "</script>" in a snapshot must not end it
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def write_viewer(path, output=None):
+    """Write a self-contained HTML page stepping through the actions of the archive path."""
+    output = output or os.path.splitext(path)[0] + ".html"
+    with zipfile.ZipFile(path) as archive:
+        trace = json.loads(archive.read("trace.json"))
+        base = CHUNK.split(archive.read("snapshots/0000.html").decode("utf-8")) if trace["snapshots"] else []
+        deltas = [json.loads(archive.read(f"snapshots/{index:04d}.json")) for index in range(1, trace["snapshots"])]
+    page = (VIEWER_HTML.replace("__TITLE__", html.escape(trace["test"]))
+            .replace("__OUTCOME__", html.escape(trace["outcome"]))
+            .replace("__TRACE__", _embed(trace))
+            .replace("__BASE__", _embed(base))
+            .replace("__DELTAS__", _embed(deltas)))
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(page)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Step through the recorded actions of a test")
+    parser.add_argument("path", help="archive written by the action trace, e.g. traces/<test>.zip")
+    parser.add_argument("--action", type=int, default=None, help="show the commands and DOM changes of one action")
+    parser.add_argument("--lines", type=int, default=60, help="DOM diff lines shown with --action")
+    parser.add_argument("--html", nargs="?", const="", default=None, metavar="OUTPUT",
+                        help="write the HTML viewer (default: next to the archive)")
+    parser.add_argument("--open", action="store_true", help="open the HTML viewer in the default browser")
+    args = parser.parse_args(argv)
+
+    if args.html is not None or args.open:
+        output = write_viewer(args.path, args.html or None)
+        print(f"Viewer written to {output}")
+        if args.open:
+            import webbrowser
+            from pathlib import Path
+            webbrowser.open(Path(os.path.abspath(output)).as_uri())
+        return 0
+
+    trace, snapshots = load(args.path)
+    if args.action is None:
+        print_actions(trace)
+    elif not 0 <= args.action < len(trace["actions"]):
+        print(f"No action {args.action}: the trace has {len(trace['actions'])}")
+        return 1
+    else:
+        print_action(trace, snapshots, args.action, args.lines)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
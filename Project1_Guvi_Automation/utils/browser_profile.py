@@ -0,0 +1,331 @@
+"""
+browser_profile.py
+
+Pre-warmed browser profile templates.
+
+A template is a user-data directory built once by a real browser visit of the
+GUVI homepage, so it already holds the HTTP cache, cookies (including the
+consent banner choice) and service worker state. Every test session then
+starts from a cheap clone of the template instead of an empty profile:
+
+    reflink  - copy-on-write clone (btrfs, XFS, APFS): instant and fully isolated
+    hardlink - cache files are hard links to the read-only template files,
+               everything else (cookie/history databases, preferences) is copied
+    copy     - plain copy, always safe
+
+The cold first paint measured while building the template is stored next to it
+so sessions can report cold versus warm first-paint times.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.browser_profile build --browser chrome
+    python -m Project1_Guvi_Automation.utils.browser_profile measure --browser chrome
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+from Project1_Guvi_Automation.config_reader import get_config, project_path
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Folders holding write-once cache entries that are safe to share through hard links
+CACHE_DIRS = {"Cache", "Cache_Data", "Code Cache", "GPUCache", "CacheStorage", "ScriptCache", "cache2", "startupCache"}
+
+METADATA_FILE = "template.json"
+
+# Paint and navigation timings of the current document
+FIRST_PAINT_SCRIPT = """
+var paint = {};
+performance.getEntriesByType('paint').forEach(function (e) { paint[e.name] = e.startTime; });
+var nav = performance.getEntriesByType('navigation')[0] || {};
+return {
+    first_paint_ms: paint['first-paint'] || null,
+    first_contentful_paint_ms: paint['first-contentful-paint'] || null,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd || null,
+    load_ms: nav.loadEventEnd || null,
+    transfer_bytes: nav.transferSize || 0
+};
+"""
+
+
+def profiles_root():
+    """Folder holding the templates and session clones."""
+    return project_path(get_config("browser_profile", "profiles_dir", "profiles"))
+
+
+def template_dir(browser):
+    return os.path.join(profiles_root(), browser.lower(), "template")
+
+
+def load_metadata(browser):
+    """Return the metadata saved with the template, or None when there is no template."""
+    path = os.path.join(template_dir(browser), METADATA_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------------------- MEASURING ----------------------
+
+def measure_first_paint(driver, url, timeout=30):
+    """Navigate to url and return its paint/navigation timings in milliseconds."""
+    start = time.perf_counter()
+    driver.get(url)
+    deadline = time.time() + timeout
+    # driver.get returns on the load event, paint entries can land slightly later
+    while time.time() < deadline:
+        timings = driver.execute_script(FIRST_PAINT_SCRIPT)
+        if timings["first_contentful_paint_ms"] is not None and timings["load_ms"]:
+            break
+        time.sleep(0.1)
+    timings["navigation_wall_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return timings
+
+
+# ---------------------- BUILDING ----------------------
+
+def build_template(browser, url=None, settle_seconds=3, keep_existing=False):
+    """
+    Build (or rebuild) the profile template of a browser.
+    Visits the homepage with an empty profile, accepts the configured consent
+    banners, waits for service workers to register and lets the browser flush
+    its cache to disk on quit.
+
+    The template is built in a temporary folder next to it and renamed into place
+    once complete, so sessions running in parallel (matrix cells) never clone a
+    half-built template. With keep_existing, a template another process finished
+    meanwhile is kept and this build is discarded.
+    """
+    url = url or get_config("guvi", "url")
+    target = template_dir(browser)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    building = tempfile.mkdtemp(prefix="template-build-", dir=os.path.dirname(target))
+
+    try:
+        metadata = _build(browser, url, settle_seconds, building)
+    except BaseException:
+        _remove_tree(building)
+        raise
+
+    if keep_existing and load_metadata(browser) is not None:
+        logger.info(f"Profile template of {browser} was built by another session meanwhile, using it")
+        _remove_tree(building)
+        return load_metadata(browser)
+    _swap_in(building, target)
+    logger.info(f"Profile template built: {target}")
+    return metadata
+
+
+def _build(browser, url, settle_seconds, target):
+    """Build a complete template in the target folder and return its metadata."""
+    from Project1_Guvi_Automation.utils.driver_factory import create_driver
+    from selenium.webdriver.common.by import By
+
+    driver = create_driver(browser, user_data_dir=target)
+    try:
+        cold = measure_first_paint(driver, url)
+        logger.info(f"Cold first paint for {browser}: {cold}")
+
+        # Accept cookie/consent banners so sessions start with the choice already stored
+        selectors = [s.strip() for s in get_config("browser_profile", "consent_selectors", "").split(",") if s.strip()]
+        for selector in selectors:
+            for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                if element.is_displayed():
+                    element.click()
+                    logger.info(f"Accepted consent banner: {selector}")
+
+        # Give service workers and lazy bundles time to install into the cache
+        time.sleep(settle_seconds)
+        workers = driver.execute_script(
+            "return navigator.serviceWorker ? "
+            "navigator.serviceWorker.getRegistrations().then(function (r) { return r.length; }) : 0;"
+        )
+    finally:
+        driver.quit()
+
+    metadata = {
+        "browser": browser.lower(),
+        "url": url,
+        "built_at": time.time(),
+        "service_workers": workers,
+        "cold": cold,
+    }
+    with open(os.path.join(target, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+    # Shared cache files must never be modified through a session's hard link
+    _make_cache_read_only(target)
+    return metadata
+
+
+def _swap_in(building, target):
+    """Rename the complete template in building to target, replacing (and then deleting) the previous one."""
+    previous = None
+    if os.path.exists(target):
+        previous = tempfile.mkdtemp(prefix="template-old-", dir=os.path.dirname(target))
+        os.rmdir(previous)
+        os.replace(target, previous)
+    os.replace(building, target)
+    if previous:
+        _remove_tree(previous)
+
+
+def _remove_tree(path):
+    _make_writable(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+# ---------------------- CLONING ----------------------
+
+def clone_template(browser, mode=None):
+    """
+    Return a fresh user-data directory cloned from the template.
+    mode is auto, reflink, hardlink or copy (config.ini [browser_profile] clone_mode).
+    """
+    source = template_dir(browser)
+    sessions = os.path.join(profiles_root(), browser.lower(), "sessions")
+    os.makedirs(sessions, exist_ok=True)
+    target = tempfile.mkdtemp(prefix="session-", dir=sessions)
+    os.rmdir(target)
+
+    mode = mode or get_config("browser_profile", "clone_mode", "auto")
+    start = time.perf_counter()
+    if mode in ("auto", "reflink") and _reflink_copy(source, target):
+        used = "reflink"
+    elif mode in ("auto", "hardlink"):
+        _hardlink_copy(source, target)
+        used = "hardlink"
+    else:
+        shutil.copytree(source, target)
+        used = "copy"
+    logger.info(f"Cloned profile template ({used}) in {(time.perf_counter() - start) * 1000:.0f} ms: {target}")
+    return target
+
+
+def remove_clone(path):
+    """
+    Delete a session clone (the template is left untouched).
+    Files are unlinked as they are, never chmod-ed first: the cache files are hard links
+    sharing their inode, and so their read-only mode, with the template's files.
+    """
+    shared = []
+
+    def retry(function, failed_path, exc_info):
+        # Only where unlinking a read-only file is refused (Windows): clear the flag of that path alone
+        try:
+            mode = os.stat(failed_path)
+            if stat.S_ISREG(mode.st_mode) and mode.st_nlink > 1:
+                shared.append(failed_path)
+            os.chmod(failed_path, mode.st_mode | stat.S_IWUSR)
+            function(failed_path)
+        except OSError as e:
+            logger.warning(f"Could not remove {failed_path}: {e}")
+
+    shutil.rmtree(path, onerror=retry)
+    if shared:
+        # The cleared flag belonged to inodes the template still links: protect its cache again
+        template = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(path))), "template")
+        _make_cache_read_only(template)
+
+
+def _reflink_copy(source, target):
+    """Copy-on-write clone through cp; returns False when the filesystem can't do it."""
+    if sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=always", source, target]
+    elif sys.platform == "darwin":
+        command = ["cp", "-cR", source, target]
+    else:
+        return False
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        shutil.rmtree(target, ignore_errors=True)
+        return False
+    return True
+
+
+def _hardlink_copy(source, target):
+    """Hard link files inside cache folders, copy everything else."""
+    for root, dirs, files in os.walk(source):
+        relative = os.path.relpath(root, source)
+        destination = os.path.join(target, relative)
+        os.makedirs(destination, exist_ok=True)
+        shared = any(part in CACHE_DIRS for part in relative.split(os.sep))
+        for name in files:
+            src, dst = os.path.join(root, name), os.path.join(destination, name)
+            if shared:
+                try:
+                    os.link(src, dst)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(src, dst)
+            if shared:
+                os.chmod(dst, os.stat(dst).st_mode | stat.S_IWUSR)
+
+
+def _make_cache_read_only(path):
+    for root, _, files in os.walk(path):
+        if any(part in CACHE_DIRS for part in os.path.relpath(root, path).split(os.sep)):
+            for name in files:
+                file_path = os.path.join(root, name)
+                os.chmod(file_path, os.stat(file_path).st_mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _make_writable(path):
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                os.chmod(file_path, os.stat(file_path).st_mode | stat.S_IWUSR)
+            except OSError:
+                pass
+
+
+# ---------------------- CLI ----------------------
+
+def main(argv=None):
+    """Build a template, or compare cold and warm first paint for a browser."""
+    from Project1_Guvi_Automation.utils.driver_factory import create_driver
+
+    parser = argparse.ArgumentParser(description="Manage pre-warmed browser profile templates")
+    parser.add_argument("command", choices=["build", "measure"])
+    parser.add_argument("--browser", default=get_config("browser_name", "browser"))
+    parser.add_argument("--url", default=get_config("guvi", "url"))
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        metadata = build_template(args.browser, args.url)
+        print(json.dumps(metadata["cold"], indent=2))
+        return 0
+
+    if load_metadata(args.browser) is None:
+        build_template(args.browser, args.url)
+
+    results = {}
+    for label in ("cold", "warm"):
+        profile = tempfile.mkdtemp() if label == "cold" else clone_template(args.browser)
+        driver = create_driver(args.browser, user_data_dir=profile)
+        try:
+            results[label] = measure_first_paint(driver, args.url)
+        finally:
+            driver.quit()
+            remove_clone(profile)
+
+    for label, timings in results.items():
+        print(f"{label}: FCP {timings['first_contentful_paint_ms']} ms, load {timings['load_ms']} ms, "
+              f"transferred {timings['transfer_bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
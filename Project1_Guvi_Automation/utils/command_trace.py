@@ -0,0 +1,293 @@
+"""
+command_trace.py
+
+Traces every WebDriver command a test sends to the browser.
+
+CommandTracer wraps the execute() of the driver's command executor, the
+single place every HTTP round trip to the driver goes through (find_element
+polls of a WebDriverWait, is_displayed, switch_to.frame, ...). For each
+command it records the time on the wire, the running test and the innermost
+page-object step (utils/step_timer.py), and keeps
+    - counts and wire time per test, per page-object step and per command
+    - a LatencyHistogram per command for the whole run
+    - redundant round trips: a locator resolved again, or the same element
+      property read again, with nothing in between that could change the page
+    - the events of a Chrome trace file (chrome://tracing, ui.perfetto.dev)
+      with the tests and steps as enclosing spans
+
+conftest.py attaches it with --trace-commands. The trace file can be
+summarised later:
+    python -m Project1_Guvi_Automation.utils.command_trace webdriver_trace.json
+"""
+import argparse
+import collections
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils.histogram import LatencyHistogram
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# W3C key of an element reference in the JSON of a command
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Script commands and their label in the trace; scripts Selenium names ("/* isDisplayed */ ...") get a suffix
+SCRIPT_COMMANDS = {"w3cExecuteScript": "executeScript", "w3cExecuteScriptAsync": "executeAsyncScript"}
+
+# Commands resolving a locator
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+# Commands reading a property of an element, and the scripts Selenium runs for them
+READ_COMMANDS = {"isElementEnabled", "isElementSelected", "getElementText", "getElementTagName", "getElementRect",
+                 "getElementProperty", "getElementValueOfCssProperty", "getElementAriaRole", "getElementAriaLabel",
+                 "executeScript:isDisplayed", "executeScript:getAttribute"}
+
+# Commands that can't change the page: the locators resolved and properties read before them still hold
+NEUTRAL_COMMANDS = FIND_COMMANDS | READ_COMMANDS | {"getCurrentUrl", "getTitle", "getWindowRect", "getTimeouts",
+                                                    "getCookies", "getCookie", "screenshot", "elementScreenshot",
+                                                    "getPageSource", "w3cGetCurrentWindowHandle",
+                                                    "w3cGetWindowHandles", "getLog", "setTimeouts"}
+
+SCRIPT_NAME = re.compile(r"^/\* (\w+) \*/")
+
+
+class CommandTracer:
+    """
+    Collects the WebDriver commands of every driver attached with attach().
+    max_events bounds the memory of the trace file; the counts and histograms are always complete.
+    """
+
+    def __init__(self, max_events=200000):
+        self.max_events = max_events
+        self.events = []                 # (label, start epoch s, seconds, thread id, test, step, details)
+        self.dropped = 0
+        self.histograms = collections.defaultdict(LatencyHistogram)           # label -> ms
+        self.per_test = collections.defaultdict(lambda: collections.defaultdict(lambda: [0, 0.0]))
+        self.per_step = collections.defaultdict(lambda: collections.defaultdict(lambda: [0, 0.0]))
+        self.redundant = collections.defaultdict(collections.Counter)          # test -> (step, what) -> count
+        self.spans = []                  # tests and steps: (name, category, start epoch s, seconds, thread id)
+        self._seen = {}                  # driver id -> keys resolved/read since the last page-changing command
+        self._lock = threading.Lock()
+
+    # ----------------- RECORDING ------------------------
+
+    def attach(self, driver):
+        """Trace the commands of driver from now on."""
+        executor = driver.command_executor
+        if getattr(executor, "_command_tracer", None) is self:
+            return driver
+        execute = executor.execute
+        seen = self._seen.setdefault(id(driver), {})
+
+        def traced_execute(command, params):
+            details = _details(command, params)
+            started = time.time()
+            start = time.perf_counter()
+            response = execute(command, params)
+            self._record(command, details, started, time.perf_counter() - start, response, seen)
+            return response
+
+        executor.execute = traced_execute
+        executor._command_tracer = self
+        return driver
+
+    @staticmethod
+    def detach(driver):
+        executor = driver.command_executor
+        if getattr(executor, "_command_tracer", None) is not None:
+            del executor.execute
+            del executor._command_tracer
+
+    def _record(self, command, details, started, seconds, response, seen):
+        label = details.pop("label", command)
+        test = step_timer.current_test()
+        step = step_timer.current_step()
+        step = step.name if step else None
+        failed = command_error(response)
+        if failed:
+            details["error"] = failed
+
+        with self._lock:
+            self.histograms[label].record(seconds * 1000)
+            if test:
+                counts = self.per_test[test][label]
+                counts[0] += 1
+                counts[1] += seconds
+            if step:
+                counts = self.per_step[step][label]
+                counts[0] += 1
+                counts[1] += seconds
+            if len(self.events) < self.max_events:
+                self.events.append((label, started, seconds, threading.get_ident(), test, step, details))
+            else:
+                self.dropped += 1
+
+            # Redundancy: the same locator / element property again, with the page unchanged since
+            key = details.get("key")
+            if label not in NEUTRAL_COMMANDS:
+                seen.clear()
+            elif key and not failed:
+                if key in seen:
+                    self.redundant[test][(step, seen[key])] += 1
+                else:
+                    seen[key] = _describe(label, details)
+
+    def add_span(self, name, category, started, seconds):
+        """Add an enclosing span (a test or a page-object step) to the trace file."""
+        with self._lock:
+            if len(self.spans) < self.max_events:
+                self.spans.append((name, category, started, seconds, threading.get_ident()))
+
+    # ----------------- REPORTING ------------------------
+
+    def take_test(self, nodeid):
+        """Remove and return ({label: [count, seconds]}, {(step, what): count}) of a finished test."""
+        with self._lock:
+            return dict(self.per_test.pop(nodeid, {})), dict(self.redundant.pop(nodeid, {}))
+
+    @staticmethod
+    def test_summary(commands, redundant):
+        """Text of a test's commands by wire time, and its redundant round trips."""
+        total = sum(count for count, _ in commands.values())
+        seconds = sum(s for _, s in commands.values())
+        lines = [f"{total} WebDriver commands, {seconds:.2f}s on the wire"]
+        for label, (count, s) in sorted(commands.items(), key=lambda c: -c[1][1]):
+            lines.append(f"  {label:<36}{count:>6}  {s:8.3f}s")
+        if redundant:
+            lines.append(f"Redundant round trips ({sum(redundant.values())}):")
+            for (step, what), count in sorted(redundant.items(), key=lambda r: -r[1]):
+                lines.append(f"  {count:>4} x {what} again in {step or '(test code)'}")
+        return "\n".join(lines)
+
+    def summary(self):
+        """Run-wide numbers: per command count / p50 / p95 / max ms, and the busiest page-object steps."""
+        return {
+            "commands": {label: {"count": h.count, "p50_ms": h.percentile(50), "p95_ms": h.percentile(95),
+                                 "max_ms": h.max, "total_s": h.total / 1000, "histogram": h.as_dict()}
+                         for label, h in self.histograms.items()},
+            "steps": {step: {label: {"count": c, "seconds": s} for label, (c, s) in labels.items()}
+                      for step, labels in self.per_step.items()},
+            "dropped_events": self.dropped,
+        }
+
+    def export(self, path, redundant=()):
+        """
+        Write the trace in the Chrome trace event format: one complete event per command,
+        test and step, with the run summary and the redundant round trips under otherData.
+        """
+        with self._lock:
+            events = [{"name": name, "cat": category, "ph": "X", "ts": started * 1e6, "dur": seconds * 1e6,
+                       "pid": os.getpid(), "tid": thread}
+                      for name, category, started, seconds, thread in self.spans]
+            for label, started, seconds, thread, test, step, details in self.events:
+                args = {k: v for k, v in details.items() if k != "key"}
+                args.update(test=test, step=step)
+                events.append({"name": label, "cat": "webdriver", "ph": "X", "ts": started * 1e6,
+                               "dur": seconds * 1e6, "pid": os.getpid(), "tid": thread, "args": args})
+            other = self.summary()
+        other["redundant"] = [{"test": test, "step": step, "what": what, "count": count}
+                              for test, step, what, count in redundant]
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": other}, f)
+        os.replace(tmp, path)
+        return path
+
+
+def _details(command, params):
+    """Label and arguments of a command worth keeping, read before execute() consumes the path parameters."""
+    params = params or {}
+    element = params.get("id")
+    if command in FIND_COMMANDS:
+        return {"using": params.get("using"), "value": params.get("value"), "element": element,
+                "key": ("find", params.get("using"), params.get("value"), element)}
+    if command in SCRIPT_COMMANDS:
+        match = SCRIPT_NAME.match(params.get("script", ""))
+        if match:
+            label = f"{SCRIPT_COMMANDS[command]}:{match.group(1)}"
+            args = params.get("args") or [{}]
+            target = args[0].get(ELEMENT_KEY) if isinstance(args[0], dict) else None
+            return {"label": label, "element": target, "name": args[1] if len(args) > 1 else None,
+                    "key": (label, target, str(args[1:]))}
+        return {"label": SCRIPT_COMMANDS[command], "script": params.get("script", "")[:80]}
+    if command in READ_COMMANDS:
+        return {"element": element, "name": params.get("name"), "key": (command, element, params.get("name"))}
+    if command == "get":
+        return {"url": params.get("url")}
+    if element:
+        return {"element": element}
+    return {}
+
+
+def command_error(response):
+    """Error of a failed command ("no such element", ...), or None."""
+    if not isinstance(response, dict):
+        return None
+    value = response.get("value")
+    if isinstance(value, dict) and "error" in value:
+        return value["error"]
+    status = response.get("status")
+    if isinstance(status, int) and status >= 400:
+        # Error answers keep the body as text: {"value": {"error": ..., "message": ...}}
+        try:
+            return json.loads(value)["value"]["error"]
+        except (TypeError, ValueError, KeyError):
+            return f"HTTP {status}"
+    return None
+
+
+def _describe(label, details):
+    if label in FIND_COMMANDS:
+        return f"{label} {details['using']}={details['value']}"
+    name = f" {details['name']}" if details.get("name") else ""
+    return f"{label}{name} of element {str(details.get('element'))[:8]}"
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_summary(trace, top):
+    other = trace.get("otherData", {})
+    commands = other.get("commands", {})
+    print(f"{'command':<36}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'total s':>10}")
+    for label, c in sorted(commands.items(), key=lambda c: -c[1]["total_s"])[:top]:
+        print(f"{label:<36}{c['count']:>8}{c['p50_ms']:>10.1f}{c['p95_ms']:>10.1f}{c['max_ms']:>10.1f}"
+              f"{c['total_s']:>10.2f}")
+
+    steps = other.get("steps", {})
+    print(f"\n{'page-object step':<50}{'commands':>10}{'wire s':>10}")
+    totals = {step: (sum(c["count"] for c in labels.values()), sum(c["seconds"] for c in labels.values()))
+              for step, labels in steps.items()}
+    for step, (count, seconds) in sorted(totals.items(), key=lambda s: -s[1][1])[:top]:
+        print(f"{step:<50}{count:>10}{seconds:>10.2f}")
+
+    redundant = other.get("redundant", [])
+    if redundant:
+        print(f"\nRedundant round trips ({sum(r['count'] for r in redundant)}):")
+        for r in sorted(redundant, key=lambda r: -r["count"])[:top]:
+            print(f"  {r['count']:>4} x {r['what']} again in {r['step'] or '(test code)'}  [{r['test']}]")
+    if other.get("dropped_events"):
+        print(f"\n{other['dropped_events']} commands not in the trace file (over [command_trace] max_events)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise a WebDriver command trace")
+    parser.add_argument("path", help="trace file written with pytest --trace-commands")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+    print_summary(load_trace(args.path), args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
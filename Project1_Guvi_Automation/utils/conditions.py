@@ -0,0 +1,234 @@
+"""
+conditions.py
+
+Expected conditions for the page objects, plus the in-browser wait backend.
+
+The element conditions (presence, visibility, clickable) behave exactly like
+Selenium's and also carry the locator and the state they wait for. With
+config.ini [waits] backend = observer, BudgetedWait hands those conditions to
+wait_in_browser(): one async script installs a MutationObserver and answers as
+soon as the element reaches the state, instead of a find-element round trip
+every 500 ms. Pages where the script can't run fall back to normal polling.
+
+Element conditions on a HealingLocator (utils/healing.py) wait for the first of
+its candidates found on the page, so a broken primary locator heals within
+the wait instead of timing out.
+
+The other conditions are Selenium's, re-exported so page objects can use this
+module in place of selenium.webdriver.support.expected_conditions.
+"""
+import logging
+import weakref
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as _selenium_ec
+from selenium.webdriver.support.expected_conditions import (  # noqa: F401 - re-exported for the page objects
+    alert_is_present,
+    frame_to_be_available_and_switch_to_it,
+    invisibility_of_element_located,
+    new_window_is_opened,
+    number_of_windows_to_be,
+    presence_of_all_elements_located,
+    staleness_of,
+    text_to_be_present_in_element,
+    title_contains,
+    title_is,
+    url_changes,
+    url_contains,
+    url_matches,
+    url_to_be,
+    visibility_of,
+)
+
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils import healing
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Observer failures in a row after which a driver goes back to polling for good
+MAX_OBSERVER_FAILURES = 3
+
+# Finds the first element matching a Selenium locator (By strategy, value), or null
+LOCATE_JS = """
+function locate(by, value) {
+    switch (by) {
+        case "id": return document.getElementById(value);
+        case "css selector": return document.querySelector(value);
+        case "class name": return document.querySelector("." + CSS.escape(value));
+        case "name": return document.querySelector("[name='" + CSS.escape(value) + "']");
+        case "tag name": return document.getElementsByTagName(value)[0] || null;
+        case "xpath":
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case "link text":
+        case "partial link text":
+            var links = document.getElementsByTagName("a");
+            for (var i = 0; i < links.length; i++) {
+                var text = (links[i].innerText || links[i].textContent).trim();
+                if (by === "link text" ? text === value : text.indexOf(value) !== -1) return links[i];
+            }
+            return null;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+
+function isVisible(el) {
+    if (!el.isConnected) return false;
+    var style = getComputedStyle(el);
+    if (style.display === "none" || style.visibility === "hidden" || style.visibility === "collapse"
+            || parseFloat(style.opacity) === 0) return false;
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+"""
+
+# Index of the first of a list of [by, value] candidates found on the page, or -1
+FIRST_PRESENT_JS = LOCATE_JS + """
+var candidates = arguments[0];
+for (var i = 0; i < candidates.length; i++) {
+    try { if (locate(candidates[i][0], candidates[i][1])) return i; } catch (e) {}
+}
+return -1;
+"""
+
+# Resolves with {element, index} when the first candidate found on the page reaches
+# the state, {timeout} or {error} otherwise
+OBSERVER_WAIT_JS = LOCATE_JS + """
+var candidates = arguments[0], kind = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false, observer = null, poll = null, timer = null;
+
+function finish(result) {
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(poll);
+    clearTimeout(timer);
+    done(result);
+}
+
+function check() {
+    if (finished) return;
+    var el = null, index;
+    for (index = 0; index < candidates.length && !el; index++) {
+        try { el = locate(candidates[index][0], candidates[index][1]); } catch (e) { finish({error: String(e)}); return; }
+    }
+    if (!el) return;
+    if (kind === "present" || (isVisible(el) && (kind === "visible" || !el.disabled))) {
+        finish({element: el, index: index - 1});
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    // Layout-only changes (CSS transitions, resizes) don't mutate the DOM, so also look now and then
+    poll = setInterval(check, 100);
+    timer = setTimeout(function () { finish({timeout: true}); }, timeout);
+}
+"""
+
+# Per driver: script timeout already set, and observer failures in a row
+_script_timeouts = weakref.WeakKeyDictionary()
+_failures = weakref.WeakKeyDictionary()
+
+
+# ---------------------- ELEMENT CONDITIONS ----------------------
+
+class _HealingCondition:
+    """Selenium's element condition, applied to the first candidate of a HealingLocator found on the page."""
+
+    def __init__(self, selenium_condition, locator):
+        self.selenium_condition = selenium_condition
+        self.locator = locator
+
+    def __call__(self, driver):
+        candidate = first_present(driver, healing.candidates(self.locator))
+        if candidate is None:
+            return False
+        result = self.selenium_condition(candidate)(driver)
+        if result:
+            healing.resolved(self.locator, candidate)
+        return result
+
+
+def first_present(driver, candidates):
+    """First of the (By, value) candidates found on the page with one script call, or None."""
+    if len(candidates) == 1:
+        return candidates[0]
+    try:
+        index = driver.execute_script(FIRST_PRESENT_JS, [list(candidate) for candidate in candidates])
+    except WebDriverException as e:
+        logger.debug(f"Could not look up the locator candidates, using {candidates[0]}: {e.msg}")
+        return candidates[0]
+    return candidates[index] if index >= 0 else None
+
+
+def _element_condition(selenium_condition, kind, locator):
+    if isinstance(locator, healing.HealingLocator):
+        condition = _HealingCondition(selenium_condition, locator)
+    else:
+        condition = selenium_condition(locator)
+    condition.kind = kind
+    condition.locator = locator
+    return condition
+
+
+def presence_of_element_located(locator):
+    """Element is in the DOM (Selenium's condition, observable in the browser)."""
+    return _element_condition(_selenium_ec.presence_of_element_located, "present", locator)
+
+
+def visibility_of_element_located(locator):
+    """Element is in the DOM and displayed (Selenium's condition, observable in the browser)."""
+    return _element_condition(_selenium_ec.visibility_of_element_located, "visible", locator)
+
+
+def element_to_be_clickable(locator):
+    """Element is displayed and enabled (Selenium's condition, observable in the browser)."""
+    return _element_condition(_selenium_ec.element_to_be_clickable, "clickable", locator)
+
+
+# ---------------------- IN-BROWSER WAITS ----------------------
+
+def observer_enabled(driver, condition):
+    """True when this wait should run in the browser instead of polling."""
+    return (getattr(condition, "kind", None) is not None
+            and get_config("waits", "backend", "polling") == "observer"
+            and _failures.get(driver, 0) < MAX_OBSERVER_FAILURES)
+
+
+def wait_in_browser(driver, condition, timeout):
+    """
+    Wait for an element condition with a single async script call.
+    Returns the element, raises TimeoutException when it doesn't happen in time,
+    or returns None when the script could not run (the caller then polls).
+    """
+    candidates = healing.candidates(condition.locator)
+    timeout_ms = int(timeout * 1000)
+    # The script must be allowed to outlive the wait it runs
+    if _script_timeouts.get(driver, 0) < timeout + 5:
+        driver.set_script_timeout(timeout + 5)
+        _script_timeouts[driver] = timeout + 5
+
+    try:
+        result = driver.execute_async_script(OBSERVER_WAIT_JS, [list(candidate) for candidate in candidates],
+                                             condition.kind, timeout_ms)
+    except TimeoutException:
+        raise
+    except WebDriverException as e:
+        # Scripts blocked, or the page navigated away while the observer was installed
+        _failures[driver] = _failures.get(driver, 0) + 1
+        logger.debug(f"In-browser wait for {condition.locator} failed, polling instead: {e.msg}")
+        return None
+
+    if result.get("error"):
+        _failures[driver] = _failures.get(driver, 0) + 1
+        logger.debug(f"In-browser wait for {condition.locator} failed, polling instead: {result['error']}")
+        return None
+
+    _failures[driver] = 0
+    if result.get("timeout"):
+        raise TimeoutException(f"Element {condition.locator} not {condition.kind} after {timeout:.1f}s")
+    healing.resolved(condition.locator, candidates[result["index"]])
+    return result["element"]
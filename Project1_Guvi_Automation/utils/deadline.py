@@ -0,0 +1,133 @@
+"""
+deadline.py
+
+Per-test time budgets shared by every wait in the page objects.
+
+A test declares its total budget with @pytest.mark.time_budget(seconds) (or the
+run sets one with --time-budget). While the test runs, each BudgetedWait uses
+the smaller of its own timeout and the time left in the budget, so a broken
+page fails the test once the budget is spent instead of after every wait
+has timed out in turn.
+
+BudgetedWait is also where the wait backend is chosen: element conditions
+from utils/conditions.py are waited for in the browser when config.ini
+[waits] backend = observer, everything else is polled as usual.
+"""
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from Project1_Guvi_Automation.utils import conditions, step_timer
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Budget of the test that is currently running (None when the test has no budget)
+_active = None
+
+
+class TimeBudget:
+    """Total time a test may spend, counted from the moment the test starts."""
+
+    def __init__(self, seconds):
+        self.total = float(seconds)
+        self.started = time.monotonic()
+        self.exhausted_in = None   # step that ran out of budget, if any
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        return max(0.0, self.total - self.elapsed())
+
+    def summary(self, steps):
+        """
+        Text report of the budget: total, used, and the share consumed by each
+        top-level page-object step of the test.
+        """
+        used = self.elapsed()
+        lines = [f"Budget {self.total:.1f}s, used {used:.1f}s ({used / self.total * 100:.0f}%)"]
+        if self.exhausted_in:
+            lines.append(f"Budget exhausted in {self.exhausted_in}")
+        in_steps = 0.0
+        for step in steps:
+            if step.depth == 0:
+                in_steps += step.duration
+                lines.append(f"  {step.name:<50} {step.duration:7.2f}s  {step.duration / self.total * 100:5.1f}%"
+                             f"{'' if step.ok else '  FAILED'}")
+        lines.append(f"  {'(outside page-object steps)':<50} {max(0.0, used - in_steps):7.2f}s")
+        return "\n".join(lines)
+
+
+def start_budget(seconds):
+    """Start the budget of the test about to run."""
+    global _active
+    _active = TimeBudget(seconds)
+    return _active
+
+
+def end_budget():
+    """Stop the budget of the current test and return it."""
+    global _active
+    budget, _active = _active, None
+    return budget
+
+
+def active_budget():
+    return _active
+
+
+class BudgetedWait(WebDriverWait):
+    """
+    WebDriverWait whose timeout is capped by the remaining budget of the running test.
+    Behaves exactly like WebDriverWait when no budget is active.
+    """
+
+    def until(self, method, message=""):
+        return self._budgeted(self._until, method, message)
+
+    def until_not(self, method, message=""):
+        return self._budgeted(super().until_not, method, message)
+
+    def _until(self, method, message):
+        """Wait in the browser when the backend and the condition allow it, poll otherwise."""
+        if not conditions.observer_enabled(self._driver, method):
+            return super().until(method, message)
+
+        start = time.monotonic()
+        element = conditions.wait_in_browser(self._driver, method, self._timeout)
+        if element is not None:
+            return element
+
+        # The script couldn't run: poll for whatever is left of this wait
+        default = self._timeout
+        self._timeout = max(0.0, default - (time.monotonic() - start))
+        try:
+            return super().until(method, message)
+        finally:
+            self._timeout = default
+
+    def _budgeted(self, wait, method, message):
+        budget = _active
+        if budget is None:
+            return wait(method, message)
+
+        remaining = budget.remaining()
+        step = step_timer.current_step()
+        if remaining <= 0:
+            budget.exhausted_in = budget.exhausted_in or (step.name if step else "wait")
+            raise TimeoutException(f"Time budget of {budget.total:.0f}s exhausted")
+
+        default = self._timeout
+        self._timeout = min(default, remaining)
+        try:
+            return wait(method, message)
+        except TimeoutException:
+            if self._timeout < default:
+                budget.exhausted_in = budget.exhausted_in or (step.name if step else "wait")
+                logger.error(f"Wait cut to {self._timeout:.1f}s by the time budget of {budget.total:.0f}s")
+            raise
+        finally:
+            self._timeout = default
@@ -0,0 +1,128 @@
+"""
+driver_factory.py
+
+Creates Selenium WebDriver instances for the supported browsers.
+Used by the setup fixture in conftest.py and by the command line tools
+that need their own browser (profile templates, benchmarks, ...).
+
+Selenium's webdriver package and the webdriver-manager backends are imported
+only when a browser is launched, and only for that browser, so importing this
+module (conftest does) costs nothing at collection time.
+"""
+import logging
+from urllib.parse import urlsplit
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BROWSERS = ("chrome", "firefox", "edge")
+
+# How the setup fixture starts the browser (conftest --launch-profile):
+# default = normal window, headless = no window, warm = clone of the pre-warmed profile template
+LAUNCH_PROFILES = ("default", "headless", "warm")
+
+
+def create_driver(browser_name, user_data_dir=None, headless=False, page_load_strategy=None):
+    """
+    Launch the requested browser and return its driver.
+
+    browser_name       - chrome, firefox or edge
+    user_data_dir      - optional profile folder to start the browser with
+    headless           - run without a visible window
+    page_load_strategy - optional "normal", "eager" or "none" ("none": get() and clicks don't wait for the load)
+    """
+    browser = browser_name.lower()
+
+    # Initialize the driver based on browser name
+    if browser == 'chrome':
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.webdriver import WebDriver
+        from webdriver_manager.chrome import ChromeDriverManager
+        options = Options()
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+        _chromium_arguments(options, user_data_dir, headless)
+        driver = WebDriver(service=Service(ChromeDriverManager().install()), options=options)
+        logger.info("Launched Chrome browser")
+
+    elif browser == 'firefox':
+        from selenium.webdriver.firefox.options import Options
+        from selenium.webdriver.firefox.service import Service
+        from selenium.webdriver.firefox.webdriver import WebDriver
+        from webdriver_manager.firefox import GeckoDriverManager
+        options = Options()
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+        if user_data_dir:
+            options.add_argument("-profile")
+            options.add_argument(user_data_dir)
+        if headless:
+            options.add_argument("-headless")
+        driver = WebDriver(service=Service(GeckoDriverManager().install()), options=options)
+        logger.info("Launched Firefox browser")
+
+    elif browser == 'edge':
+        from selenium.webdriver.edge.options import Options
+        from selenium.webdriver.edge.webdriver import WebDriver
+        options = Options()
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+        _chromium_arguments(options, user_data_dir, headless)
+        driver = WebDriver(options=options)
+        logger.info("Launched Edge browser")
+
+    else:
+        raise ValueError(f"Unsupported browser: {browser_name}")
+
+    # Kept so the session can be restarted with the same options (restart_session)
+    driver.launch_options = options
+    return driver
+
+
+# Cookie fields accepted by the DevTools Network.setCookies command
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires",
+                     "priority", "sourceScheme", "sourcePort", "partitionKey")
+
+
+def restart_session(driver):
+    """
+    Replace the browser of a driver with a fresh one, keeping the same driver object,
+    driver service and launch options. Cookies and the current page are carried over,
+    so tests sharing the driver continue where they were.
+    """
+    from selenium.webdriver.remote.command import Command
+
+    url = driver.current_url
+    cdp = hasattr(driver, "execute_cdp_cmd")
+    # Chromium can read and write the cookies of every domain, the others only the current one
+    if cdp:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    else:
+        cookies = driver.get_cookies()
+
+    # End the browser session only; the driver service keeps running
+    driver.execute(Command.QUIT)
+    driver.start_session(driver.launch_options.to_capabilities())
+    logger.info(f"Restarted browser session {driver.session_id}")
+
+    if cdp:
+        driver.execute_cdp_cmd("Network.setCookies", {
+            "cookies": [{k: v for k, v in c.items() if k in CDP_COOKIE_FIELDS and not (k == "expires" and v < 0)}
+                        for c in cookies]
+        })
+        driver.get(url)
+    elif urlsplit(url).scheme in ("http", "https"):
+        driver.get(url)
+        for cookie in cookies:
+            driver.add_cookie(cookie)
+        driver.refresh()
+    logger.info(f"Restored {len(cookies)} cookies and reopened {url}")
+
+
+def _chromium_arguments(options, user_data_dir, headless):
+    """Command line switches shared by Chrome and Edge."""
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if headless:
+        options.add_argument("--headless=new")
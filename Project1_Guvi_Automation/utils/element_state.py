@@ -0,0 +1,68 @@
+"""
+element_state.py
+
+Reads the state of many elements with one WebDriver call.
+
+Checking `element.is_displayed() and element.is_enabled()` and then reading
+`.text` costs a round trip per property. query_states() runs one script for a
+whole set of locators and returns, for each, whether it was found, displayed
+and enabled, its text, its rect and the requested attributes.
+
+The script runs in the current frame, like find_element. A HealingLocator
+(utils/healing.py) reads the first of its candidates found on the page.
+"""
+import logging
+from collections import namedtuple
+
+from Project1_Guvi_Automation.utils import healing
+from Project1_Guvi_Automation.utils.conditions import LOCATE_JS
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# rect is (x, y, width, height) in page coordinates, attributes a dict of the requested ones
+ElementState = namedtuple("ElementState", "found displayed enabled text rect attributes")
+
+MISSING = ElementState(False, False, False, "", None, {})
+
+# Each locator is a list of [by, value] candidates; each record is null (none found)
+# or [displayed, enabled, text, [x, y, w, h], {attribute: value}, index of the candidate found]
+QUERY_STATES_JS = LOCATE_JS + """
+var locators = arguments[0], names = arguments[1];
+return locators.map(function (candidates) {
+    var el = null, index;
+    for (index = 0; index < candidates.length && !el; index++) el = locate(candidates[index][0], candidates[index][1]);
+    if (!el) return null;
+    var rect = el.getBoundingClientRect(), attributes = {};
+    names.forEach(function (name) { attributes[name] = el.getAttribute(name); });
+    return [
+        isVisible(el),
+        !el.disabled,
+        (el.innerText === undefined ? el.textContent : el.innerText).trim(),
+        [Math.round(rect.left + scrollX), Math.round(rect.top + scrollY), Math.round(rect.width), Math.round(rect.height)],
+        attributes,
+        index - 1
+    ];
+});
+"""
+
+
+def query_states(driver, locators, attributes=()):
+    """
+    Return {name: ElementState} for a dict of {name: (By, value)} locators,
+    read in a single script execution. Elements that aren't found get MISSING.
+    """
+    names = list(locators)
+    candidates = [healing.candidates(locators[name]) for name in names]
+    records = driver.execute_script(QUERY_STATES_JS, [[list(c) for c in options] for options in candidates],
+                                    list(attributes))
+    states = {}
+    for name, options, record in zip(names, candidates, records):
+        if record is None:
+            states[name] = MISSING
+        else:
+            displayed, enabled, text, rect, values, index = record
+            healing.resolved(locators[name], options[index])
+            states[name] = ElementState(True, displayed, enabled, text, tuple(rect), values)
+    logger.debug(f"Queried {len(states)} element states in one call")
+    return states
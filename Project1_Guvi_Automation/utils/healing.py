@@ -0,0 +1,162 @@
+"""
+healing.py
+
+Self-healing locators for the page objects.
+
+A HealingLocator is a (By, value) tuple like any other locator, so
+find_element(*locator) and everything else keep using its primary strategy.
+It also carries fallback candidates (ID, CSS, text, structural), which the
+waits of utils/conditions.py and utils/element_state.query_states() try in
+order when the primary no longer matches, within the same wait instead of
+after a timeout.
+
+The candidate that worked is saved in an on-disk cache (config.ini [healing]
+cache_path) keyed by the locator name, so later runs try it right after the
+primary, ahead of the other fallbacks. The primary always stays first (all
+candidates are looked up in the same script call, so that costs nothing): the
+entry is dropped as soon as the primary works again, or is changed in the code.
+
+Every use of a fallback is a healing event: logged as a warning, attached to
+the test in the report and listed at the end of the run, so the primary
+locator can be fixed.
+"""
+import datetime
+import json
+import logging
+import os
+import threading
+
+from Project1_Guvi_Automation.config_reader import artifact_path, get_config
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class HealingLocator(tuple):
+    """
+    (By, value) of the primary strategy, plus a name ("Page.locator") and ordered fallbacks.
+
+    Example:
+        self.courses = HealingLocator("Home_Page.courses", (By.XPATH, "//a[contains(@class,'my-2')]"),
+                                      (By.CSS_SELECTOR, "a[href*='/courses']"))
+    """
+
+    def __new__(cls, name, primary, *fallbacks):
+        locator = super().__new__(cls, primary)
+        locator.name = name
+        locator.fallbacks = tuple(tuple(fallback) for fallback in fallbacks)
+        return locator
+
+    @property
+    def primary(self):
+        return tuple(self)
+
+    def __repr__(self):
+        return f"HealingLocator({self.name!r}, {self.primary!r}, +{len(self.fallbacks)} fallbacks)"
+
+
+_lock = threading.Lock()
+_cache = None       # name -> {"primary": [by, value], "winner": [by, value], "healed_at": ...}
+_events = {}        # name -> (primary, candidate) of the locators healed since the report last took them;
+                    # one entry per locator, so processes that never take them (soak, load) don't grow it
+
+
+def enabled():
+    return get_config("healing", "enabled", "true").lower() == "true"
+
+
+def _cache_path():
+    return artifact_path(get_config("healing", "cache_path", "locator_cache.json"))
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            with open(_cache_path(), encoding="utf-8") as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache(name, entry):
+    """Write one entry (None removes it), merging with what other processes saved meanwhile."""
+    path = _cache_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if entry is None:
+        data.pop(name, None)
+    else:
+        data[name] = entry
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _winner(locator):
+    entry = _load_cache().get(locator.name)
+    # A changed primary means someone fixed the locator: the old winner no longer applies
+    if entry and tuple(entry["primary"]) == locator.primary:
+        return tuple(entry["winner"])
+    return None
+
+
+def candidates(locator):
+    """Strategies to try, in order: the primary, the cached winner, then the other fallbacks."""
+    if not isinstance(locator, HealingLocator) or not enabled():
+        return [tuple(locator)]
+    with _lock:
+        winner = _winner(locator)
+    ordered = [locator.primary] + ([winner] if winner else []) + list(locator.fallbacks)
+    return list(dict.fromkeys(ordered))
+
+
+def current(locator):
+    """Strategy the locator resolved to last: the cached winner or the primary."""
+    if isinstance(locator, HealingLocator) and enabled():
+        with _lock:
+            winner = _winner(locator)
+        if winner:
+            return winner
+    return tuple(locator)
+
+
+def resolved(locator, candidate):
+    """
+    Record that locator matched with candidate. A fallback is a healing event and
+    becomes the cached winner; the primary matching again clears the cache entry.
+    """
+    if not isinstance(locator, HealingLocator):
+        return
+    candidate = tuple(candidate)
+    with _lock:
+        cache = _load_cache()
+        entry = cache.get(locator.name)
+        if candidate == locator.primary:
+            if entry:
+                logger.info(f"Primary locator of {locator.name} works again, dropping its healed strategy")
+                cache.pop(locator.name)
+                _save_cache(locator.name, None)
+            return
+
+        _events[locator.name] = (locator.primary, candidate)
+        if not entry or tuple(entry["winner"]) != candidate or tuple(entry["primary"]) != locator.primary:
+            logger.warning(f"Locator {locator.name} healed: primary {locator.primary} failed, "
+                           f"{candidate} matched; update the primary locator")
+            entry = {"primary": list(locator.primary), "winner": list(candidate),
+                     "healed_at": datetime.datetime.now().isoformat(timespec="seconds")}
+            cache[locator.name] = entry
+            _save_cache(locator.name, entry)
+
+
+def take_events():
+    """Return the healing events since the last call as {name: (primary, candidate)}."""
+    with _lock:
+        events = dict(_events)
+        _events.clear()
+    return events
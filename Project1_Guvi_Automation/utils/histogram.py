@@ -0,0 +1,89 @@
+"""
+histogram.py
+
+Mergeable latency histogram with logarithmic buckets.
+
+Each bucket covers a range about 1% wide (relative), so any percentile is
+known to within ~1% while the histogram stays a small dict of counts no
+matter how many samples it holds. Histograms recorded in different threads,
+processes or time windows are combined with merge(), and they travel as
+plain dicts (as_dict / from_dict) for JSON files.
+"""
+import math
+
+# Relative width of a bucket: percentiles are accurate to about this much
+PRECISION = 0.01
+_LOG_BASE = math.log(1 + PRECISION)
+
+# Values below this (in ms) all land in bucket 0
+MIN_VALUE = 0.01
+
+
+class LatencyHistogram:
+    """Counts of millisecond values in logarithmic buckets."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _bucket(value):
+        return max(0, int(math.log(max(value, MIN_VALUE) / MIN_VALUE) / _LOG_BASE))
+
+    @staticmethod
+    def _bucket_value(bucket):
+        # Middle of the bucket's range
+        return MIN_VALUE * (1 + PRECISION) ** (bucket + 0.5)
+
+    def record(self, value):
+        """Add one value in milliseconds."""
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add the samples of another histogram to this one and return self."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, pct):
+        """Value at or below which pct percent of the samples fall (None when empty)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                # Never report outside the values actually seen
+                return min(max(self._bucket_value(bucket), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def as_dict(self):
+        return {"counts": {str(b): c for b, c in self.counts.items()}, "count": self.count,
+                "total": self.total, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(b): c for b, c in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
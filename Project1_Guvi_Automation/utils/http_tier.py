@@ -0,0 +1,162 @@
+"""
+http_tier.py
+
+Browserless checks for pages that don't need JavaScript to be verified.
+
+A pooled keep-alive HTTP client (urllib3, already installed with Selenium)
+fetches a page, follows redirects step by step so the chain can be asserted,
+and feeds the body into a streaming HTML parser that stops as soon as the
+<title> and the wanted links have been seen.
+Tests using it are marked with @pytest.mark.http_tier.
+"""
+import codecs
+import logging
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import urllib3
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class PageScanner(HTMLParser):
+    """
+    Streaming HTML parser collecting the page title and the anchors.
+    done becomes True once the title and every wanted link text were found,
+    so the caller can stop feeding data.
+    """
+
+    def __init__(self, wanted_links=()):
+        super().__init__(convert_charrefs=True)
+        self.wanted_links = set(wanted_links)
+        self.title = None
+        self.links = {}          # link text -> href (first occurrence)
+        self._in_title = False
+        self._title_parts = []
+        self._anchor_href = None
+        self._anchor_parts = None
+
+    @property
+    def done(self):
+        return self.title is not None and self.wanted_links <= set(self.links)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "a":
+            self._anchor_href = dict(attrs).get("href")
+            self._anchor_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts).strip()
+        elif tag == "a" and self._anchor_parts is not None:
+            text = " ".join("".join(self._anchor_parts).split())
+            if text:
+                self.links.setdefault(text, self._anchor_href)
+            self._anchor_parts = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._anchor_parts is not None:
+            self._anchor_parts.append(data)
+
+
+class PageResult:
+    """What the fast tier learnt about a URL."""
+
+    def __init__(self, url):
+        self.requested_url = url
+        self.url = url
+        self.status = None
+        self.redirects = []      # list of (status, location) hops
+        self.headers = {}
+        self.title = None
+        self.links = {}
+        self.elapsed = None
+
+    def has_link(self, text):
+        return text in self.links
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client shared by the fast-tier tests.
+    Connections are pooled per host, so checking several GUVI pages
+    costs a single TCP/TLS handshake.
+    """
+
+    def __init__(self, timeout=5.0, max_redirects=5, pool_size=4):
+        self.max_redirects = max_redirects
+        self.pool = urllib3.PoolManager(
+            maxsize=pool_size,
+            retries=False,
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            headers={"User-Agent": "Mozilla/5.0 (GUVI automation fast tier)", "Accept": "text/html"},
+        )
+
+    def fetch(self, url, wanted_links=(), chunk_size=16384):
+        """
+        GET url, following redirects, and scan the final HTML.
+        Parsing stops as soon as the title and wanted_links were found.
+        """
+        result = PageResult(url)
+        start = time.perf_counter()
+
+        for _ in range(self.max_redirects + 1):
+            response = self.pool.request("GET", result.url, redirect=False, preload_content=False)
+            if response.status in REDIRECT_STATUSES and response.headers.get("Location"):
+                location = urljoin(result.url, response.headers["Location"])
+                result.redirects.append((response.status, location))
+                logger.info(f"{result.url} redirected ({response.status}) to {location}")
+                response.drain_conn()
+                response.release_conn()
+                result.url = location
+                continue
+            break
+        else:
+            raise AssertionError(f"Too many redirects for {url}: {result.redirects}")
+
+        result.status = response.status
+        result.headers = dict(response.headers)
+
+        scanner = PageScanner(wanted_links)
+        charset = _charset(response.headers.get("Content-Type", ""))
+        decoder = _incremental_decoder(charset)
+        for chunk in response.stream(chunk_size):
+            scanner.feed(decoder.decode(chunk))
+            if scanner.done:
+                break
+        # Read whatever is left so the connection goes back to the pool
+        response.drain_conn()
+        response.release_conn()
+
+        result.title = scanner.title
+        result.links = scanner.links
+        result.elapsed = time.perf_counter() - start
+        logger.info(f"Fetched {result.url} status={result.status} in {result.elapsed * 1000:.0f} ms")
+        return result
+
+    def close(self):
+        self.pool.clear()
+
+
+def _charset(content_type):
+    for part in content_type.split(";"):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "charset" and value:
+            return value.strip('"')
+    return "utf-8"
+
+
+def _incremental_decoder(charset):
+    try:
+        return codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
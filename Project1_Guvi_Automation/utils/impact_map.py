@@ -0,0 +1,379 @@
+"""
+impact_map.py
+
+Change-impact test selection.
+
+While recording (--record-impact) every test stores the page-object methods it
+executed (taken from step_timer) and the locators those methods use.
+The map is saved to impact_map.json. With --impact-since=<git ref> only the
+tests touched by the diff against that ref are run:
+
+    - a changed page-object method selects the tests that executed it
+    - a changed locator (self.<name> = (By..., ...) in __init__) selects the
+      tests whose methods use that locator
+    - a changed test function selects that test
+    - changes to conftest, config or framework code select the full suite
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.impact_map origin/main
+"""
+import ast
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from Project1_Guvi_Automation.config_reader import PROJECT_DIR
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Project files whose change can affect any test
+FULL_SUITE_FILES = {"conftest.py", "config.ini", "config_reader.py", "configwrite.py", "requirements.txt", "__init__.py"}
+FULL_SUITE_DIRS = ("utils/",)
+
+# Project files that never influence a test result
+IGNORED_SUFFIXES = (".md", ".log", ".png", ".html", ".css", ".json", ".db")
+
+
+# ---------------------- STATIC ANALYSIS OF PAGE OBJECTS ----------------------
+
+class PageIndex:
+    """
+    Line ranges of the classes, methods and locator assignments of one page module,
+    plus the self.<attribute> names every method reads.
+    """
+
+    def __init__(self, source):
+        self.methods = {}       # qualname -> (first line, last line)
+        self.uses = {}          # qualname -> set of self attributes it reads
+        self.attributes = {}    # (class, attribute) -> (first line, last line) inside __init__
+        self.init_ranges = {}   # class -> (first line, last line) of __init__
+        self.code_lines = set() # lines holding code rather than blanks or comments
+        if source is None:
+            return
+        self.code_lines = _code_lines(source)
+
+        for node in ast.parse(source).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for item in node.body:
+                if not isinstance(item, ast.FunctionDef):
+                    continue
+                first = min([d.lineno for d in item.decorator_list] + [item.lineno])
+                if item.name == "__init__":
+                    self.init_ranges[node.name] = (first, item.end_lineno)
+                    for stmt in ast.walk(item):
+                        if isinstance(stmt, ast.Assign) and _is_locator(stmt.value):
+                            for target in stmt.targets:
+                                if _is_self_attribute(target):
+                                    self.attributes[(node.name, target.attr)] = (stmt.lineno, stmt.end_lineno)
+                    continue
+                qualname = f"{node.name}.{item.name}"
+                self.methods[qualname] = (first, item.end_lineno)
+                self.uses[qualname] = {n.attr for n in ast.walk(item) if _is_self_attribute(n)}
+
+    def locators_of(self, qualname):
+        """Return the locator attributes read by a method."""
+        known = {attr for _, attr in self.attributes}
+        return self.uses.get(qualname, set()) & known
+
+    def changes(self, lines):
+        """
+        Translate changed line numbers into changed methods and locators.
+        Returns (methods, locators, whole_module) where whole_module is True when
+        a line outside any method or locator changed (imports, class header, ...).
+        """
+        methods, locators, whole_module = set(), set(), False
+        for line in lines:
+            hit = [q for q, (a, b) in self.methods.items() if a <= line <= b]
+            if hit:
+                methods.update(hit)
+                continue
+            attrs = [attr for (cls, attr), (a, b) in self.attributes.items() if a <= line <= b]
+            if attrs:
+                locators.update(attrs)
+                continue
+            inits = [cls for cls, (a, b) in self.init_ranges.items() if a <= line <= b]
+            if inits:
+                # Other __init__ changes (waits, config values) affect every method of the class
+                for cls in inits:
+                    methods.update(q for q in self.methods if q.startswith(cls + "."))
+                continue
+            if line in self.code_lines:
+                whole_module = True
+        return methods, locators, whole_module
+
+
+def _code_lines(source):
+    """Return the numbers of lines that are neither blank nor comments."""
+    return {number for number, text in enumerate(source.splitlines(), start=1)
+            if text.strip() and not text.strip().startswith("#")}
+
+
+def project_nodeid(item):
+    """
+    Return the node id of a pytest item relative to the project folder,
+    so the map is the same whether pytest runs from the project or the repository root.
+    """
+    path = os.path.relpath(str(item.path), PROJECT_DIR).replace(os.sep, "/")
+    return path + item.nodeid[item.nodeid.index("::"):]
+
+
+def _is_locator(value):
+    """True for (By.X, "...") tuples, HealingLocator(...) calls and dicts of them, like Home_Page.Menu_items."""
+    if isinstance(value, ast.Dict):
+        return bool(value.values) and all(_is_locator(v) for v in value.values)
+    if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "HealingLocator":
+        return True
+    return (isinstance(value, ast.Tuple) and len(value.elts) == 2
+            and isinstance(value.elts[0], ast.Attribute)
+            and isinstance(value.elts[0].value, ast.Name) and value.elts[0].value.id == "By")
+
+
+def _is_self_attribute(node):
+    return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+
+
+def page_indexes():
+    """Build a PageIndex for every module in pages/."""
+    indexes = {}
+    pages_dir = os.path.join(PROJECT_DIR, "pages")
+    for name in sorted(os.listdir(pages_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(pages_dir, name), encoding="utf-8") as f:
+                indexes[f"pages/{name}"] = PageIndex(f.read())
+    return indexes
+
+
+def locators_for(methods, indexes=None):
+    """Return the locator attribute names used by the given page-object methods."""
+    indexes = indexes or page_indexes()
+    locators = set()
+    for index in indexes.values():
+        for qualname in methods:
+            locators |= index.locators_of(qualname)
+    return locators
+
+
+# ---------------------- MAP PERSISTENCE ----------------------
+
+def load_map(path):
+    """Load the recorded map, or return None when nothing was recorded yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_map(path, recorded):
+    """
+    Merge freshly recorded tests into the map on disk.
+    recorded is {nodeid: set of page-object method qualnames}.
+    """
+    data = load_map(path) or {"tests": {}}
+    indexes = page_indexes()
+    for nodeid, methods in recorded.items():
+        data["tests"][nodeid] = {
+            "methods": sorted(methods),
+            "locators": sorted(locators_for(methods, indexes)),
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    logger.info(f"Impact map updated for {len(recorded)} tests: {path}")
+
+
+# ---------------------- GIT DIFF ----------------------
+
+HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def changed_lines(since):
+    """
+    Return {path relative to the project: (old lines, new lines)} for the diff
+    between the given git ref and the working tree.
+    """
+    output = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", since, "--", "."],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    prefix = subprocess.run(
+        ["git", "rev-parse", "--show-prefix"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    changes = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("diff --git"):
+            # "diff --git a/<old> b/<new>": keep the new path (the old one for deletions)
+            path = line.split(" b/", 1)[1]
+            current = changes.setdefault(path[len(prefix):], (set(), set()))
+        elif current is not None and line.startswith("@@"):
+            match = HUNK.match(line)
+            old_start, old_count, new_start, new_count = match.groups()
+            old_start, new_start = int(old_start), int(new_start)
+            old_count = 1 if old_count is None else int(old_count)
+            new_count = 1 if new_count is None else int(new_count)
+            current[0].update(range(old_start, old_start + old_count))
+            current[1].update(range(new_start, new_start + new_count))
+            # Pure insertions/deletions still touch the line they happen at
+            if new_count == 0:
+                current[1].add(new_start)
+            if old_count == 0:
+                current[0].add(old_start)
+    return changes
+
+
+def _git_show(since, path):
+    """Return the content of a project file at the given ref, or None if it did not exist."""
+    result = subprocess.run(["git", "show", f"{since}:./{path}"], cwd=PROJECT_DIR, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _read(path):
+    full = os.path.join(PROJECT_DIR, path)
+    if not os.path.exists(full):
+        return None
+    with open(full, encoding="utf-8") as f:
+        return f.read()
+
+
+# ---------------------- SELECTION ----------------------
+
+class Impact:
+    """Result of analysing a diff: either the full suite or a set of changes."""
+
+    def __init__(self):
+        self.full_suite_reason = None
+        self.methods = set()
+        self.locators = set()
+        self.test_functions = set()   # (test file, function name)
+        self.test_files = set()       # test files changed outside a test function
+
+    def describe(self):
+        if self.full_suite_reason:
+            return f"full suite ({self.full_suite_reason})"
+        return (f"methods={sorted(self.methods)} locators={sorted(self.locators)} "
+                f"tests={sorted(f for _, f in self.test_functions)} files={sorted(self.test_files)}")
+
+
+def analyse_diff(since):
+    """Work out which page-object methods, locators and tests the diff touches."""
+    impact = Impact()
+    for path, (old_lines, new_lines) in changed_lines(since).items():
+        name = os.path.basename(path)
+        if path.endswith(IGNORED_SUFFIXES) or path.startswith("screenshots/"):
+            continue
+        if name in FULL_SUITE_FILES or path.startswith(FULL_SUITE_DIRS):
+            impact.full_suite_reason = f"{path} changed"
+            return impact
+
+        if path.startswith("pages/") and path.endswith(".py"):
+            for source, lines in ((_git_show(since, path), old_lines), (_read(path), new_lines)):
+                methods, locators, whole_module = PageIndex(source).changes(lines)
+                if whole_module:
+                    impact.full_suite_reason = f"module level code of {path} changed"
+                    return impact
+                impact.methods |= methods
+                impact.locators |= locators
+
+        elif path.startswith("tests/") and path.endswith(".py"):
+            for source, lines in ((_git_show(since, path), old_lines), (_read(path), new_lines)):
+                functions, outside = _test_function_changes(source, lines)
+                impact.test_functions |= {(path, f) for f in functions}
+                if outside:
+                    impact.test_files.add(path)
+
+        else:
+            impact.full_suite_reason = f"unmapped file {path} changed"
+            return impact
+    return impact
+
+
+def _test_function_changes(source, lines):
+    """Return (changed test function names, True if lines outside test functions changed)."""
+    if source is None:
+        return set(), bool(lines)
+    code = _code_lines(source)
+    ranges = {}
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+            first = min([d.lineno for d in node.decorator_list] + [node.lineno])
+            ranges[node.name] = (first, node.end_lineno)
+    functions, outside = set(), False
+    for line in lines:
+        hit = [name for name, (a, b) in ranges.items() if a <= line <= b]
+        functions.update(hit)
+        outside = outside or (not hit and line in code)
+    return functions, outside
+
+
+def is_affected(nodeid, impact, recorded):
+    """Decide whether a collected test has to run for the given impact."""
+    path, _, rest = nodeid.partition("::")
+    function = rest.split("::")[-1].split("[")[0]
+    if path in impact.test_files or (path, function) in impact.test_functions:
+        return True
+    entry = recorded.get(nodeid)
+    if entry is None:
+        # Never recorded (new test): run it to be safe
+        return True
+    return bool(impact.methods & set(entry["methods"]) or impact.locators & set(entry["locators"]))
+
+
+def select(items, impact, recorded):
+    """
+    Split collected items into (selected, deselected).
+    Tests named in a depends_on marker of a selected test are kept as well,
+    since tests in one class share the browser state built by earlier tests.
+    """
+    wanted = {item.nodeid for item in items if is_affected(project_nodeid(item), impact, recorded)}
+
+    # Follow depends_on markers transitively, within the class sharing the browser
+    pending = [item for item in items if item.nodeid in wanted]
+    while pending:
+        item = pending.pop()
+        for marker in item.iter_markers("depends_on"):
+            for candidate in items:
+                if (getattr(candidate, "originalname", candidate.name) in marker.args and candidate.cls is item.cls
+                        and candidate.nodeid not in wanted):
+                    wanted.add(candidate.nodeid)
+                    pending.append(candidate)
+
+    selected = [item for item in items if item.nodeid in wanted]
+    deselected = [item for item in items if item.nodeid not in wanted]
+    return selected, deselected
+
+
+def main(argv=None):
+    """Print which recorded tests a diff against the given git ref affects."""
+    from Project1_Guvi_Automation.config_reader import get_config, project_path
+
+    argv = sys.argv[1:] if argv is None else argv
+    since = argv[0] if argv else "HEAD"
+    impact = analyse_diff(since)
+    print(f"Impact of changes since {since}: {impact.describe()}")
+
+    data = load_map(project_path(get_config("impact", "map_path", "impact_map.json")))
+    if data is None:
+        print("No impact map recorded yet, run pytest --record-impact first")
+        return 0
+    if impact.full_suite_reason:
+        return 0
+
+    affected = defaultdict(list)
+    for nodeid in sorted(data["tests"]):
+        if is_affected(nodeid, impact, data["tests"]):
+            affected[nodeid.split("::")[0]].append(nodeid)
+    for nodeids in affected.values():
+        for nodeid in nodeids:
+            print(nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+journeys.py
+
+End-to-end user journeys built from the page objects, for the long-running
+modes (soak, load) that repeat them many times on the same browser.
+
+Every journey takes a driver, starts from the homepage and raises on failure.
+The page-object steps it runs are recorded by step_timer like in the tests.
+
+CHECKS are the short synthetic checks (TC1/TC2, TC6, TC9) run by the
+monitoring daemon; they may return extra measurements as a dict.
+"""
+import time
+
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.pages.home_page import Home_Page
+from Project1_Guvi_Automation.pages.login_page import Login_Page
+from Project1_Guvi_Automation.pages.signup_page import Signup_Page
+from Project1_Guvi_Automation.pages.dashboard_page import Dashboard_Page
+
+
+def login_logout(driver):
+    """Homepage -> Login button -> log in with the valid credentials -> log out from the dashboard."""
+    homepage = Home_Page(driver)
+    homepage.navigate_to_url()
+    homepage.click_login_button()
+
+    loginpage = Login_Page(driver)
+    loginpage.enter_username(get_config("login_guvi", "valid_username"))
+    loginpage.enter_password(get_config("login_guvi", "valid_password"))
+    loginpage.click_login()
+    loginpage.wait_login_load()
+
+    dashboard = Dashboard_Page(driver)
+    dashboard.click_logout_dropdown()
+    dashboard.click_logout()
+    dashboard.wait_logout_load()
+
+
+def signup_to_login(driver):
+    """Homepage -> Sign up button -> Login link of the register page."""
+    homepage = Home_Page(driver)
+    homepage.navigate_to_url()
+    homepage.click_signup_button()
+    Signup_Page(driver).click_login_signup_page()
+
+
+JOURNEYS = {
+    "login_logout": login_logout,
+    "signup_to_login": signup_to_login,
+}
+
+
+# ---------------------- SYNTHETIC CHECKS ----------------------
+
+def homepage_check(driver):
+    """TC1/TC2: the homepage loads at the configured URL with the expected title."""
+    homepage = Home_Page(driver)
+    homepage.navigate_to_url()
+    assert driver.current_url == get_config("guvi", "url"), f"URL mismatch: {driver.current_url}"
+    title = homepage.get_title()
+    assert title == get_config("guvi", "title"), f"Title mismatch: {title}"
+
+
+def valid_login_check(driver):
+    """TC6: logging in with the valid credentials lands on the dashboard."""
+    loginpage = Login_Page(driver)
+    loginpage.navigate_to_url()
+    loginpage.enter_username(get_config("login_guvi", "valid_username"))
+    loginpage.enter_password(get_config("login_guvi", "valid_password"))
+    loginpage.click_login()
+    loginpage.wait_login_load()
+    assert driver.current_url == get_config("dashboard_guvi", "url"), f"URL mismatch: {driver.current_url}"
+    # Leave the browser logged out for the next check
+    driver.delete_all_cookies()
+
+
+def dobby_check(driver):
+    """
+    TC9: the Dobby assistant becomes clickable and opens its chat window.
+    Returns the time from starting the navigation until the widget is ready
+    and the time the chat window took to open.
+    """
+    homepage = Home_Page(driver)
+    start = time.perf_counter()
+    homepage.navigate_to_url()
+    homepage.verify_dobby_virtual_assistant()
+    ready = time.perf_counter()
+    title = homepage.click_dobby_virtual_assistant()
+    opened = time.perf_counter()
+    assert title == get_config("guvi", "dobby_title"), f"Chatbox title mismatch: {title}"
+    return {"dobby_widget_ready_seconds": ready - start, "dobby_chat_open_seconds": opened - ready}
+
+
+CHECKS = {
+    "homepage": homepage_check,
+    "valid_login": valid_login_check,
+    "dobby": dobby_check,
+}
@@ -0,0 +1,326 @@
+"""
+load_generator.py
+
+Browser-level load against a staging or locally mocked GUVI site, reusing the
+page-object journeys of utils/journeys.py.
+
+The load follows a stepped ramp-up: each stage ("sessions:seconds") holds that
+many concurrent headless sessions for that long (a lower number than the
+stage before stops the newest sessions); new sessions are launched
+one every spawn_interval seconds so browser start-up doesn't skew the first
+samples. Every session waits a random think time between journeys.
+
+Each session records into its own histograms (utils/histogram.py), which are
+merged per stage, so the sessions don't share a lock. For every stage the
+report gives throughput, error rate and p50/p95/p99 per journey and per
+page-object action, and the knee: the first stage whose p95 is degrade_factor
+times the first stage's, whose error rate passes max_error_rate, or whose
+throughput stops growing with the extra sessions.
+
+Host limits keep the generator from becoming the bottleneck: sessions are
+capped by max_browsers, by free memory / memory_per_browser_mb and by CPU
+count, no session is launched while the host CPU is above max_cpu_percent,
+and stages during which the host was saturated are flagged as unreliable.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.load_generator --stages 1:60,2:60,4:60,8:60
+    python -m Project1_Guvi_Automation.utils.load_generator --stages 2:30,4:30 --standin-site
+"""
+import argparse
+import collections
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+import psutil
+from selenium.common.exceptions import WebDriverException
+
+from Project1_Guvi_Automation.config_reader import get_config, project_path
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils.driver_factory import create_driver
+from Project1_Guvi_Automation.utils.histogram import LatencyHistogram
+from Project1_Guvi_Automation.utils.journeys import JOURNEYS
+from Project1_Guvi_Automation.utils.soak import session_alive
+from Project1_Guvi_Automation.utils.standin_site import StandInSite
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class StageStats:
+    """Results of one session (or, merged, of all sessions) during one stage."""
+
+    def __init__(self):
+        self.journeys = collections.defaultdict(LatencyHistogram)
+        self.actions = collections.defaultdict(LatencyHistogram)
+        self.ok = 0
+        self.failed = 0
+
+    def merge(self, other):
+        for name, histogram in other.journeys.items():
+            self.journeys[name].merge(histogram)
+        for name, histogram in other.actions.items():
+            self.actions[name].merge(histogram)
+        self.ok += other.ok
+        self.failed += other.failed
+        return self
+
+
+class LoadSession(threading.Thread):
+    """One headless browser running journeys with think times until stopped."""
+
+    def __init__(self, index, browser, journeys, think_time, stage_of):
+        super().__init__(name=f"load-{index}", daemon=True)
+        self.index = index
+        self.browser = browser
+        self.journeys = journeys
+        self.think_time = think_time
+        self.stage_of = stage_of            # callable returning the current stage number
+        self.stats = collections.defaultdict(StageStats)
+        self.lock = threading.Lock()        # contended only while a stage is collected
+        self.stopping = threading.Event()
+        self.driver = None
+
+    def run(self):
+        try:
+            self.driver = create_driver(self.browser, headless=True)
+            self.driver.implicitly_wait(10)
+        except Exception as e:
+            logger.error(f"[{self.name}] could not start the browser: {e}")
+            return
+
+        runs = 0
+        try:
+            while not self.stopping.is_set():
+                # Sessions start at different journeys so the mix is even from the start
+                name = self.journeys[(runs + self.index) % len(self.journeys)]
+                runs += 1
+                step_timer.begin_test(f"load:{name}")
+                start = time.perf_counter()
+                ok = True
+                try:
+                    JOURNEYS[name](self.driver)
+                except Exception as e:
+                    ok = False
+                    logger.debug(f"[{self.name}] journey {name} failed: {e}")
+                elapsed = (time.perf_counter() - start) * 1000
+                steps = step_timer.end_test()
+
+                # A journey counts for the stage in which it finished
+                with self.lock:
+                    stats = self.stats[self.stage_of()]
+                    stats.journeys[name].record(elapsed)
+                    for step in steps:
+                        if step.depth == 0:
+                            stats.actions[step.name].record(step.duration * 1000)
+                    if ok:
+                        stats.ok += 1
+                    else:
+                        stats.failed += 1
+
+                if not ok:
+                    if not session_alive(self.driver):
+                        logger.warning(f"[{self.name}] browser is gone, ending this session")
+                        return
+                    self.driver.delete_all_cookies()
+                self.stopping.wait(random.uniform(*self.think_time))
+        finally:
+            if self.driver:
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
+
+    def collect(self, stage):
+        """Hand over (and forget) this session's results of a finished stage."""
+        with self.lock:
+            return self.stats.pop(stage, StageStats())
+
+
+def host_session_limit(max_browsers, memory_per_browser_mb, sessions_per_cpu):
+    """Most sessions this host can drive without becoming the bottleneck."""
+    by_memory = int(psutil.virtual_memory().available / MB // memory_per_browser_mb)
+    by_cpu = int((os.cpu_count() or 1) * sessions_per_cpu)
+    return max(1, min(max_browsers, by_memory, by_cpu))
+
+
+def parse_stages(text):
+    """'1:60,2:60,4:60' -> [(1, 60.0), (2, 60.0), (4, 60.0)]"""
+    stages = []
+    for part in text.split(","):
+        sessions, seconds = part.split(":")
+        stages.append((int(sessions), float(seconds)))
+    return stages
+
+
+def stage_summary(number, target, running, stats, duration, cpu_samples, limited, max_cpu):
+    def percentiles(histograms):
+        return {name: {"count": h.count, "p50": h.percentile(50), "p95": h.percentile(95),
+                       "p99": h.percentile(99)} for name, h in sorted(histograms.items())}
+
+    total = stats.ok + stats.failed
+    overall = LatencyHistogram()
+    for histogram in stats.journeys.values():
+        overall.merge(histogram)
+    cpu = sum(cpu_samples) / len(cpu_samples) if cpu_samples else 0.0
+    return {
+        "stage": number,
+        "target_sessions": target,
+        "sessions": running,
+        "journeys_per_minute": total / (duration / 60) if duration else 0.0,
+        "error_rate": stats.failed / total if total else 0.0,
+        "p50": overall.percentile(50),
+        "p95": overall.percentile(95),
+        "p99": overall.percentile(99),
+        "journeys": percentiles(stats.journeys),
+        "actions": percentiles(stats.actions),
+        "host_cpu_percent": cpu,
+        "host_limited": limited,
+        # The host, not the site, may be what slowed this stage down
+        "unreliable": limited or cpu > max_cpu,
+    }
+
+
+def find_knee(stages, degrade_factor, max_error_rate):
+    """Return (stage summary, reason) of the first stage where latency degrades, or (None, None)."""
+    measured = [s for s in stages if s["p95"] is not None]
+    if not measured:
+        return None, None
+    base = measured[0]
+    previous = base
+    for stage in measured[1:]:
+        if stage["p95"] >= base["p95"] * degrade_factor:
+            return stage, f"p95 {stage['p95']:.0f} ms is {stage['p95'] / base['p95']:.1f}x the first stage"
+        if stage["error_rate"] > max_error_rate:
+            return stage, f"error rate {stage['error_rate'] * 100:.1f}%"
+        if stage["sessions"] > previous["sessions"] and \
+                stage["journeys_per_minute"] < previous["journeys_per_minute"] * 1.05:
+            return stage, "throughput stopped growing with more sessions"
+        previous = stage
+    return None, None
+
+
+def run_load(stages, browser, journeys, think_time, spawn_interval, limits):
+    """Run the ramp-up and return the list of stage summaries."""
+    cap = host_session_limit(limits["max_browsers"], limits["memory_per_browser_mb"], limits["sessions_per_cpu"])
+    logger.info(f"This host can drive up to {cap} browser sessions")
+    current_stage = [0]
+    sessions = []
+    summaries = []
+    try:
+        for number, (target, seconds) in enumerate(stages):
+            current_stage[0] = number
+            limited = target > cap
+            started = time.time()
+            end = started + seconds
+            cpu_samples = []
+            psutil.cpu_percent()   # start the measurement interval
+
+            # A lower target stops the newest sessions; the journeys they finish meanwhile are dropped
+            surplus = [s for s in sessions if s.is_alive()][min(target, cap):]
+            for session in surplus:
+                session.stopping.set()
+            for session in surplus:
+                session.join(timeout=60)
+                session.collect(number)
+
+            # Launch the extra sessions one by one, only while the host has room for them;
+            # sessions whose browser died are replaced
+            while sum(1 for s in sessions if s.is_alive()) < min(target, cap) and time.time() < end:
+                if psutil.cpu_percent(interval=None) > limits["max_cpu_percent"] or \
+                        psutil.virtual_memory().available / MB < limits["memory_per_browser_mb"]:
+                    limited = True
+                    logger.warning("Host CPU/memory at its limit, not launching more sessions this stage")
+                    break
+                session = LoadSession(len(sessions), browser, journeys, think_time, lambda: current_stage[0])
+                session.start()
+                sessions.append(session)
+                time.sleep(spawn_interval)
+
+            while time.time() < end:
+                time.sleep(min(1.0, max(0.0, end - time.time())))
+                cpu_samples.append(psutil.cpu_percent(interval=None))
+
+            merged = StageStats()
+            current_stage[0] = number + 1
+            for session in sessions:
+                merged.merge(session.collect(number))
+            running = sum(1 for s in sessions if s.is_alive())
+            summary = stage_summary(number + 1, target, running, merged, time.time() - started,
+                                    cpu_samples, limited, limits["max_cpu_percent"])
+            summaries.append(summary)
+            print_stage(summary)
+    except KeyboardInterrupt:
+        print("Interrupted, stopping the sessions")
+    finally:
+        for session in sessions:
+            session.stopping.set()
+        for session in sessions:
+            session.join(timeout=60)
+    return summaries
+
+
+def print_stage(s):
+    flag = "  UNRELIABLE (host limited)" if s["unreliable"] else ""
+    print(f"stage {s['stage']}: {s['sessions']}/{s['target_sessions']} sessions  "
+          f"{s['journeys_per_minute']:6.1f}/min  errors {s['error_rate'] * 100:5.1f}%  "
+          f"p50/p95/p99 {s['p50'] or 0:.0f}/{s['p95'] or 0:.0f}/{s['p99'] or 0:.0f} ms  "
+          f"host cpu {s['host_cpu_percent']:.0f}%{flag}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate browser-level load with the page-object journeys")
+    parser.add_argument("--stages", default=get_config("load", "stages", "1:60,2:60,4:60"),
+                        help="comma separated sessions:seconds stages")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help=f"comma separated: {', '.join(JOURNEYS)}")
+    parser.add_argument("--browser", default=get_config("browser_name", "browser"))
+    parser.add_argument("--think-min", type=float, default=float(get_config("load", "think_min", "1")))
+    parser.add_argument("--think-max", type=float, default=float(get_config("load", "think_max", "3")))
+    parser.add_argument("--spawn-interval", type=float, default=float(get_config("load", "spawn_interval", "2")))
+    parser.add_argument("--standin-site", action="store_true", help="load the local stand-in site")
+    parser.add_argument("--out", default=get_config("load", "output_path", "load_results.json"))
+    args = parser.parse_args(argv)
+
+    limits = {
+        "max_browsers": int(get_config("load", "max_browsers", "16")),
+        "memory_per_browser_mb": float(get_config("load", "memory_per_browser_mb", "400")),
+        "sessions_per_cpu": float(get_config("load", "sessions_per_cpu", "1")),
+        "max_cpu_percent": float(get_config("load", "max_cpu_percent", "85")),
+    }
+    journeys = [j.strip() for j in args.journeys.split(",") if j.strip()]
+    unknown = set(journeys) - set(JOURNEYS)
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(sorted(unknown))}")
+
+    def run():
+        return run_load(parse_stages(args.stages), args.browser, journeys,
+                        (args.think_min, args.think_max), args.spawn_interval, limits)
+
+    if args.standin_site:
+        with StandInSite():
+            summaries = run()
+    else:
+        summaries = run()
+
+    knee, reason = find_knee(summaries, float(get_config("load", "degrade_factor", "1.5")),
+                             float(get_config("load", "max_error_rate", "0.05")))
+    if knee:
+        print(f"\nLatency degrades at {knee['sessions']} sessions (stage {knee['stage']}): {reason}")
+    elif summaries:
+        print(f"\nNo degradation up to {summaries[-1]['sessions']} sessions")
+
+    with open(project_path(args.out), "w", encoding="utf-8") as f:
+        json.dump({"stages": summaries, "knee": knee and {"stage": knee["stage"], "reason": reason},
+                   "limits": limits}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
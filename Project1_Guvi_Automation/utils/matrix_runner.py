@@ -0,0 +1,205 @@
+"""
+matrix_runner.py
+
+Runs the suite across several browsers and launch profiles at once.
+
+Every matrix cell (browser x launch profile) is a single pytest subprocess
+with its own working folder, so screenshots, logs and reports of the cells
+don't overwrite each other. The cell also writes its run history, locator
+cache, network timings and traces there (conftest --artifacts-dir) instead of
+sharing the project's files with the cells running next to it. A thread pool
+starts the subprocesses and waits on them, at most `max_workers` at a time.
+
+When all cells are done their JUnit XML files are merged into one
+matrix.xml and a matrix.html with a column per cell, the duration of every
+test in every cell and how much slower it was than in the fastest cell, so a
+slowdown specific to one browser stands out.
+
+Launch profiles (conftest --launch-profile):
+    default  - normal browser window
+    headless - no window
+    warm     - started from a clone of the pre-warmed profile template
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.matrix_runner
+    python -m Project1_Guvi_Automation.utils.matrix_runner --browsers chrome,edge --launch-profiles default,headless
+    python -m Project1_Guvi_Automation.utils.matrix_runner --max-workers 2 -- -k tc1
+"""
+import argparse
+import html
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from Project1_Guvi_Automation.config_reader import PROJECT_DIR, get_config, project_path
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# A test this much slower than in the fastest cell is highlighted
+SLOWDOWN_HIGHLIGHT = 1.5
+
+
+class Cell:
+    """One browser / launch profile combination and the outcome of its run."""
+
+    def __init__(self, browser, launch_profile, out_dir):
+        self.browser = browser
+        self.launch_profile = launch_profile
+        self.name = f"{browser}-{launch_profile}"
+        self.dir = os.path.join(out_dir, self.name)
+        self.junit = os.path.join(self.dir, "junit.xml")
+        self.returncode = None
+        self.duration = None
+        self.results = {}   # test id -> (outcome, seconds)
+
+    def command(self, test_paths, extra_args):
+        return [
+            sys.executable, "-m", "pytest", *test_paths,
+            f"--rootdir={PROJECT_DIR}",
+            "--browser-name", self.browser,
+            "--launch-profile", self.launch_profile,
+            f"--junitxml={self.junit}",
+            f"--html={os.path.join(self.dir, 'report.html')}", "--self-contained-html",
+            "--artifacts-dir", self.dir,
+            *extra_args,
+        ]
+
+
+def run_cell(cell, test_paths, extra_args):
+    """Run the suite for one cell in its own process and folder."""
+    # Tests save screenshots relative to the working folder
+    os.makedirs(os.path.join(cell.dir, "screenshots"), exist_ok=True)
+    # Start from the locators already healed in the project; the cell then keeps its own cache
+    cache = get_config("healing", "cache_path", "locator_cache.json")
+    if not os.path.isabs(cache) and os.path.exists(project_path(cache)) \
+            and not os.path.exists(os.path.join(cell.dir, cache)):
+        shutil.copy2(project_path(cache), os.path.join(cell.dir, cache))
+    logger.info(f"[{cell.name}] started")
+    start = time.perf_counter()
+    with open(os.path.join(cell.dir, "output.log"), "w", encoding="utf-8") as output:
+        cell.returncode = subprocess.run(
+            cell.command(test_paths, extra_args), cwd=cell.dir, stdout=output, stderr=subprocess.STDOUT
+        ).returncode
+    cell.duration = time.perf_counter() - start
+    cell.results = read_junit(cell.junit)
+    logger.info(f"[{cell.name}] finished with exit code {cell.returncode} in {cell.duration:.1f}s")
+    return cell
+
+
+def read_junit(path):
+    """Return {test id: (outcome, seconds)} from a JUnit XML file."""
+    if not os.path.exists(path):
+        return {}
+    results = {}
+    for case in ET.parse(path).getroot().iter("testcase"):
+        test_id = f"{case.get('classname')}::{case.get('name')}"
+        if case.find("failure") is not None:
+            outcome = "failed"
+        elif case.find("error") is not None:
+            outcome = "error"
+        elif case.find("skipped") is not None:
+            outcome = "skipped"
+        else:
+            outcome = "passed"
+        results[test_id] = (outcome, float(case.get("time", 0)))
+    return results
+
+
+def merge_junit(cells, path):
+    """Write one JUnit file holding every cell's test suite, named after the cell."""
+    merged = ET.Element("testsuites")
+    for cell in cells:
+        if not os.path.exists(cell.junit):
+            continue
+        for suite in ET.parse(cell.junit).getroot().iter("testsuite"):
+            suite.set("name", cell.name)
+            merged.append(suite)
+    ET.ElementTree(merged).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def write_matrix_report(cells, path):
+    """HTML table with a column per cell: outcome, duration and slowdown against the fastest cell."""
+    test_ids = sorted({test_id for cell in cells for test_id in cell.results})
+    header = "".join(
+        f'<th><a href="{html.escape(cell.name)}/report.html">{html.escape(cell.name)}</a></th>' for cell in cells
+    )
+    rows = []
+    for test_id in test_ids:
+        times = [cell.results[test_id][1] for cell in cells if test_id in cell.results]
+        fastest = min(times) if times else 0
+        cells_html = []
+        for cell in cells:
+            if test_id not in cell.results:
+                cells_html.append("<td>-</td>")
+                continue
+            outcome, seconds = cell.results[test_id]
+            ratio = seconds / fastest if fastest > 0 else 1.0
+            style = "background:#fdd" if outcome in ("failed", "error") else ""
+            slow = f' <b style="color:#c00">x{ratio:.1f}</b>' if ratio >= SLOWDOWN_HIGHLIGHT else ""
+            cells_html.append(f'<td style="{style}">{outcome} {seconds:.2f}s{slow}</td>')
+        rows.append(f"<tr><td>{html.escape(test_id)}</td>{''.join(cells_html)}</tr>")
+
+    totals = "".join(
+        f"<td><b>{sum(1 for o, _ in cell.results.values() if o == 'passed')}/{len(cell.results)} passed, "
+        f"{cell.duration:.1f}s</b></td>" for cell in cells
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Browser matrix</title></head><body>"
+            "<h1>Browser matrix</h1>"
+            f"<p>Durations marked xN are N times slower than the fastest cell for that test.</p>"
+            f"<table border='1' cellpadding='4'><tr><th>Test</th>{header}</tr>{''.join(rows)}"
+            f"<tr><td><b>Total</b></td>{totals}</tr></table></body></html>"
+        )
+
+
+def run_matrix(browsers, launch_profiles, max_workers, out_dir, test_paths, extra_args):
+    """Run every cell with at most max_workers at a time, merge the results and return the cells."""
+    os.makedirs(out_dir, exist_ok=True)
+    cells = [Cell(browser, profile, out_dir) for browser in browsers for profile in launch_profiles]
+    # Each cell is its own pytest process; the threads only wait on them
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(lambda cell: run_cell(cell, test_paths, extra_args), cells))
+
+    merge_junit(cells, os.path.join(out_dir, "matrix.xml"))
+    write_matrix_report(cells, os.path.join(out_dir, "matrix.html"))
+    return cells
+
+
+def main(argv=None):
+    """Run the browser matrix; exits with 1 when any cell failed."""
+    parser = argparse.ArgumentParser(description="Run the suite across browsers and launch profiles at once")
+    parser.add_argument("--browsers", default=get_config("matrix", "browsers", "chrome,firefox,edge"))
+    parser.add_argument("--launch-profiles", default=get_config("matrix", "launch_profiles", "default"))
+    parser.add_argument("--max-workers", type=int, default=int(get_config("matrix", "max_workers", "3")))
+    parser.add_argument("--out", default=get_config("matrix", "output_dir", "matrix_results"))
+    parser.add_argument("--tests", action="append", default=None, help="test file or folder (repeatable)")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER, help="extra pytest arguments after --")
+    args = parser.parse_args(argv)
+
+    extra_args = [a for a in args.pytest_args if a != "--"]
+    test_paths = [os.path.abspath(p) for p in args.tests] if args.tests else \
+        [project_path(os.path.join("tests", "Test_Guvi_Page_automation.py"))]
+    out_dir = project_path(args.out)
+    cells = run_matrix(
+        [b.strip() for b in args.browsers.split(",") if b.strip()],
+        [p.strip() for p in args.launch_profiles.split(",") if p.strip()],
+        args.max_workers, out_dir, test_paths, extra_args,
+    )
+
+    for cell in cells:
+        passed = sum(1 for outcome, _ in cell.results.values() if outcome == "passed")
+        print(f"{cell.name:<25} exit {cell.returncode}  {passed}/{len(cell.results)} passed  {cell.duration:.1f}s")
+    print(f"Matrix report: {os.path.join(out_dir, 'matrix.html')}")
+    return 1 if any(cell.returncode != 0 for cell in cells) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
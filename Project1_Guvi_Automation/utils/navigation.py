@@ -0,0 +1,228 @@
+"""
+navigation.py
+
+Reaches a page by the cheapest route from wherever the browser is.
+
+The pages form a graph whose transitions have a cost ([navigation] in
+config.ini):
+    load  - driver.get() of the page's URL, possible from anywhere (full page load)
+    click - an in-app link, done by the page-object method in CLICKS
+    back  - browser history, to a page visited earlier in this session
+
+The page objects record where the browser goes (visited / went_back) and
+which page had its form filled in (touched), so the planner knows the
+current page and history without extra WebDriver calls. A page whose form
+was used is not reused as is: ensure_on() re-enters it, by going back and
+clicking through if that's cheaper than reloading it.
+
+Example:
+    Signup_Page(driver).ensure_on()          # page objects
+    navigation.ensure_on(driver, "courses")  # pages without a page object
+"""
+import collections
+import heapq
+import importlib
+import logging
+import weakref
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils import conditions as EC, tabs
+from Project1_Guvi_Automation.utils.deadline import BudgetedWait
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Pages of the graph: name -> (config.ini section, key) of the page's URL
+PAGES = {
+    "home": ("guvi", "url"),
+    "login": ("login_guvi", "url"),
+    "signup": ("signup_guvi", "url"),
+    "dashboard": ("dashboard_guvi", "url"),
+    "courses": ("guvi", "course_url"),
+}
+
+# In-app transitions: (from, to) -> (module in pages/, page class, method that clicks through)
+CLICKS = {
+    ("home", "login"): ("home_page", "Home_Page", "click_login_button"),
+    ("home", "signup"): ("home_page", "Home_Page", "click_signup_button"),
+    ("home", "courses"): ("home_page", "Home_Page", "click_courses_menu"),
+    ("signup", "login"): ("signup_page", "Signup_Page", "click_login_signup_page"),
+}
+
+# Browser history as seen by the page objects: driver -> window handle (None for
+# a single window, see utils/tabs.py) -> deque of [page, used]
+_history = weakref.WeakKeyDictionary()
+
+
+def page_url(page):
+    return get_config(*PAGES[page])
+
+
+def _same_url(a, b):
+    a, b = urlsplit(a), urlsplit(b)
+    return (a.netloc, a.path.rstrip("/"), a.query) == (b.netloc, b.path.rstrip("/"), b.query)
+
+
+def page_of(url):
+    """Name of the page at url, or None when it isn't in the graph."""
+    for page in PAGES:
+        if _same_url(url, page_url(page)):
+            return page
+    return None
+
+
+def _entries(driver):
+    windows = _history.setdefault(driver, {})
+    window = tabs.focused(driver)
+    if window not in windows:
+        windows[window] = collections.deque(maxlen=int(get_config("navigation", "history", "10")))
+    return windows[window]
+
+
+def visited(driver, page):
+    """Record that the browser opened page (a load or an in-app click)."""
+    _entries(driver).append([page, False])
+
+
+def went_back(driver, steps=1):
+    """Record steps of browser history back."""
+    history = _entries(driver)
+    for _ in range(min(steps, len(history) - 1)):
+        history.pop()
+
+
+def touched(driver):
+    """Record that the current page's form was filled in or submitted, so it isn't reused as is."""
+    history = _entries(driver)
+    if history:
+        history[-1][1] = True
+
+
+def _current(driver):
+    """Current page, trusting the recorded history only when it agrees with the browser's URL."""
+    history = _entries(driver)
+    try:
+        url = driver.current_url
+    except WebDriverException:
+        url = ""
+    if history and _same_url(url, page_url(history[-1][0])):
+        return history[-1][0]
+    # The browser went somewhere the page objects didn't record: start a new history
+    history.clear()
+    page = page_of(url)
+    if page:
+        history.append([page, False])
+    return page
+
+
+def _costs():
+    return {kind: float(get_config("navigation", f"{kind}_cost", default))
+            for kind, default in (("load", "5"), ("click", "2"), ("back", "1"))}
+
+
+def _edges(page, costs):
+    """Load and click transitions (to, kind, steps, cost) out of page."""
+    for target in PAGES:
+        yield target, "load", 1, costs["load"]
+    for (start, target) in CLICKS:
+        if start == page:
+            yield target, "click", 1, costs["click"]
+
+
+def plan_route(driver, target):
+    """
+    Return (start page, hops, cost) of the cheapest route to target.
+    hops is a list of (page, kind, steps); empty when the browser is already on a fresh target page.
+    """
+    costs = _costs()
+    start = _current(driver)
+    history = list(_entries(driver))
+    if start == target and not history[-1][1]:
+        return start, [], 0.0
+
+    # Dijkstra over the pages; None is an unknown start page (only loads lead away from it).
+    # arrival is the cheapest route ending on target: unlike best[target] it may
+    # leave a used start page and come back to it.
+    best = {start: 0.0}
+    queue = []
+    arrival = (float("inf"), None)
+
+    def reach(page, cost, route):
+        nonlocal arrival
+        if page == target and cost < arrival[0]:
+            arrival = (cost, route)
+        if cost < best.get(page, float("inf")):
+            best[page] = cost
+            heapq.heappush(queue, (cost, len(route), page, route))
+
+    # Back edges: k steps back through the recorded history, never onto a page whose form was used
+    for k, (page, used) in enumerate(reversed(history[:-1]), start=1):
+        if not used:
+            reach(page, k * costs["back"], [(page, "back", k)])
+
+    heapq.heappush(queue, (0.0, 0, start, []))
+    while queue:
+        cost, _, page, hops = heapq.heappop(queue)
+        if cost > best[page]:
+            continue
+        for to, kind, steps, step_cost in _edges(page, costs):
+            reach(to, cost + step_cost, hops + [(to, kind, steps)])
+
+    return start, arrival[1], arrival[0]
+
+
+def _load(driver, page):
+    url = page_url(page)
+    driver.get(url)
+    BudgetedWait(driver, 30).until(EC.url_to_be(url))
+    visited(driver, page)
+
+
+def _back(driver, page, steps):
+    for _ in range(steps):
+        driver.back()
+    BudgetedWait(driver, 30).until(EC.url_to_be(page_url(page)))
+    went_back(driver, steps)
+
+
+def _click(driver, start, page):
+    module, cls, method = CLICKS[(start, page)]
+    page_class = getattr(importlib.import_module(f"Project1_Guvi_Automation.pages.{module}"), cls)
+    getattr(page_class(driver), method)()
+
+
+def ensure_on(driver, target):
+    """
+    Bring the browser to target by the cheapest route. When a step of the route
+    lands somewhere unexpected the target is loaded directly instead.
+    """
+    start, hops, cost = plan_route(driver, target)
+    if not hops:
+        logger.info(f"Already on the {target} page")
+        return
+    logger.info(f"Route to the {target} page (cost {cost:g}): "
+                + " -> ".join([start or "?"] + [f"{page} ({kind}{' x%d' % steps if steps > 1 else ''})"
+                                                for page, kind, steps in hops]))
+
+    page = start
+    try:
+        for to, kind, steps in hops:
+            if kind == "load":
+                _load(driver, to)
+            elif kind == "back":
+                _back(driver, to, steps)
+            else:
+                _click(driver, page, to)
+            if not _same_url(driver.current_url, page_url(to)):
+                raise AssertionError(f"expected the {to} page, got {driver.current_url}")
+            page = to
+    except (AssertionError, TimeoutException) as e:
+        logger.warning(f"Route to the {target} page failed at {page} ({e}), loading it directly")
+        try:
+            _load(driver, target)
+        except TimeoutException as e:
+            logger.error(f"Failed to navigate to the {target} page: {e}")
+            raise AssertionError(f"Failed to navigate to the {target} page: {e}")
@@ -0,0 +1,207 @@
+"""
+network_profiles.py
+
+Named network conditions for running the user journeys on slow connections.
+
+Profiles are defined in config.ini [network_profiles] as
+    name = latency_ms, download_kbps, upload_kbps     (or "offline")
+and applied per test:
+    - Chromium browsers (Chrome, Edge) through the DevTools protocol
+      (Network.emulateNetworkConditions), which throttles every request
+    - otherwise, when the run uses the local stand-in site, by the site itself:
+      ThrottledSite delays each answer by the latency and writes the body at
+      the download rate ("offline" drops the connection)
+
+A test picks a profile with @pytest.mark.network_profile("3g"), a run with
+pytest --network-profile slow_4g. The step timings of the tests are saved per
+profile in [network] timings_path, merged with earlier runs, so the profiles
+can be compared:
+    python -m Project1_Guvi_Automation.utils.network_profiles
+"""
+import argparse
+import collections
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from configparser import ConfigParser
+
+from Project1_Guvi_Automation.config_reader import artifact_path, get_config, project_path
+from Project1_Guvi_Automation.utils.standin_site import StandInSite
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+NetworkProfile = collections.namedtuple("NetworkProfile", "name offline latency_ms download_kbps upload_kbps")
+
+# Chunks per second the stand-in site writes a throttled body in
+WRITES_PER_SECOND = 10
+
+
+def profile_names():
+    config = ConfigParser()
+    config.read(project_path("config.ini"))
+    return config.options("network_profiles") if config.has_section("network_profiles") else []
+
+
+def load_profile(name):
+    """Return the NetworkProfile of config.ini [network_profiles] name."""
+    try:
+        value = get_config("network_profiles", name)
+    except KeyError:
+        raise ValueError(f"Unknown network profile {name!r}, configured: {', '.join(profile_names())}")
+    if value.strip().lower() == "offline":
+        return NetworkProfile(name, True, 0, 0, 0)
+    try:
+        latency, download, upload = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError(f"Network profile {name} must be 'latency_ms, download_kbps, upload_kbps' or 'offline': {value!r}")
+    return NetworkProfile(name, False, latency, download, upload)
+
+
+def _bytes_per_second(kbps):
+    # DevTools takes bytes per second, -1 meaning unthrottled
+    return kbps * 1000 / 8 if kbps > 0 else -1
+
+
+def emulate_in_browser(driver, profile):
+    """Throttle a Chromium browser through the DevTools protocol; None clears the emulation."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    if profile is None:
+        conditions = {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+    else:
+        conditions = {
+            "offline": profile.offline,
+            "latency": profile.latency_ms,
+            "downloadThroughput": _bytes_per_second(profile.download_kbps),
+            "uploadThroughput": _bytes_per_second(profile.upload_kbps),
+        }
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", conditions)
+
+
+class ThrottledSite(StandInSite):
+    """
+    Stand-in site answering like a slow network: the latency before every answer and
+    the body written at the download rate of the current profile (None = full speed).
+    Uploads are not throttled, the stand-in pages only receive GET requests.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = None
+
+    def accept_request(self):
+        return not (self.profile and self.profile.offline)
+
+    def delay_request(self):
+        if self.profile and self.profile.latency_ms:
+            time.sleep(self.profile.latency_ms / 1000)
+
+    def write_body(self, stream, body):
+        rate = self.profile and _bytes_per_second(self.profile.download_kbps)
+        if not rate or rate < 0:
+            stream.write(body)
+            return
+        chunk = max(1, int(rate / WRITES_PER_SECOND))
+        for start in range(0, len(body), chunk):
+            part = body[start:start + chunk]
+            stream.write(part)
+            stream.flush()
+            time.sleep(len(part) / rate)
+
+
+def apply(profile, driver=None, site=None):
+    """
+    Emulate profile for the browser driver, else through the stand-in site.
+    Returns a function that clears the emulation, or None when neither can emulate it.
+    """
+    if driver is not None and hasattr(driver, "execute_cdp_cmd"):
+        emulate_in_browser(driver, profile)
+        logger.info(f"Network profile {profile.name} emulated through DevTools")
+        return lambda: emulate_in_browser(driver, None)
+    if isinstance(site, ThrottledSite):
+        site.profile = profile
+        logger.info(f"Network profile {profile.name} emulated by the stand-in site")
+        return lambda: setattr(site, "profile", None)
+    logger.warning(f"Network profile {profile.name} not applied: needs a Chromium browser or --standin-site")
+    return None
+
+
+# ----------------- TIMINGS ------------------------
+
+def save_timings(timings, path=None):
+    """
+    Merge {profile: {step: [seconds, ...]}} of this run into the timings file.
+    The last [network] keep_runs values are kept per profile and step.
+    """
+    path = path or artifact_path(get_config("network", "timings_path", "network_timings.json"))
+    keep = int(get_config("network", "keep_runs", "20"))
+    data = load_timings(path)
+    for profile, steps in timings.items():
+        for step, seconds in steps.items():
+            merged = data.setdefault(profile, {}).setdefault(step, []) + list(seconds)
+            data[profile][step] = merged[-keep:]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+    return path
+
+
+def load_timings(path=None):
+    path = path or artifact_path(get_config("network", "timings_path", "network_timings.json"))
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def summary(steps):
+    """One line per step: median duration of the test's steps, e.g. for a report section."""
+    durations = collections.defaultdict(list)
+    for step in steps:
+        if step.duration is not None:
+            durations[step.name].append(step.duration)
+    return "\n".join(f"{name:<50}{statistics.median(seconds):>8.3f}s  x{len(seconds)}"
+                     for name, seconds in durations.items())
+
+
+def print_comparison(data, steps=None):
+    """Median seconds of every step under every profile, one column per profile."""
+    profiles = sorted(data)
+    names = sorted({step for timings in data.values() for step in timings})
+    if steps:
+        names = [name for name in names if any(wanted in name for wanted in steps)]
+    print(f"{'step':<50}" + "".join(f"{profile:>14}" for profile in profiles))
+    for name in names:
+        cells = []
+        for profile in profiles:
+            seconds = data[profile].get(name)
+            cells.append(f"{statistics.median(seconds):>13.3f}s" if seconds else f"{'-':>14}")
+        print(f"{name:<50}" + "".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the page-object step timings per network profile")
+    parser.add_argument("steps", nargs="*", help="only steps whose name contains one of these, e.g. navigate_to_url")
+    parser.add_argument("--path", default=None, help="timings file (default: [network] timings_path)")
+    parser.add_argument("--list", action="store_true", help="list the configured profiles")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in profile_names():
+            print(load_profile(name))
+        return 0
+    data = load_timings(args.path)
+    if not data:
+        print("No timings recorded yet: run pytest with --network-profile or network_profile markers")
+        return 1
+    print_comparison(data, args.steps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
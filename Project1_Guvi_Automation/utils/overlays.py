@@ -0,0 +1,177 @@
+"""
+overlays.py
+
+Hides the overlays that intercept clicks on the GUVI pages.
+
+The Dobby auto pop-up, cookie banners and promo modals can cover the Login,
+Sign up and menu elements; a click on them then lands on the overlay and the
+page-object wait spins until it times out. suppress() registers a script
+that runs at the start of every document the tab loads (DevTools
+Page.addScriptToEvaluateOnNewDocument, Chromium browsers only) and in the
+current document. The script adds a style making the config.ini [overlays]
+selectors invisible and transparent to clicks, and counts in the tab's
+sessionStorage (per site)
+    hidden - overlays that appeared and were hidden
+    clicks - clicks that landed on a hidden overlay, i.e. would have been intercepted
+
+Tests that need an overlay (TC9 and the Dobby widget) are marked
+@pytest.mark.keep_overlays; conftest.py calls release() for them.
+"""
+import json
+import logging
+import weakref
+
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils import tabs
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# sessionStorage key of the counts
+STORAGE_KEY = "overlaySuppression"
+
+# Installs the suppression in a document; called with the list of CSS selectors
+SUPPRESS_JS = """
+(function (selectors) {
+    if (window.__overlaySuppression) return;
+    var KEY = "%s";
+    var style = document.createElement("style");
+    style.setAttribute("data-overlay-suppression", "");
+    style.textContent = selectors.map(function (selector) {
+        return selector + ", " + selector + " * { visibility: hidden !important; pointer-events: none !important; }";
+    }).join("\\n");
+
+    var seen = new WeakSet(), hidden = [];
+    function count(selector, field) {
+        try {
+            var counts = JSON.parse(sessionStorage.getItem(KEY) || "{}");
+            var entry = counts[selector] = counts[selector] || {hidden: 0, clicks: 0};
+            entry[field] += 1;
+            sessionStorage.setItem(KEY, JSON.stringify(counts));
+        } catch (e) {}  // no storage in about:blank and sandboxed frames
+    }
+    function scan(root) {
+        selectors.forEach(function (selector) {
+            var found = root.matches && root.matches(selector) ? [root] : [];
+            found.push.apply(found, root.querySelectorAll ? root.querySelectorAll(selector) : []);
+            found.forEach(function (el) {
+                if (seen.has(el)) return;
+                seen.add(el);
+                hidden.push([el, selector]);
+                count(selector, "hidden");
+            });
+        });
+    }
+    // A click inside the box of a hidden overlay is one the overlay would have intercepted
+    function onClick(event) {
+        for (var i = 0; i < hidden.length; i++) {
+            if (!hidden[i][0].isConnected) continue;
+            var r = hidden[i][0].getBoundingClientRect();
+            if (r.width && r.height && event.clientX >= r.left && event.clientX <= r.right
+                    && event.clientY >= r.top && event.clientY <= r.bottom) {
+                count(hidden[i][1], "clicks");
+                return;
+            }
+        }
+    }
+    var observer = new MutationObserver(function (mutations) {
+        mutations.forEach(function (m) {
+            m.addedNodes.forEach(function (node) { if (node.nodeType === 1) scan(node); });
+        });
+        if (!style.isConnected && document.documentElement) {
+            (document.head || document.documentElement).appendChild(style);
+        }
+    });
+    // At document start there may be no <html> yet: the observer adds the style once there is
+    observer.observe(document, {childList: true, subtree: true});
+    if (document.documentElement) {
+        (document.head || document.documentElement).appendChild(style);
+        scan(document.documentElement);
+    }
+    window.addEventListener("click", onClick, true);
+
+    window.__overlaySuppression = {
+        restore: function () {
+            observer.disconnect();
+            style.remove();
+            window.removeEventListener("click", onClick, true);
+            window.__overlaySuppression = null;
+        }
+    };
+})(%s);
+"""
+
+RESTORE_JS = "if (window.__overlaySuppression) window.__overlaySuppression.restore();"
+
+TAKE_COUNTS_JS = """
+try {
+    var counts = JSON.parse(sessionStorage.getItem(arguments[0]) || "{}");
+    sessionStorage.removeItem(arguments[0]);
+    return counts;
+} catch (e) {
+    return {};
+}
+"""
+
+# driver -> {(session id, window handle): identifier of the new-document script}
+_installed = weakref.WeakKeyDictionary()
+
+# Drivers already warned that they can't suppress overlays
+_unsupported = weakref.WeakSet()
+
+
+def configured_selectors():
+    """CSS selectors of config.ini [overlays] selectors (comma-separated)."""
+    return [selector.strip() for selector in get_config("overlays", "selectors", "").split(",") if selector.strip()]
+
+
+def script(selectors):
+    return SUPPRESS_JS % (STORAGE_KEY, json.dumps(selectors))
+
+
+def suppress(driver, selectors=None):
+    """
+    Hide the overlays in driver's current tab: in the current document and every one loaded from now on.
+    Returns False when the browser can't run scripts at document start (not Chromium).
+    """
+    selectors = configured_selectors() if selectors is None else selectors
+    if not hasattr(driver, "execute_cdp_cmd"):
+        if driver not in _unsupported:
+            _unsupported.add(driver)
+            logger.warning("Overlays not suppressed: needs a Chromium browser (Chrome, Edge)")
+        return False
+    installed = _installed.setdefault(driver, {})
+    key = (driver.session_id, tabs.focused(driver))
+    if key in installed:
+        return True
+
+    source = script(selectors)
+    installed[key] = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+    driver.execute_script(source)
+    logger.info(f"Suppressing {len(selectors)} overlay selectors in window {key[1] or 'main'}")
+    return True
+
+
+def release(driver):
+    """Stop suppressing overlays in driver's current tab, showing those of the current document again."""
+    identifier = _installed.get(driver, {}).pop((driver.session_id, tabs.focused(driver)), None)
+    if identifier is not None:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+        logger.info("Overlay suppression released")
+    restore(driver)
+
+
+def restore(driver):
+    """Show the overlays of the current document again; later documents of the tab are still suppressed."""
+    driver.execute_script(RESTORE_JS)
+
+
+def take_counts(driver):
+    """Return and reset {selector: {"hidden": n, "clicks": n}} counted by the current site in the tab."""
+    return driver.execute_script(TAKE_COUNTS_JS, STORAGE_KEY) or {}
+
+
+def summary(counts):
+    """Text of take_counts() for a report section."""
+    return "\n".join(f"{selector:<50}hidden {c['hidden']:>3}  clicks unblocked {c['clicks']:>3}"
+                     for selector, c in sorted(counts.items()))
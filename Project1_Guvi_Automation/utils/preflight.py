@@ -0,0 +1,327 @@
+"""
+preflight.py
+
+Environment health check run before any browser is launched.
+
+The checks run concurrently and the whole stage is bounded by [preflight]
+timeout, so a broken environment stops the session within about a second
+with one consolidated diagnosis instead of every test timing out in turn.
+A URL that is merely slow (still loading when the stage ends, or slower than
+[preflight] url_timeout) is a warning, not an error: the tests' own waits are
+much longer than the stage.
+    config  - every config.ini section/key the page objects and tests read
+              without a default (found by parsing their source)
+    url     - reachability and TLS certificate of every configured URL
+    browser - the browser is installed and a matching driver is cached or
+              on PATH (or its download site is reachable for webdriver-manager)
+    disk    - free space for the artifacts (screenshots, screencasts, reports)
+
+conftest.py runs it for every session that executes tests (--no-preflight or
+[preflight] enabled = false turns it off). Standalone:
+    python -m Project1_Guvi_Automation.utils.preflight --browser-name firefox
+"""
+import argparse
+import ast
+import collections
+import http.client
+import json
+import os
+import re
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from Project1_Guvi_Automation.config_reader import PROJECT_DIR, get_config, project_path
+from Project1_Guvi_Automation.utils import navigation
+
+# One line of the diagnosis; level is ok, warning or error
+Finding = collections.namedtuple("Finding", "check level message")
+
+# Source folders whose get_config() calls must be satisfied by config.ini
+CONFIG_SOURCES = ("pages", "tests", "conftest.py")
+
+# Artifact folders that need free space: (config.ini section, key, default)
+ARTIFACT_DIRS = (
+    ("visual_diff", "screenshots_dir", "screenshots"),
+    ("visual_diff", "diff_dir", "visual_diffs"),
+    ("screencast", "output_dir", "screencasts"),
+    ("action_trace", "output_dir", "traces"),
+)
+
+# browser -> (driver binary, webdriver-manager browser type, host the driver is downloaded from)
+BROWSERS = {
+    "chrome": ("chromedriver", "google-chrome", "googlechromelabs.github.io"),
+    "firefox": ("geckodriver", "firefox", "api.github.com"),
+    "edge": ("msedgedriver", "edge", "msedgedriver.azureedge.net"),
+}
+
+VERSION = re.compile(r"(\d+)\.\d+(?:\.\d+)*")
+
+
+# ----------------- CONFIG ------------------------
+
+def required_settings(sources=CONFIG_SOURCES):
+    """
+    Return {(section, key): "file:line"} of the get_config() calls with literal
+    arguments and no fallback, plus the page URLs of the navigation graph.
+    """
+    paths = []
+    for source in sources:
+        path = os.path.join(PROJECT_DIR, source)
+        if os.path.isdir(path):
+            paths += [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".py")]
+        elif os.path.exists(path):
+            paths.append(path)
+
+    settings = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) == "get_config"):
+                continue
+            if len(node.args) != 2 or node.keywords:
+                continue
+            if all(isinstance(arg, ast.Constant) and isinstance(arg.value, str) for arg in node.args):
+                where = f"{os.path.relpath(path, PROJECT_DIR)}:{node.lineno}"
+                settings.setdefault((node.args[0].value, node.args[1].value), where)
+
+    for page, setting in navigation.PAGES.items():
+        settings.setdefault(setting, f"utils/navigation.py ({page} page)")
+    return settings
+
+
+def check_config():
+    missing = collections.defaultdict(list)
+    for (section, key), where in sorted(required_settings().items()):
+        try:
+            get_config(section, key)
+        except KeyError:
+            missing[section].append(f"{key} ({where})")
+    if missing:
+        return [Finding("config", "error", f"config.ini [{section}] is missing " + ", ".join(keys))
+                for section, keys in missing.items()]
+    return [Finding("config", "ok", "config.ini has every setting the page objects and tests read")]
+
+
+# ----------------- URLS ------------------------
+
+def configured_urls():
+    """Distinct URLs of the navigation graph and the other url settings the tests read."""
+    urls = {navigation.page_url(page) for page in navigation.PAGES}
+    for (section, key) in required_settings():
+        if key == "url" or key.endswith("_url"):
+            try:
+                urls.add(get_config(section, key))
+            except KeyError:
+                pass        # reported by check_config
+    return sorted(urls)
+
+
+def check_url(url, timeout):
+    """One request to url: the server answers, and for https the certificate is valid and not about to expire."""
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    if parts.scheme == "https":
+        connection = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout,
+                                                 context=ssl.create_default_context())
+    else:
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.connect()
+        days_left = None
+        if parts.scheme == "https":
+            expires = ssl.cert_time_to_seconds(connection.sock.getpeercert()["notAfter"])
+            days_left = int((expires - time.time()) // 86400)
+        # GET rather than HEAD, which some servers reject; only the status line is read
+        connection.request("GET", path, headers={"User-Agent": "Mozilla/5.0 (preflight)"})
+        status = connection.getresponse().status
+    except ssl.SSLCertVerificationError as e:
+        return [Finding("url", "error", f"{url}: TLS certificate rejected ({e.verify_message})")]
+    except socket.timeout:
+        return [Finding("url", "warning", f"{url}: no answer within {timeout:g}s, slow to answer")]
+    except (OSError, http.client.HTTPException) as e:
+        return [Finding("url", "error", f"{url}: unreachable ({e or type(e).__name__})")]
+    finally:
+        connection.close()
+
+    if status >= 500:
+        return [Finding("url", "error", f"{url}: server error {status}")]
+    findings = [Finding("url", "ok", f"{url}: HTTP {status}")]
+    warn_days = int(get_config("preflight", "cert_warn_days", "14"))
+    if days_left is not None and days_left < warn_days:
+        findings.append(Finding("url", "warning", f"{url}: TLS certificate expires in {days_left} days"))
+    return findings
+
+
+# ----------------- BROWSER AND DRIVER ------------------------
+
+def _version(command, timeout):
+    """Major version printed by "command --version", or None."""
+    try:
+        output = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=timeout).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION.search(output)
+    return int(match.group(1)) if match else None
+
+
+def _cached_drivers(driver_name):
+    """Driver binaries downloaded earlier by webdriver-manager."""
+    from webdriver_manager.core.driver_cache import DriverCacheManager
+    try:
+        entries = DriverCacheManager().load_metadata_content().values()
+    except (OSError, ValueError):
+        return []
+    return [entry["binary_path"] for entry in entries
+            if os.path.basename(entry.get("binary_path", "")).startswith(driver_name)
+            and os.path.exists(entry["binary_path"])]
+
+
+def _host_reachable(host, timeout):
+    try:
+        socket.create_connection((host, 443), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
+def check_browser(browser_name, timeout):
+    browser = browser_name.lower()
+    if browser not in BROWSERS:
+        return [Finding("browser", "error", f"unsupported browser {browser_name!r}")]
+    driver_name, browser_type, download_host = BROWSERS[browser]
+
+    from webdriver_manager.core.os_manager import OperationSystemManager
+    browser_version = OperationSystemManager().get_browser_version_from_os(browser_type)
+    if not browser_version:
+        return [Finding("browser", "error", f"{browser} is not installed (no version found)")]
+    major = int(VERSION.search(browser_version).group(1))
+
+    drivers = {}
+    for path in filter(None, [shutil.which(driver_name), *_cached_drivers(driver_name)]):
+        drivers[path] = _version(path, timeout)
+    # geckodriver has its own version numbers: any working one can drive the installed Firefox
+    matching = [path for path, version in drivers.items()
+                if version is not None and (browser == "firefox" or version == major)]
+    if matching:
+        return [Finding("browser", "ok", f"{browser} {browser_version} with {matching[0]}")]
+
+    found = ", ".join(f"{path} ({version or 'not runnable'})" for path, version in drivers.items())
+    message = f"no {driver_name} for {browser} {major}" + (f" (found {found})" if found else "")
+    if _host_reachable(download_host, timeout):
+        return [Finding("browser", "warning", f"{message}; it will be downloaded at launch")]
+    return [Finding("browser", "error", f"{message} and {download_host} is unreachable to download it")]
+
+
+# ----------------- DISK ------------------------
+
+def check_disk():
+    min_free_mb = float(get_config("preflight", "min_free_mb", "500"))
+    folders = {PROJECT_DIR}
+    for section, key, default in ARTIFACT_DIRS:
+        folder = project_path(get_config(section, key, default))
+        # A folder created on first use: its parent must have the space
+        while not os.path.exists(folder):
+            folder = os.path.dirname(folder)
+        folders.add(folder)
+
+    findings, seen = [], set()
+    for folder in sorted(folders):
+        device = os.stat(folder).st_dev
+        if not os.access(folder, os.W_OK):
+            findings.append(Finding("disk", "error", f"{folder} is not writable"))
+        if device in seen:
+            continue
+        seen.add(device)
+        free_mb = shutil.disk_usage(folder).free / 2 ** 20
+        if free_mb < min_free_mb:
+            findings.append(Finding("disk", "error", f"only {free_mb:.0f} MB free for {folder} "
+                                                     f"(at least {min_free_mb:.0f} MB needed for artifacts)"))
+        else:
+            findings.append(Finding("disk", "ok", f"{free_mb:.0f} MB free for {folder}"))
+    return findings
+
+
+# ----------------- RUN ------------------------
+
+def run_checks(browser_name=None, timeout=None):
+    """
+    Run every check concurrently and return their findings.
+    browser_name None skips the browser check (sessions without browser tests).
+    A check still running after timeout seconds is reported as an error, except a URL check:
+    the server is slow to answer, which is a warning.
+    """
+    if timeout is None:
+        timeout = float(get_config("preflight", "timeout", "1"))
+    # Socket timeout of a URL check, independent of the stage budget
+    url_timeout = float(get_config("preflight", "url_timeout", "10"))
+    checks = {"config": (check_config,), "disk": (check_disk,)}
+    for url in configured_urls():
+        checks[f"url {url}"] = (check_url, url, url_timeout)
+    if browser_name:
+        checks[f"browser {browser_name}"] = (check_browser, browser_name, timeout)
+
+    results = {}
+
+    def run(name, function, *args):
+        try:
+            results[name] = function(*args)
+        except Exception as e:
+            results[name] = [Finding(name.split()[0], "error", f"{name}: check failed ({e!r})")]
+
+    # Daemon threads: a check hanging on DNS or a socket must not delay the exit of an aborted session
+    threads = [threading.Thread(target=run, args=(name, *check), name=f"preflight {name}", daemon=True)
+               for name, check in checks.items()]
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    findings = []
+    for name in checks:
+        if name in results:
+            findings += results[name]
+        elif name.startswith("url "):
+            findings.append(Finding("url", "warning", f"{name[4:]}: still loading after {timeout:g}s, slow to answer"))
+        else:
+            findings.append(Finding(name.split()[0], "error", f"{name}: no answer within {timeout:g}s"))
+    return findings
+
+
+def diagnosis(findings):
+    """Text of the findings, errors first."""
+    order = {"error": 0, "warning": 1, "ok": 2}
+    return "\n".join(f"  {finding.level.upper():<8}{finding.check:<9}{finding.message}"
+                     for finding in sorted(findings, key=lambda f: order[f.level]))
+
+
+def failed(findings):
+    return any(finding.level == "error" for finding in findings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the environment before launching browsers")
+    parser.add_argument("--browser-name", default=get_config("browser_name", "browser", "chrome"))
+    parser.add_argument("--no-browser", action="store_true", help="skip the browser and driver check")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds for the whole check")
+    parser.add_argument("--json", action="store_true", help="print the findings as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    findings = run_checks(None if args.no_browser else args.browser_name, args.timeout)
+    if args.json:
+        print(json.dumps([finding._asdict() for finding in findings], indent=2))
+    else:
+        print(f"Pre-flight check ({time.perf_counter() - start:.2f}s):\n{diagnosis(findings)}")
+    return 1 if failed(findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
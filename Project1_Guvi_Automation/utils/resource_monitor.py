@@ -0,0 +1,149 @@
+"""
+resource_monitor.py
+
+CPU and memory of the browser while the tests run.
+
+A background thread samples the process tree of the driver service
+(chromedriver/geckodriver/msedgedriver and every browser process under it)
+and records, per test: resident memory at start and end, peak memory, CPU
+time used and the largest number of processes.
+
+leak_suspected() looks at the memory left after each test of a long-lived
+browser session and flags sessions whose memory grows steadily from test to
+test. Sessions crossing the configured memory threshold are recycled by the
+setup fixture (driver_factory.restart_session).
+"""
+import logging
+import threading
+
+import psutil
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+class TestUsage:
+    """Browser resources used during one test."""
+
+    def __init__(self, nodeid, rss_start):
+        self.nodeid = nodeid
+        self.rss_start = rss_start
+        self.rss_end = rss_start
+        self.rss_peak = rss_start
+        self.cpu_seconds = 0.0
+        self.processes = 0
+
+    def summary(self):
+        return (f"Browser memory {self.rss_start / MB:.0f} -> {self.rss_end / MB:.0f} MB "
+                f"(peak {self.rss_peak / MB:.0f} MB), CPU {self.cpu_seconds:.2f}s, "
+                f"up to {self.processes} processes")
+
+
+class ResourceSampler:
+    """Samples the driver service's process tree every `interval` seconds."""
+
+    def __init__(self, driver, interval=1.0):
+        self.driver = driver
+        self.interval = interval
+        self.history = []        # TestUsage of every finished test of this session
+        self.current = None
+        self.cpu_start = 0.0
+        self.lock = threading.Lock()     # current and _processes, shared with the sampler thread
+        self.stopped = threading.Event()
+        self.thread = None
+        self._processes = {}     # pid -> psutil.Process, reused so cpu_times stay cheap
+
+    def start(self):
+        self.thread = threading.Thread(target=self._sample_loop, name="resource-sampler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def _tree(self):
+        """Driver service process and all its descendants (browser, renderers, GPU, ...)."""
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is None:
+            return []
+        with self.lock:
+            try:
+                root = self._processes.get(process.pid) or psutil.Process(process.pid)
+                tree = [root] + root.children(recursive=True)
+            except psutil.Error:
+                return []
+            self._processes = {p.pid: self._processes.get(p.pid, p) for p in tree}
+            return list(self._processes.values())
+
+    def measure(self):
+        """Return (rss bytes, cpu seconds, process count) of the whole tree right now."""
+        rss = cpu = 0.0
+        processes = self._tree()
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                # Process ended between listing and reading it
+                pass
+        return rss, cpu, len(processes)
+
+    def _sample_loop(self):
+        while not self.stopped.wait(self.interval):
+            rss, _, count = self.measure()
+            with self.lock:
+                if self.current:
+                    self.current.rss_peak = max(self.current.rss_peak, rss)
+                    self.current.processes = max(self.current.processes, count)
+
+    def begin_test(self, nodeid):
+        rss, cpu, count = self.measure()
+        with self.lock:
+            self.current = TestUsage(nodeid, rss)
+            self.current.processes = count
+            self.cpu_start = cpu
+
+    def end_test(self):
+        """Finish the running test and return its TestUsage (None if no test was started)."""
+        rss, cpu, count = self.measure()
+        with self.lock:
+            usage, self.current = self.current, None
+        if usage is None:
+            return None
+        usage.rss_end = rss
+        usage.rss_peak = max(usage.rss_peak, rss)
+        # CPU of processes that exited during the test is not counted
+        usage.cpu_seconds = max(0.0, cpu - self.cpu_start)
+        usage.processes = max(usage.processes, count)
+        self.history.append(usage)
+        return usage
+
+    def reset_history(self):
+        """Forget the previous tests, after the browser was recycled."""
+        self.history = []
+        with self.lock:
+            self._processes = {}
+
+
+def leak_suspected(rss_values, min_tests=4, min_growth_mb=20):
+    """
+    Leak heuristic for the memory left after each test of one browser session.
+    Returns (suspected, growth in MB per test): suspected when there are at least
+    min_tests values, the least-squares slope is at least min_growth_mb per test
+    and memory went up after at least three quarters of the tests.
+    """
+    n = len(rss_values)
+    if n < min_tests:
+        return False, 0.0
+    values = [v / MB for v in rss_values]
+    mean_x, mean_y = (n - 1) / 2, sum(values) / n
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / \
+        sum((x - mean_x) ** 2 for x in range(n))
+    rising = sum(1 for a, b in zip(values, values[1:]) if b > a) / (n - 1)
+    return slope >= min_growth_mb and rising >= 0.75, slope
@@ -0,0 +1,321 @@
+"""
+run_history.py
+
+Stores the outcome of every test run in a local SQLite database so trends can
+be queried across runs (report.html and test_logs.log only describe one run).
+
+Tables:
+    runs    - one row per pytest session with environment metadata
+    results - outcome and duration of every test in a run
+    steps   - per page-object action timings of every test in a run
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.run_history percentiles --days 7
+    python -m Project1_Guvi_Automation.utils.run_history regressions
+    python -m Project1_Guvi_Automation.utils.run_history flaky --runs 30
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    browser TEXT,
+    git_commit TEXT,
+    host TEXT,
+    platform TEXT,
+    python TEXT,
+    selenium TEXT,
+    exit_status INTEGER,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results(nodeid, run_id);
+CREATE INDEX IF NOT EXISTS idx_steps_nodeid ON steps(nodeid, run_id);
+"""
+
+
+def connect(db_path):
+    """Open (and create if needed) the history database."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def environment_metadata():
+    """Collect details of the machine and code the run is executed on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    try:
+        import selenium
+        selenium_version = selenium.__version__
+    except ImportError:
+        selenium_version = None
+
+    return {
+        "git_commit": commit,
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "selenium": selenium_version,
+    }
+
+
+# ---------------------- WRITING ----------------------
+
+class RunRecorder:
+    """
+    Writes a single pytest session into the history database.
+    conftest creates one at session start and feeds it results as tests finish.
+    """
+
+    def __init__(self, db_path, browser, metadata=None):
+        self.conn = connect(db_path)
+        env = environment_metadata()
+        cursor = self.conn.execute(
+            "INSERT INTO runs (started_at, browser, git_commit, host, platform, python, selenium, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.time(), browser, env["git_commit"], env["host"], env["platform"],
+             env["python"], env["selenium"], json.dumps(metadata or {}))
+        )
+        self.run_id = cursor.lastrowid
+        self.conn.commit()
+        logger.info(f"Recording run {self.run_id} into {db_path}")
+
+    def record_result(self, nodeid, outcome, duration, steps=()):
+        """Store the outcome of one test together with its step timings."""
+        self.conn.execute(
+            "INSERT INTO results (run_id, nodeid, outcome, duration, finished_at) VALUES (?, ?, ?, ?, ?)",
+            (self.run_id, nodeid, outcome, duration, time.time())
+        )
+        self.conn.executemany(
+            "INSERT INTO steps (run_id, nodeid, seq, name, depth, duration, ok) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(self.run_id, nodeid, seq, step.name, step.depth, step.duration, int(bool(step.ok)))
+             for seq, step in enumerate(steps)]
+        )
+        # Commit per test so an aborted session still leaves its results behind
+        self.conn.commit()
+
+    def finish(self, exit_status):
+        """Mark the run as finished and close the database."""
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ?, exit_status = ? WHERE id = ?",
+            (time.time(), int(exit_status), self.run_id)
+        )
+        self.conn.commit()
+        self.conn.close()
+
+
+# ---------------------- QUERIES ----------------------
+
+def percentile(values, pct):
+    """Return the pct-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def duration_percentiles(conn, days=7, bucket="day", test=None):
+    """
+    Return p50/p90/p95 test durations per test and per time bucket ('day' or 'week').
+    Only passed tests are used so that timeouts don't distort the trend.
+    """
+    since = time.time() - days * 86400
+    query = ("SELECT nodeid, finished_at, duration FROM results "
+             "WHERE outcome = 'passed' AND finished_at >= ?")
+    params = [since]
+    if test:
+        query += " AND nodeid LIKE ?"
+        params.append(f"%{test}%")
+
+    buckets = defaultdict(list)
+    for nodeid, finished_at, duration in conn.execute(query, params):
+        day = datetime.date.fromtimestamp(finished_at)
+        if bucket == "week":
+            year, week, _ = day.isocalendar()
+            key = f"{year}-W{week:02d}"
+        else:
+            key = day.isoformat()
+        buckets[(nodeid, key)].append(duration)
+
+    rows = []
+    for (nodeid, key), values in sorted(buckets.items()):
+        rows.append({
+            "test": nodeid,
+            "bucket": key,
+            "runs": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p95": percentile(values, 95),
+        })
+    return rows
+
+
+def regressions(conn, baseline_runs=10, factor=1.5, min_delta=1.0, steps=False):
+    """
+    Compare the latest run against the median of the previous baseline_runs runs.
+    A test (or step, when steps=True) regressed when it is more than `factor`
+    times slower than its baseline and at least min_delta seconds slower.
+    """
+    latest = conn.execute("SELECT MAX(run_id) FROM results").fetchone()[0]
+    if latest is None:
+        return []
+
+    if steps:
+        query = ("SELECT run_id, nodeid || ' :: ' || name, duration FROM steps "
+                 "WHERE ok = 1 AND run_id IN (SELECT id FROM runs WHERE id <= ? ORDER BY id DESC LIMIT ?)")
+    else:
+        query = ("SELECT run_id, nodeid, duration FROM results "
+                 "WHERE outcome = 'passed' AND run_id IN (SELECT id FROM runs WHERE id <= ? ORDER BY id DESC LIMIT ?)")
+
+    current = defaultdict(list)
+    history = defaultdict(list)
+    for run_id, name, duration in conn.execute(query, (latest, baseline_runs + 1)):
+        (current if run_id == latest else history)[name].append(duration)
+
+    rows = []
+    for name, values in current.items():
+        if not history.get(name):
+            continue
+        now = percentile(values, 50)
+        baseline = percentile(history[name], 50)
+        if now > baseline * factor and now - baseline >= min_delta:
+            rows.append({
+                "name": name,
+                "baseline_p50": baseline,
+                "latest": now,
+                "ratio": now / baseline if baseline else float("inf"),
+            })
+    return sorted(rows, key=lambda row: row["ratio"], reverse=True)
+
+
+def flake_rates(conn, runs=30):
+    """
+    Return per-test flakiness over the last `runs` runs.
+    flip_rate is the share of consecutive runs in which the outcome changed;
+    same_commit_flips counts pass/fail changes without a code change in between.
+    """
+    query = ("SELECT r.nodeid, r.outcome, runs.git_commit FROM results r "
+             "JOIN runs ON runs.id = r.run_id "
+             "WHERE r.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?) "
+             "AND r.outcome IN ('passed', 'failed') ORDER BY r.run_id")
+    history = defaultdict(list)
+    for nodeid, outcome, commit in conn.execute(query, (runs,)):
+        history[nodeid].append((outcome, commit))
+
+    rows = []
+    for nodeid, outcomes in history.items():
+        flips = same_commit_flips = 0
+        for (previous, previous_commit), (outcome, commit) in zip(outcomes, outcomes[1:]):
+            if outcome != previous:
+                flips += 1
+                if commit and commit == previous_commit:
+                    same_commit_flips += 1
+        failures = sum(1 for outcome, _ in outcomes if outcome == "failed")
+        rows.append({
+            "test": nodeid,
+            "runs": len(outcomes),
+            "fail_rate": failures / len(outcomes),
+            "flip_rate": flips / (len(outcomes) - 1) if len(outcomes) > 1 else 0.0,
+            "same_commit_flips": same_commit_flips,
+        })
+    return sorted(rows, key=lambda row: (row["flip_rate"], row["fail_rate"]), reverse=True)
+
+
+# ---------------------- CLI ----------------------
+
+def _print_table(rows):
+    """Print a list of dicts as an aligned text table."""
+    if not rows:
+        print("No data")
+        return
+    columns = list(rows[0])
+
+    def cell(value):
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+    widths = {c: max(len(c), *(len(cell(row[c])) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(cell(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main(argv=None):
+    """Command line entry point for querying the run history."""
+    from Project1_Guvi_Automation.config_reader import get_config, project_path
+
+    parser = argparse.ArgumentParser(description="Query the test run history database")
+    parser.add_argument("--db", default=get_config("run_history", "db_path", "test_history.db"))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("percentiles", help="duration percentiles per test over time")
+    p.add_argument("--days", type=int, default=7)
+    p.add_argument("--bucket", choices=["day", "week"], default="day")
+    p.add_argument("--test", help="substring of the test node id")
+
+    r = sub.add_parser("regressions", help="latest run compared with a rolling baseline")
+    r.add_argument("--baseline-runs", type=int, default=int(get_config("run_history", "baseline_runs", "10")))
+    r.add_argument("--factor", type=float, default=float(get_config("run_history", "regression_factor", "1.5")))
+    r.add_argument("--min-delta", type=float, default=1.0, help="minimum slowdown in seconds")
+    r.add_argument("--steps", action="store_true", help="compare page-object steps instead of tests")
+
+    f = sub.add_parser("flaky", help="flake rates per test")
+    f.add_argument("--runs", type=int, default=30)
+
+    args = parser.parse_args(argv)
+    conn = connect(project_path(args.db))
+
+    if args.command == "percentiles":
+        rows = duration_percentiles(conn, args.days, args.bucket, args.test)
+    elif args.command == "regressions":
+        rows = regressions(conn, args.baseline_runs, args.factor, args.min_delta, args.steps)
+    else:
+        rows = flake_rates(conn, args.runs)
+
+    _print_table(rows)
+    conn.close()
+    # Non-zero exit status lets CI fail on regressions
+    return 1 if args.command == "regressions" and rows else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+screencast.py
+
+Low-rate screencast kept in a fixed-size in-memory ring buffer.
+
+A background thread grabs a JPEG frame through the Chrome DevTools Protocol
+(Page.captureScreenshot) a few times per second and keeps only the last N
+seconds of frames. When a test fails the frames are written to disk as a
+video; when it passes they are simply dropped, without touching the disk.
+
+Output is an .mp4 when ffmpeg is on the PATH, otherwise a Motion-JPEG file
+(.mjpeg, playable with VLC or ffplay).
+
+The driver is not thread-safe, so while recording every command of the
+driver (the test's and the captures) goes through one lock: a frame is
+grabbed between two commands of the test, never in the middle of one.
+
+Only Chromium browsers (Chrome, Edge) expose the DevTools Protocol; for the
+others the recorder stays idle.
+"""
+import base64
+import collections
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class ScreencastRecorder:
+    """
+    Ring buffer of the last `seconds` of frames of a browser, captured at `fps`.
+    Call start() once per browser, flush() after a failed test, discard() after
+    a passed one and stop() before quitting the browser.
+    """
+
+    def __init__(self, driver, fps=2, seconds=10, quality=50):
+        self.driver = driver
+        self.fps = fps
+        self.quality = quality
+        self.frames = collections.deque(maxlen=max(1, int(fps * seconds)))
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.command_lock = threading.Lock()
+        self._execute = None      # command executor's own execute wrapper, restored by stop()
+        self._serialising = False
+
+    @property
+    def supported(self):
+        return hasattr(self.driver, "execute_cdp_cmd")
+
+    def start(self):
+        if not self.supported:
+            logger.info("Screencast needs a Chromium browser, recording disabled")
+            return self
+        self._serialise_commands()
+        self.thread = threading.Thread(target=self._record, name="screencast", daemon=True)
+        self.thread.start()
+        logger.info(f"Screencast recording at {self.fps} fps, last {self.frames.maxlen} frames kept")
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        self._restore_commands()
+        self.discard()
+
+    def _serialise_commands(self):
+        """Send every command of the driver through command_lock, until stop()."""
+        executor = self.driver.command_executor
+        # Restored by stop() when another wrapper (utils/command_trace.py) was there first
+        execute = self._execute = vars(executor).get("execute")
+        if execute is None:
+            execute = executor.execute
+
+        def serialised_execute(command, params):
+            with self.command_lock:
+                return execute(command, params)
+
+        executor.execute = serialised_execute
+        self._serialising = True
+
+    def _restore_commands(self):
+        if not self._serialising:
+            return
+        executor = self.driver.command_executor
+        if self._execute is not None:
+            executor.execute = self._execute
+        elif "execute" in vars(executor):
+            del executor.execute
+        self._execute = None
+        self._serialising = False
+
+    def _record(self):
+        interval = 1.0 / self.fps
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            try:
+                data = self.driver.execute_cdp_cmd(
+                    "Page.captureScreenshot", {"format": "jpeg", "quality": self.quality}
+                )["data"]
+                with self.lock:
+                    self.frames.append((time.time(), base64.b64decode(data)))
+            except WebDriverException as e:
+                # Alert open, page navigating, browser closing: skip this frame
+                logger.debug(f"Screencast frame skipped: {e.msg}")
+            self.stopped.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def discard(self):
+        """Drop the buffered frames (test passed)."""
+        with self.lock:
+            self.frames.clear()
+
+    def flush(self, folder, name):
+        """
+        Write the buffered frames of a failed test to folder and return the file path,
+        or None when there are no frames.
+        """
+        with self.lock:
+            frames = list(self.frames)
+            self.frames.clear()
+        if not frames:
+            return None
+
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, re.sub(r"[^\w.-]+", "_", name))
+        duration = frames[-1][0] - frames[0][0]
+        # Play at the rate the frames were actually captured
+        rate = (len(frames) - 1) / duration if duration > 0 else self.fps
+
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            path = base + ".mp4"
+            result = subprocess.run(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "image2pipe", "-c:v", "mjpeg",
+                 "-framerate", f"{rate:.3f}", "-i", "-", "-pix_fmt", "yuv420p",
+                 "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", path],
+                input=b"".join(frame for _, frame in frames), capture_output=True,
+            )
+            if result.returncode == 0:
+                logger.info(f"Screencast of {len(frames)} frames ({duration:.1f}s) saved: {path}")
+                return path
+            logger.warning(f"ffmpeg failed, saving Motion-JPEG instead: {result.stderr.decode(errors='replace')}")
+
+        path = base + ".mjpeg"
+        with open(path, "wb") as f:
+            for _, frame in frames:
+                f.write(frame)
+        logger.info(f"Screencast of {len(frames)} frames ({duration:.1f}s) saved: {path}")
+        return path
@@ -0,0 +1,271 @@
+"""
+soak.py
+
+Soak / endurance mode: loops the user journeys (utils/journeys.py) on
+long-lived browser sessions for a long time and reports, per time window:
+    - journeys per minute and error rate (with the error types)
+    - p50/p95/p99 latency of every journey and every page-object step
+    - driver/browser restarts and the browsers' memory (when psutil is installed)
+
+Each window is appended as a JSON line to the output file and printed as a
+row, so slow memory creep or growing tail latency shows up as a trend.
+A session whose browser died is restarted and counted; after any other
+journey failure the cookies are cleared and the session goes on.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.soak --minutes 240 --sessions 2
+    python -m Project1_Guvi_Automation.utils.soak --minutes 10 --window 60 --standin-site
+"""
+import argparse
+import collections
+import json
+import logging
+import sys
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from Project1_Guvi_Automation.config_reader import get_config, project_path
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils.driver_factory import create_driver
+from Project1_Guvi_Automation.utils.histogram import LatencyHistogram
+from Project1_Guvi_Automation.utils.journeys import JOURNEYS
+from Project1_Guvi_Automation.utils.standin_site import StandInSite
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class Window:
+    """Everything recorded during one time window."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.journeys = collections.defaultdict(LatencyHistogram)
+        self.steps = collections.defaultdict(LatencyHistogram)
+        self.ok = 0
+        self.failed = 0
+        self.errors = collections.Counter()
+        self.restarts = 0
+
+    def summary(self, ended, browser_rss_mb=None):
+        minutes = max(ended - self.started, 1e-9) / 60
+        total = self.ok + self.failed
+
+        def stats(histograms):
+            return {name: {"count": h.count, "p50": h.percentile(50), "p95": h.percentile(95),
+                           "p99": h.percentile(99), "histogram": h.as_dict()}
+                    for name, h in sorted(histograms.items())}
+
+        return {
+            "window_start": self.started,
+            "window_end": ended,
+            "journeys_per_minute": total / minutes,
+            "ok": self.ok,
+            "failed": self.failed,
+            "error_rate": self.failed / total if total else 0.0,
+            "errors": dict(self.errors),
+            "restarts": self.restarts,
+            "browser_rss_mb": browser_rss_mb,
+            "journeys": stats(self.journeys),
+            "steps": stats(self.steps),
+        }
+
+
+class SoakRecorder:
+    """Collects the journey results of all sessions into the current window."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.window = Window()
+
+    def record(self, journey, ok, duration_ms, steps, error=None):
+        with self.lock:
+            self.window.journeys[journey].record(duration_ms)
+            for step in steps:
+                self.window.steps[step.name].record(step.duration * 1000)
+            if ok:
+                self.window.ok += 1
+            else:
+                self.window.failed += 1
+                self.window.errors[error] += 1
+
+    def restarted(self):
+        with self.lock:
+            self.window.restarts += 1
+
+    def roll(self):
+        """Close the current window and start the next one."""
+        with self.lock:
+            window, self.window = self.window, Window()
+        return window
+
+
+def session_alive(driver):
+    """True when the browser still answers commands."""
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+class SoakSession(threading.Thread):
+    """One long-lived browser looping over the journeys until stopped."""
+
+    def __init__(self, index, browser, headless, journeys, think_time, recorder, stop):
+        super().__init__(name=f"soak-{index}", daemon=True)
+        self.index = index
+        self.browser = browser
+        self.headless = headless
+        self.journeys = journeys
+        self.think_time = think_time
+        self.recorder = recorder
+        self.stopping = stop
+        self.driver = None
+
+    def _start_browser(self):
+        self.driver = create_driver(self.browser, headless=self.headless)
+        self.driver.implicitly_wait(10)
+
+    def run(self):
+        runs = 0
+        try:
+            while not self.stopping.is_set():
+                if self.driver is None:
+                    try:
+                        self._start_browser()
+                    except Exception as e:
+                        logger.error(f"[{self.name}] could not start the browser: {e}")
+                        self.stopping.wait(5)
+                        continue
+
+                name = self.journeys[(runs + self.index) % len(self.journeys)]
+                runs += 1
+                step_timer.begin_test(f"soak:{name}")
+                start = time.perf_counter()
+                error = None
+                try:
+                    JOURNEYS[name](self.driver)
+                except Exception as e:
+                    error = type(e).__name__
+                    logger.warning(f"[{self.name}] journey {name} failed: {e}")
+                self.recorder.record(name, error is None, (time.perf_counter() - start) * 1000,
+                                     step_timer.end_test(), error)
+
+                if error and not session_alive(self.driver):
+                    logger.warning(f"[{self.name}] browser is gone, restarting it")
+                    self._quit()
+                    self.recorder.restarted()
+                elif error:
+                    # Don't let a half-finished journey (still logged in, ...) break the next one
+                    self.driver.delete_all_cookies()
+                if self.think_time:
+                    self.stopping.wait(self.think_time)
+        finally:
+            self._quit()
+
+    def _quit(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+
+def browser_memory_mb(sessions):
+    """Total memory of the sessions' browsers, or None without psutil."""
+    try:
+        from Project1_Guvi_Automation.utils.resource_monitor import MB, ResourceSampler
+    except ImportError:
+        return None
+    return sum(ResourceSampler(s.driver).measure()[0] for s in sessions if s.driver) / MB
+
+
+def print_window(summary):
+    started = time.strftime("%H:%M:%S", time.localtime(summary["window_start"]))
+    latency = "  ".join(f"{name} p50/p95/p99 {s['p50'] or 0:.0f}/{s['p95'] or 0:.0f}/{s['p99'] or 0:.0f} ms"
+                        for name, s in summary["journeys"].items())
+    rss = f"  rss {summary['browser_rss_mb']:.0f} MB" if summary["browser_rss_mb"] is not None else ""
+    print(f"{started}  {summary['journeys_per_minute']:6.1f}/min  errors {summary['error_rate'] * 100:5.1f}%  "
+          f"restarts {summary['restarts']}{rss}  {latency}", flush=True)
+
+
+def print_trend(windows):
+    """Per-step p95 of the first and the last window, to spot creeping latency."""
+    if len(windows) < 2:
+        return
+    first, last = windows[0]["steps"], windows[-1]["steps"]
+    print(f"\n{'step':<45}{'first p95':>12}{'last p95':>12}{'change':>10}")
+    for name in sorted(set(first) & set(last)):
+        before, after = first[name]["p95"], last[name]["p95"]
+        if before:
+            print(f"{name:<45}{before:>10.0f}ms{after:>10.0f}ms{(after / before - 1) * 100:>9.0f}%")
+
+
+def run_soak(minutes, sessions, window_seconds, journeys, think_time, browser, headless, out_path):
+    """Run the soak for the given time and return the list of window summaries."""
+    recorder = SoakRecorder()
+    stop = threading.Event()
+    workers = [SoakSession(i, browser, headless, journeys, think_time, recorder, stop) for i in range(sessions)]
+    for worker in workers:
+        worker.start()
+
+    windows = []
+    end = time.time() + minutes * 60
+    try:
+        with open(out_path, "a", encoding="utf-8") as out:
+            while time.time() < end:
+                time.sleep(min(window_seconds, max(0.0, end - time.time())))
+                rss = browser_memory_mb(workers)
+                summary = recorder.roll().summary(time.time(), rss)
+                windows.append(summary)
+                out.write(json.dumps(summary) + "\n")
+                out.flush()
+                print_window(summary)
+    except KeyboardInterrupt:
+        print("Interrupted, stopping the sessions")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=60)
+    return windows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loop the user journeys on long-lived browser sessions")
+    parser.add_argument("--minutes", type=float, default=float(get_config("soak", "minutes", "60")))
+    parser.add_argument("--sessions", type=int, default=int(get_config("soak", "sessions", "1")))
+    parser.add_argument("--window", type=float, default=float(get_config("soak", "window_seconds", "300")),
+                        help="length of a reporting window in seconds")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help=f"comma separated: {', '.join(JOURNEYS)}")
+    parser.add_argument("--think-time", type=float, default=float(get_config("soak", "think_time", "0")))
+    parser.add_argument("--browser", default=get_config("browser_name", "browser"))
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--standin-site", action="store_true", help="run against the local stand-in site")
+    parser.add_argument("--out", default=get_config("soak", "output_path", "soak_results.jsonl"))
+    args = parser.parse_args(argv)
+
+    journeys = [j.strip() for j in args.journeys.split(",") if j.strip()]
+    unknown = set(journeys) - set(JOURNEYS)
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(sorted(unknown))}")
+
+    def run():
+        return run_soak(args.minutes, args.sessions, args.window, journeys, args.think_time,
+                        args.browser, not args.headed, project_path(args.out))
+
+    if args.standin_site:
+        with StandInSite():
+            windows = run()
+    else:
+        windows = run()
+    print_trend(windows)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+standin_site.py
+
+A small local stand-in for the GUVI pages used by the page objects.
+
+It serves the homepage, sign-in, register and courses pages with the same
+locators as the live site (header links, menu items and dropdowns, the Dobby
+widget and iframe, login/signup forms, the profile dropdown with logout), so
+page objects, benchmarks and the long-running modes can be exercised without
+depending on www.guvi.in.
+
+While a StandInSite is running as a context manager, get_config() returns the
+stand-in URLs instead of the config.ini ones.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.standin_site --port 8000
+"""
+import argparse
+import html
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from Project1_Guvi_Automation.config_reader import get_config, set_config_overrides
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+DROPDOWN_CLASS = "⭐️rwl3jt-0 list-none"
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<header>
+  <a href="/sign-in/">Login</a>
+  <a href="/register/">Sign up</a>
+  <nav>
+    <a class="rwl3jt-0 my-2" href="/courses/?current_tab=paidcourse">Courses</a>
+    <p onclick="openMenu(4)">LIVE Classes</p>
+    <p id="practiceslink" onclick="openMenu(5)">Practice</p>
+  </nav>
+  {dropdowns}
+</header>
+<main><h1>Learn to code in your native language</h1></main>
+<div id="ym-auto-pop-up-content" onclick="openDobby()"
+     style="position:fixed;right:20px;bottom:20px;width:60px;height:60px;background:#1a73e8;color:#fff;cursor:pointer">Dobby</div>
+<script>
+function openMenu(index) {{
+  var menus = document.getElementsByTagName("ul");
+  for (var i = 0; i < menus.length; i++) menus[i].style.display = (i === index) ? "block" : "none";
+}}
+function openDobby() {{
+  if (document.querySelector("iframe[title='chat window']")) return;
+  var frame = document.createElement("iframe");
+  frame.title = "chat window";
+  frame.style.cssText = "position:fixed;right:20px;bottom:90px;width:320px;height:400px";
+  frame.srcdoc = '<div id="chatContainer"><div id="chat-title">{dobby_title}</div></div>';
+  document.body.appendChild(frame);
+}}
+</script>
+</body></html>
+"""
+
+SIGN_IN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Sign In | GUVI</title></head>
+<body>
+<input id="email" type="text">
+<input id="password" type="password">
+<a href="#" onclick="login(); return false;">Login</a>
+<div style="display:none" class="error">Incorrect Email or Password</div>
+<div style="display:none" class="error">Incorrect Email or Password</div>
+<script>
+var valid = {credentials};
+function login() {{
+  var email = document.getElementById("email").value, password = document.getElementById("password").value;
+  if (email === valid.username && password === valid.password) {{
+    location.href = "/courses/?current_tab=myCourses";
+    return;
+  }}
+  document.querySelectorAll(".error").forEach(function (e) {{ e.style.display = "block"; }});
+}}
+</script>
+</body></html>
+"""
+
+REGISTER_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Register | GUVI</title></head>
+<body>
+<div id="step1">
+  <input id="name"><input id="email"><input id="password" type="password"><input id="mobileNumber">
+  <a href="#" onclick="show('step2'); return false;">Sign Up</a>
+</div>
+<div id="step2" style="display:none">
+  <select id="profileDrpDwn"><option value="">Select</option><option value="Looking for a career">Looking for a career</option></select>
+  <select id="degreeDrpDwn"><option value="">Select</option>
+    <option value="B.E. / B.Tech. Computer Science">B.E. / B.Tech. Computer Science</option></select>
+  <input id="year">
+  <button id="details-btn" onclick="show('step3')">Submit</button>
+</div>
+<div id="step3" class="left-head" style="display:none"><h1>Almost Done! Check Your Inbox!</h1></div>
+<a class="login" href="/sign-in/">Login</a>
+<script>
+function show(id) {{
+  ["step1", "step2", "step3"].forEach(function (s) {{ document.getElementById(s).style.display = s === id ? "block" : "none"; }});
+}}
+</script>
+</body></html>
+"""
+
+COURSES_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Courses | GUVI</title></head>
+<body>
+<div id="dropdown_contents" onclick="document.getElementById('profile').style.display='block'">Profile</div>
+<div id="profile" style="display:none">
+  <div id="dropdown_contents">My Courses</div>
+  <div id="dropdown_contents" onclick="location.href='/'">Logout</div>
+</div>
+<h1>Courses</h1>
+</body></html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the stand-in pages; `site` is set on the subclass created per server."""
+    protocol_version = "HTTP/1.1"
+    site = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        if not self.site.accept_request():
+            # Emulated offline network: drop the connection without an answer
+            self.close_connection = True
+            return
+        path = urlsplit(self.path).path
+        pages = self.site.pages()
+        if path in ("/sign-in", "/register", "/courses"):
+            self._send(301, b"", {"Location": path + "/"})
+            return
+        body = pages.get(path)
+        if body is None:
+            self._send(404, b"Not found", {"Content-Type": "text/plain"})
+            return
+        self._send(200, body.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"})
+
+    def _send(self, status, body, headers):
+        self.site.delay_request()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.site.write_body(self.wfile, body)
+
+
+class StandInSite:
+    """
+    Local HTTP server imitating the GUVI pages.
+    Use it as a context manager to start it and point get_config() at it.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        handler = type("StandInHandler", (_Handler,), {"site": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pages(self):
+        """Render the pages with the title and credentials from config.ini."""
+        dropdowns = "\n  ".join(
+            f'<ul class="{DROPDOWN_CLASS}" style="display:none"><li>Menu {i + 1} item</li></ul>' for i in range(6)
+        )
+        credentials = json.dumps({
+            "username": get_config("login_guvi", "valid_username"),
+            "password": get_config("login_guvi", "valid_password"),
+        })
+        return {
+            "/": HOME_PAGE.format(title=html.escape(get_config("guvi", "title")), dropdowns=dropdowns,
+                                  dobby_title=html.escape(get_config("guvi", "dobby_title"))),
+            "/sign-in/": SIGN_IN_PAGE.format(credentials=credentials),
+            "/register/": REGISTER_PAGE.format(),
+            "/courses/": COURSES_PAGE,
+        }
+
+    def accept_request(self):
+        """Hook for network emulation, False drops the connection (offline)."""
+        return True
+
+    def delay_request(self):
+        """Hook for network emulation, no delay by default."""
+
+    def write_body(self, stream, body):
+        """Hook for network emulation, writes the body at once by default."""
+        stream.write(body)
+
+    def config_overrides(self):
+        """config.ini values pointing the page objects at this server."""
+        base = self.base_url
+        return {
+            "guvi": {"url": f"{base}/", "course_url": f"{base}/courses/?current_tab=paidcourse"},
+            "login_guvi": {"url": f"{base}/sign-in/"},
+            "signup_guvi": {"url": f"{base}/register/"},
+            "dashboard_guvi": {"url": f"{base}/courses/?current_tab=myCourses"},
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="standin-site", daemon=True)
+        self.thread.start()
+        logger.info(f"Stand-in site running at {self.base_url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        logger.info("Stand-in site stopped")
+
+    def __enter__(self):
+        self.start()
+        set_config_overrides(self.config_overrides())
+        return self
+
+    def __exit__(self, *exc):
+        set_config_overrides({})
+        self.stop()
+
+
+def main(argv=None):
+    """Serve the stand-in site until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the GUVI pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    site = StandInSite(args.host, args.port).start()
+    print(f"Serving stand-in GUVI pages at {site.base_url}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+startup_profile.py
+
+Shows where the time goes before the first browser is launched: runs
+"pytest --collect-only" for the given tests under "python -X importtime" and
+reports
+    - the wall time of the whole start-up (interpreter, pytest, conftest, collection)
+    - import time per top-level package (selenium, urllib3, pytest, ...)
+    - import time of every project module, including what it pulled in first
+    - collection time per test module (conftest --collection-profile)
+
+The run fails (exit code 1) when the start-up takes longer than
+[startup_profile] budget_seconds, so it can guard single-test iteration speed.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.startup_profile
+    python -m Project1_Guvi_Automation.utils.startup_profile tests/Test_Guvi_Http_Tier.py --top 20
+"""
+import argparse
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from Project1_Guvi_Automation.config_reader import PROJECT_DIR, get_config
+
+# "import time:       372 |     117739 |         selenium.webdriver"  (microseconds)
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+PROJECT_PACKAGE = "Project1_Guvi_Automation"
+
+
+def parse_importtime(text):
+    """Return (module, self_us, cumulative_us, depth) for every line of -X importtime output."""
+    imports = []
+    for line in text.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append((module, int(own), int(cumulative), (len(indent) - 1) // 2))
+    return imports
+
+
+def by_package(imports):
+    """Total self import time (seconds) per top-level package."""
+    totals = collections.Counter()
+    for module, own, _, _ in imports:
+        totals[module.split(".")[0]] += own / 1e6
+    return totals
+
+
+def project_modules(imports):
+    """Cumulative import time (seconds) of every project module."""
+    return {module: cumulative / 1e6 for module, _, cumulative, _ in imports
+            if module.startswith(PROJECT_PACKAGE + ".")}
+
+
+def profile_startup(pytest_args):
+    """Run the collection once and return the profile as a dict."""
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = os.path.join(tmp, "collection.json")
+        # -s: pytest's output capturing would swallow the import times written during collection
+        command = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q", "-s",
+                   "-p", "no:cacheprovider", "--no-history", "--collection-profile", collection_path,
+                   *[os.path.abspath(arg) if os.path.exists(arg) else arg for arg in pytest_args]]
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=PROJECT_DIR, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"pytest --collect-only failed:\n{result.stdout[-2000:]}")
+        with open(collection_path, encoding="utf-8") as f:
+            collection = json.load(f)
+
+    imports = parse_importtime(result.stderr)
+    return {
+        "wall_seconds": wall,
+        "import_seconds": sum(own for _, own, _, _ in imports) / 1e6,
+        "collection_seconds": collection["collection_seconds"],
+        "items": collection["items"],
+        "packages": by_package(imports),
+        "project_modules": project_modules(imports),
+        "test_modules": collection["modules"],
+    }
+
+
+def print_profile(profile, top):
+    print(f"start-up {profile['wall_seconds']:.2f}s  (imports {profile['import_seconds']:.2f}s, "
+          f"collection of {profile['items']} tests {profile['collection_seconds']:.2f}s)")
+
+    print(f"\n{'package':<40}{'import':>10}")
+    for package, seconds in profile["packages"].most_common(top):
+        print(f"{package:<40}{seconds * 1000:>8.1f}ms")
+
+    print(f"\n{'project module (with its first imports)':<60}{'import':>10}")
+    for module, seconds in sorted(profile["project_modules"].items(), key=lambda m: -m[1])[:top]:
+        print(f"{module[len(PROJECT_PACKAGE) + 1:]:<60}{seconds * 1000:>8.1f}ms")
+
+    print(f"\n{'test module':<60}{'collection':>10}")
+    for module, seconds in sorted(profile["test_modules"].items(), key=lambda m: -m[1]):
+        print(f"{module:<60}{seconds * 1000:>8.1f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the imports and collection before the browser launch")
+    parser.add_argument("pytest_args", nargs="*", default=["tests/Test_Guvi_Page_automation.py"],
+                        help="tests / pytest options to collect (default: the browser suite)")
+    parser.add_argument("--top", type=int, default=int(get_config("startup_profile", "top", "15")))
+    parser.add_argument("--budget", type=float, default=float(get_config("startup_profile", "budget_seconds", "1")),
+                        help="fail when the start-up takes longer than this many seconds")
+    args = parser.parse_args(argv)
+
+    profile = profile_startup(args.pytest_args)
+    print_profile(profile, args.top)
+    if profile["wall_seconds"] > args.budget:
+        print(f"\nStart-up took {profile['wall_seconds']:.2f}s, over the budget of {args.budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+step_timer.py
+
+Records every page-object action performed while a test is running.
+
+Page object methods are wrapped with @timed_step. conftest opens a step log
+for each test with begin_test() and reads it back with end_test() once the
+test has finished, so the timings can be stored or reported.
+
+The step log is kept per thread, so several browser sessions driven from
+their own threads (soak and load runs) each record their own steps.
+"""
+import functools
+import logging
+import threading
+import time
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Per thread: node id of the running test (None outside of a test),
+# steps recorded for it and the stack of steps still running
+_state = threading.local()
+
+# Functions called as listener(event, step, args) when a step "start"s and "end"s, on the step's thread
+_listeners = []
+
+
+def _log():
+    if not hasattr(_state, "steps"):
+        _state.current_test = None
+        _state.steps = []
+        _state.active = []
+    return _state
+
+
+class Step:
+    """A single page-object action and how long it took."""
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.started = time.time()
+        self.duration = None
+        self.ok = None
+
+    def as_dict(self):
+        """Return the step as a plain dict (used for storage and reports)."""
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "started": self.started,
+            "duration": self.duration,
+            "ok": self.ok,
+        }
+
+
+def begin_test(nodeid):
+    """Start a fresh step log for the given test."""
+    log = _log()
+    log.current_test = nodeid
+    log.steps = []
+    log.active = []
+
+
+def end_test():
+    """Close the step log of the current test and return its steps."""
+    log = _log()
+    steps = log.steps
+    log.current_test = None
+    log.steps = []
+    log.active = []
+    return steps
+
+
+def swap_steps(steps):
+    """
+    Record the steps of this thread into the list steps from now on and return the list used so far.
+    Keeps apart the steps of checks interleaved on one thread (utils/tabs.py).
+    """
+    log = _log()
+    previous, log.steps = log.steps, steps
+    return previous
+
+
+def add_listener(listener):
+    """Call listener at the start and end of every step (utils/action_trace.py). It must not raise."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def current_test():
+    """Return the node id of the running test, or None."""
+    return _log().current_test
+
+
+def current_step():
+    """Return the innermost step that is still running, or None."""
+    active = _log().active
+    return active[-1] if active else None
+
+
+def timed_step(func):
+    """
+    Decorator for page-object methods.
+    Times the call and records it as a step of the running test.
+    The step name is the qualified method name, e.g. 'Home_Page.navigate_to_url'.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        log = _log()
+        step = Step(name, len(log.active))
+        log.active.append(step)
+        for listener in _listeners:
+            listener("start", step, args)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            step.ok = True
+            return result
+        except Exception:
+            step.ok = False
+            raise
+        finally:
+            step.duration = time.perf_counter() - start
+            log.active.pop()
+            log.steps.append(step)
+            for listener in _listeners:
+                listener("end", step, args)
+            logger.debug(f"Step {name} took {step.duration:.3f}s")
+
+    return wrapper
@@ -0,0 +1,281 @@
+"""
+stream_report.py
+
+HTML report written while the tests run instead of at session end.
+
+Layout of the report folder:
+    index.html          - static viewer page, written once
+    summary.js          - fixed-size index: totals and per-chunk outcome counts,
+                          rewritten after every test
+    results-00001.js    - result rows, appended as tests finish; a new chunk is
+                          started every `chunk_size` tests
+    logs/<n>.txt        - failure details, linked instead of embedded
+    thumbs/<n>-<name>   - small JPEG of every screenshot, linked to the full image
+
+Every line of a chunk file is a complete JavaScript statement, so a chunk can be
+opened while it is still being written. The viewer only loads the chunk of the
+page being shown, and screenshots are shown as small lazily loaded thumbnails
+linking to the full images, so the report opens instantly whatever the number
+of tests.
+"""
+import json
+import logging
+import os
+import time
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Bounding box of the screenshot thumbnails, in pixels
+THUMBNAIL_SIZE = (320, 180)
+
+
+class StreamReport:
+    """Streams test results into a report folder as they finish."""
+
+    def __init__(self, out_dir, chunk_size=500, title="GUVI Automation Report"):
+        self.out_dir = os.path.abspath(out_dir)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.totals = {}
+        self.duration = 0.0
+        self.chunks = []          # outcome counts per chunk
+        self.notes = []           # extra session lines shown in the summary
+        self.started = time.time()
+        self.finished = None
+        self._chunk_file = None
+
+        os.makedirs(os.path.join(self.out_dir, "logs"), exist_ok=True)
+        os.makedirs(os.path.join(self.out_dir, "thumbs"), exist_ok=True)
+        with open(os.path.join(self.out_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(INDEX_HTML.replace("{{title}}", title))
+        self._write_summary()
+        logger.info(f"Streaming report to {self.out_dir}")
+
+    # ---------------------- WRITING ----------------------
+
+    def add_result(self, nodeid, outcome, duration, screenshots=(), longrepr=None, properties=None):
+        """Append one test result to the current chunk and refresh the summary."""
+        if self.count % self.chunk_size == 0:
+            self._start_chunk()
+        self.count += 1
+        chunk = len(self.chunks) - 1
+
+        row = {
+            "n": self.count,
+            "id": nodeid,
+            "outcome": outcome,
+            "duration": round(duration, 3),
+            "shots": [[self._relative(path), self._thumbnail(path)] for path in screenshots],
+        }
+        if longrepr:
+            log_name = f"logs/{self.count}.txt"
+            with open(os.path.join(self.out_dir, log_name), "w", encoding="utf-8") as f:
+                f.write(longrepr)
+            row["log"] = log_name
+        if properties:
+            row["props"] = {str(k): str(v) for k, v in properties}
+
+        self._chunk_file.write(f"reportRow({chunk}, {_js(row)});\n")
+        self._chunk_file.flush()
+
+        self.totals[outcome] = self.totals.get(outcome, 0) + 1
+        self.chunks[-1][outcome] = self.chunks[-1].get(outcome, 0) + 1
+        self.duration += duration
+        self._write_summary()
+
+    def add_note(self, text, link=None):
+        """Add a session level line (e.g. a link to another artifact) to the summary."""
+        self.notes.append({"text": text, "link": self._relative(link) if link else None})
+        self._write_summary()
+
+    def close(self):
+        """Finish the last chunk and mark the run as finished."""
+        if self._chunk_file:
+            self._chunk_file.close()
+            self._chunk_file = None
+        self.finished = time.time()
+        self._write_summary()
+        logger.info(f"Report written: {os.path.join(self.out_dir, 'index.html')}")
+
+    # ---------------------- HELPERS ----------------------
+
+    def _start_chunk(self):
+        if self._chunk_file:
+            self._chunk_file.close()
+        self.chunks.append({})
+        name = f"results-{len(self.chunks):05d}.js"
+        self._chunk_file = open(os.path.join(self.out_dir, name), "w", encoding="utf-8")
+
+    def _write_summary(self):
+        summary = {
+            "started": self.started,
+            "finished": self.finished,
+            "count": self.count,
+            "duration": round(self.duration, 3),
+            "totals": self.totals,
+            "chunks": self.chunks,
+            "notes": self.notes,
+        }
+        # Write to a temp file first so the viewer never reads a half written summary
+        path = os.path.join(self.out_dir, "summary.js")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(f"reportSummary({_js(summary)});\n")
+        os.replace(path + ".tmp", path)
+
+    def _thumbnail(self, path):
+        """Write a small JPEG of a screenshot into thumbs/ and return its path; the full image when that fails."""
+        from PIL import Image
+
+        name = f"thumbs/{self.count}-{os.path.splitext(os.path.basename(path))[0]}.jpg"
+        try:
+            with Image.open(path) as image:
+                image.thumbnail(THUMBNAIL_SIZE)
+                image.convert("RGB").save(os.path.join(self.out_dir, name), "JPEG", quality=70)
+        except OSError as e:
+            logger.warning(f"No thumbnail for {path}: {e}")
+            return self._relative(path)
+        return name
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.out_dir).replace(os.sep, "/")
+
+
+def new_screenshots(folder, since):
+    """Return the screenshots in folder written at or after the given timestamp."""
+    if not os.path.isdir(folder):
+        return []
+    with os.scandir(folder) as entries:
+        return sorted(entry.path for entry in entries
+                      if entry.is_file() and entry.name.endswith(".png") and entry.stat().st_mtime >= since)
+
+
+def _js(value):
+    # "</" must not appear inside an inline script payload
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{title}}</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 16px; color: #222; }
+h1 { font-size: 22px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #f2f2f2; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped { color: #f57c00; }
+.controls { margin: 12px 0; }
+.controls label { margin-right: 10px; }
+img.shot { width: 160px; height: 90px; object-fit: cover; border: 1px solid #ccc; }
+#pager button { margin-right: 4px; }
+</style>
+</head>
+<body>
+<h1>{{title}}</h1>
+<div id="summary">Loading summary...</div>
+<ul id="notes"></ul>
+<div class="controls">
+  <label><input type="checkbox" class="outcome" value="passed" checked> passed</label>
+  <label><input type="checkbox" class="outcome" value="failed" checked> failed</label>
+  <label><input type="checkbox" class="outcome" value="error" checked> error</label>
+  <label><input type="checkbox" class="outcome" value="skipped" checked> skipped</label>
+  <input type="search" id="search" placeholder="Filter by test name">
+</div>
+<div id="pager"></div>
+<table>
+  <thead><tr><th>#</th><th>Test</th><th>Result</th><th>Duration (s)</th><th>Screenshots</th><th>Details</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+var summary = null, rows = {}, page = 0;
+
+function reportSummary(s) { summary = s; renderSummary(); }
+function reportRow(chunk, row) { (rows[chunk] = rows[chunk] || []).push(row); }
+
+function load(src, done) {
+  var el = document.createElement("script");
+  el.src = src + "?t=" + Date.now();
+  el.onload = function () { el.remove(); if (done) done(); };
+  el.onerror = el.onload;
+  document.head.appendChild(el);
+}
+
+function wanted() {
+  var out = {};
+  document.querySelectorAll(".outcome").forEach(function (c) { out[c.value] = c.checked; });
+  return out;
+}
+
+function chunkMatches(i) {
+  // Skip chunks without any result of a selected outcome, using only the summary
+  var counts = summary.chunks[i] || {}, w = wanted();
+  return Object.keys(counts).some(function (k) { return w[k] !== false && counts[k] > 0; });
+}
+
+function renderSummary() {
+  var t = summary.totals, parts = [];
+  Object.keys(t).forEach(function (k) { parts.push('<span class="' + k + '">' + t[k] + " " + k + "</span>"); });
+  var state = summary.finished ? "finished" : "running";
+  document.getElementById("summary").innerHTML = summary.count + " tests (" + state + ") in " +
+    summary.duration.toFixed(1) + "s: " + parts.join(", ");
+  document.getElementById("notes").innerHTML = summary.notes.map(function (n) {
+    return "<li>" + (n.link ? '<a href="' + n.link + '">' + escapeHtml(n.text) + "</a>" : escapeHtml(n.text)) + "</li>";
+  }).join("");
+  var pager = document.getElementById("pager");
+  pager.innerHTML = "";
+  summary.chunks.forEach(function (_, i) {
+    if (!chunkMatches(i)) return;
+    var b = document.createElement("button");
+    b.textContent = "Page " + (i + 1);
+    b.disabled = i === page;
+    b.onclick = function () { showPage(i); };
+    pager.appendChild(b);
+  });
+}
+
+function showPage(i) {
+  page = i;
+  renderSummary();
+  rows[i] = [];
+  load("results-" + String(i + 1).padStart(5, "0") + ".js", renderRows);
+}
+
+function renderRows() {
+  var w = wanted(), q = document.getElementById("search").value.toLowerCase();
+  var html = (rows[page] || []).filter(function (r) {
+    return w[r.outcome] !== false && r.id.toLowerCase().indexOf(q) !== -1;
+  }).map(function (r) {
+    var shots = r.shots.map(function (s) {
+      return '<a href="' + s[0] + '"><img class="shot" loading="lazy" src="' + s[1] + '"></a>';
+    }).join(" ");
+    var details = r.log ? '<a href="' + r.log + '">log</a>' : "";
+    if (r.props) details += " " + escapeHtml(Object.keys(r.props).map(function (k) { return k + "=" + r.props[k]; }).join(", "));
+    return "<tr><td>" + r.n + "</td><td>" + escapeHtml(r.id) + '</td><td class="' + r.outcome + '">' + r.outcome +
+      "</td><td>" + r.duration.toFixed(2) + "</td><td>" + shots + "</td><td>" + details + "</td></tr>";
+  });
+  document.getElementById("rows").innerHTML = html.join("");
+}
+
+function escapeHtml(s) {
+  return String(s).replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; });
+}
+
+document.querySelectorAll(".outcome").forEach(function (c) {
+  c.onchange = function () { renderSummary(); renderRows(); };
+});
+document.getElementById("search").oninput = renderRows;
+
+load("summary.js", function () {
+  if (summary.chunks.length) showPage(0);
+  // Keep refreshing while the run is still in progress
+  var timer = setInterval(function () {
+    load("summary.js", function () { if (summary.finished) clearInterval(timer); });
+  }, 5000);
+});
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,306 @@
+"""
+synthetic_monitor.py
+
+Long-running synthetic monitoring of the GUVI site (or the local stand-in).
+
+The daemon runs the checks of utils/journeys.py (homepage = TC1/TC2,
+valid_login = TC6, dobby = TC9) on their own intervals with one warm
+browser, keeps the recent results in memory (bounded by count and age) and
+serves them as Prometheus text metrics on http://host:port/metrics:
+
+    synthetic_check_up                      1 when the last run passed
+    synthetic_check_availability_ratio      share of retained runs that passed
+    synthetic_check_runs_total              runs by result
+    synthetic_check_skipped_runs_total      runs skipped because the browser was busy past their slot
+    synthetic_check_duration_seconds        p50/p95/p99 of the check
+    synthetic_step_duration_seconds         p50/p95/p99 of every page-object step
+    synthetic_measurement_seconds           p50/p95/p99 of extra measurements (Dobby widget ready, ...)
+    synthetic_browser_restarts_total        browser restarts
+
+Checks never overlap: there is one browser and one runner. When a check
+overruns, the slots it made the others miss are skipped and counted, not
+queued, so the schedule never piles up.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.synthetic_monitor
+    python -m Project1_Guvi_Automation.utils.synthetic_monitor --standin-site --checks homepage:30,dobby:60
+"""
+import argparse
+import collections
+import heapq
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.common.exceptions import WebDriverException
+
+from Project1_Guvi_Automation.config_reader import get_config
+from Project1_Guvi_Automation.utils import step_timer
+from Project1_Guvi_Automation.utils.driver_factory import create_driver
+from Project1_Guvi_Automation.utils.journeys import CHECKS
+from Project1_Guvi_Automation.utils.run_history import percentile
+from Project1_Guvi_Automation.utils.soak import session_alive
+from Project1_Guvi_Automation.utils.standin_site import StandInSite
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+QUANTILES = (50, 95, 99)
+
+
+class CheckResult:
+    """Outcome of one run of a check."""
+
+    def __init__(self, started, duration, ok, steps, measurements, error=None):
+        self.started = started
+        self.duration = duration
+        self.ok = ok
+        self.steps = steps                  # step name -> seconds
+        self.measurements = measurements    # name -> seconds
+        self.error = error
+
+
+class ResultStore:
+    """Recent results per check, bounded by count and by age; counters are kept forever."""
+
+    def __init__(self, max_results, max_age_seconds):
+        self.max_age = max_age_seconds
+        self.results = collections.defaultdict(lambda: collections.deque(maxlen=max_results))
+        self.runs = collections.Counter()       # (check, result) -> count
+        self.skipped = collections.Counter()    # check -> count
+        self.restarts = 0
+        self.lock = threading.Lock()
+
+    def add(self, check, result):
+        with self.lock:
+            self.results[check].append(result)
+            self.runs[(check, "success" if result.ok else "failure")] += 1
+            self._prune(check)
+
+    def skip(self, check, count):
+        with self.lock:
+            self.skipped[check] += count
+
+    def restarted(self):
+        with self.lock:
+            self.restarts += 1
+
+    def _prune(self, check):
+        oldest = time.time() - self.max_age
+        results = self.results[check]
+        while results and results[0].started < oldest:
+            results.popleft()
+
+    def metrics(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                value = repr(float(value)) if isinstance(value, float) else str(value)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        def quantiles(values, labels):
+            return [({**labels, "quantile": str(q / 100)}, percentile(values, q)) for q in QUANTILES if values]
+
+        with self.lock:
+            for check in list(self.results):
+                self._prune(check)
+            checks = {check: list(results) for check, results in self.results.items()}
+
+            up, availability, last_run, durations, steps, measurements = [], [], [], [], [], []
+            for check, results in sorted(checks.items()):
+                if not results:
+                    continue
+                up.append(({"check": check}, 1 if results[-1].ok else 0))
+                availability.append(({"check": check}, sum(r.ok for r in results) / len(results)))
+                last_run.append(({"check": check}, results[-1].started))
+                durations += quantiles([r.duration for r in results], {"check": check})
+
+                by_step, by_measurement = collections.defaultdict(list), collections.defaultdict(list)
+                for result in results:
+                    for name, seconds in result.steps.items():
+                        by_step[name].append(seconds)
+                    for name, seconds in result.measurements.items():
+                        by_measurement[name].append(seconds)
+                for name, values in sorted(by_step.items()):
+                    steps += quantiles(values, {"check": check, "step": name})
+                for name, values in sorted(by_measurement.items()):
+                    measurements += quantiles(values, {"check": check, "measurement": name})
+
+            metric("synthetic_check_up", "gauge", "1 when the last run of the check passed", up)
+            metric("synthetic_check_availability_ratio", "gauge",
+                   "Share of the retained runs that passed", availability)
+            metric("synthetic_check_last_run_timestamp_seconds", "gauge", "Start time of the last run", last_run)
+            metric("synthetic_check_runs_total", "counter", "Runs of the check by result",
+                   [({"check": c, "result": r}, n) for (c, r), n in sorted(self.runs.items())])
+            metric("synthetic_check_skipped_runs_total", "counter",
+                   "Scheduled runs skipped because an earlier run overran",
+                   [({"check": c}, n) for c, n in sorted(self.skipped.items())])
+            metric("synthetic_check_duration_seconds", "summary", "Duration of the check", durations)
+            metric("synthetic_step_duration_seconds", "summary", "Duration of the page-object steps", steps)
+            metric("synthetic_measurement_seconds", "summary",
+                   "Extra timings measured by the checks (Dobby widget ready, ...)", measurements)
+            metric("synthetic_browser_restarts_total", "counter", "Browser restarts", [({}, self.restarts)])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Monitor:
+    """Runs the checks on their intervals with one warm browser."""
+
+    def __init__(self, intervals, store, browser, headless):
+        self.intervals = intervals     # check -> seconds
+        self.store = store
+        self.browser = browser
+        self.headless = headless
+        self.driver = None
+        self.stopping = threading.Event()
+
+    def _ensure_browser(self):
+        if self.driver is not None and session_alive(self.driver):
+            return
+        if self.driver is not None:
+            logger.warning("Browser is gone, restarting it")
+            self._quit()
+            self.store.restarted()
+        self.driver = create_driver(self.browser, headless=self.headless)
+        self.driver.implicitly_wait(10)
+
+    def run_check(self, name):
+        started = time.time()
+        step_timer.begin_test(f"monitor:{name}")
+        start = time.perf_counter()
+        measurements, error = {}, None
+        try:
+            self._ensure_browser()
+            measurements = CHECKS[name](self.driver) or {}
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Check {name} failed: {error}")
+        duration = time.perf_counter() - start
+        steps = {}
+        for step in step_timer.end_test():
+            if step.depth == 0:
+                steps[step.name] = steps.get(step.name, 0.0) + step.duration
+        self.store.add(name, CheckResult(started, duration, error is None, steps, measurements, error))
+
+    def run(self):
+        """Run until stop() is called; each check has exactly one pending slot."""
+        now = time.monotonic()
+        # Stagger the first runs so the checks don't all start together
+        schedule = [(now + i, name) for i, name in enumerate(self.intervals)]
+        heapq.heapify(schedule)
+        try:
+            while not self.stopping.is_set():
+                due, name = schedule[0]
+                if self.stopping.wait(max(0.0, due - time.monotonic())):
+                    break
+                heapq.heappop(schedule)
+                self.run_check(name)
+
+                # Next slot after now; slots missed while the browser was busy are skipped
+                interval = self.intervals[name]
+                missed = int((time.monotonic() - due) // interval)
+                if missed:
+                    self.store.skip(name, missed)
+                heapq.heappush(schedule, (due + (missed + 1) * interval, name))
+        finally:
+            self._quit()
+
+    def stop(self):
+        self.stopping.set()
+
+    def _quit(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+
+def serve_metrics(store, host, port):
+    """Start the /metrics endpoint in a background thread and return the server."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = store.metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def parse_intervals(text):
+    """'homepage:60,dobby:120' -> {"homepage": 60.0, "dobby": 120.0}"""
+    intervals = {}
+    for part in text.split(","):
+        name, seconds = part.split(":")
+        if name.strip() not in CHECKS:
+            raise ValueError(f"Unknown check {name!r}, choose from {', '.join(CHECKS)}")
+        intervals[name.strip()] = float(seconds)
+    return intervals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run synthetic checks continuously and serve /metrics")
+    parser.add_argument("--checks", default=get_config("monitor", "checks", "homepage:60,valid_login:300,dobby:120"),
+                        help="comma separated check:interval_seconds")
+    parser.add_argument("--host", default=get_config("monitor", "host", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(get_config("monitor", "port", "9109")))
+    parser.add_argument("--browser", default=get_config("browser_name", "browser"))
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--standin-site", action="store_true", help="monitor the local stand-in site")
+    args = parser.parse_args(argv)
+    try:
+        intervals = parse_intervals(args.checks)
+    except ValueError as e:
+        parser.error(str(e))
+
+    store = ResultStore(int(get_config("monitor", "retention_runs", "1000")),
+                        float(get_config("monitor", "retention_minutes", "1440")) * 60)
+    monitor = Monitor(intervals, store, args.browser, not args.headed)
+    server = serve_metrics(store, args.host, args.port)
+    print(f"Serving metrics at http://{args.host}:{server.server_address[1]}/metrics (Ctrl+C to stop)")
+
+    def run():
+        try:
+            monitor.run()
+        except KeyboardInterrupt:
+            print("Interrupted, stopping the monitor")
+
+    try:
+        if args.standin_site:
+            with StandInSite():
+                run()
+        else:
+            run()
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+tabs.py
+
+Runs independent read-only checks interleaved across the tabs of one browser.
+
+A check is a generator function taking a Tab. It starts slow work without
+waiting for it (with the "none" page load strategy driver.get() and clicks
+return at once), then yields a condition - a callable(driver) like the ones
+of utils/conditions.py. The scheduler resumes the check with the condition's
+value once it holds in the check's tab, and meanwhile sends commands to the
+other tabs, so one slow page load no longer holds up every check.
+
+The browser remembers one frame per session, not per tab: a check must switch
+back to the default content before it yields.
+
+Example:
+    def title_check(tab):
+        homepage = Home_Page(tab.driver, window=tab.handle)
+        homepage.start_loading()
+        yield homepage.loaded
+        assert tab.driver.title == get_config("guvi", "title")
+
+    results = TabScheduler(driver, tabs=3).run({"title": title_check})
+"""
+import collections
+import logging
+import os
+import time
+import weakref
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from Project1_Guvi_Automation.utils import step_timer
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Exceptions meaning "not yet" while a condition is evaluated, like WebDriverWait
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+# Window each driver was last switched to by focus(), so switching costs nothing when it's already there
+_focused = weakref.WeakKeyDictionary()
+
+
+def focus(driver, handle):
+    """Send the next commands of driver to the window handle."""
+    if _focused.get(driver) != handle:
+        driver.switch_to.window(handle)
+        _focused[driver] = handle
+
+
+def focused(driver):
+    """Window handle of the last focus(), None for a driver used with a single window."""
+    return _focused.get(driver)
+
+
+class Tab:
+    """A browser tab of the scheduler and the check it is running."""
+
+    def __init__(self, driver, handle, index):
+        self.driver = driver
+        self.handle = handle
+        self.index = index
+        self.name = None          # check running in the tab, None when idle
+        self.check = None         # generator of the check
+        self.condition = None     # condition it waits for
+        self.deadline = None
+        self.outcome = None
+
+    def focus(self):
+        focus(self.driver, self.handle)
+
+
+class Outcome:
+    """Result of one check: its error (None when passed), duration, tab and page-object steps."""
+
+    def __init__(self, name, tab):
+        self.name = name
+        self.tab = tab
+        self.started = time.perf_counter()
+        self.duration = None
+        self.error = None
+        self.steps = []
+        self.screenshot = None
+
+    @property
+    def passed(self):
+        return self.duration is not None and self.error is None
+
+
+class TabScheduler:
+    """
+    Cooperative scheduler running checks in tabs tabs of driver.
+
+    wait_seconds - how long a yielded condition may take before TimeoutException is thrown into the check
+    poll_seconds - pause when no condition of any tab holds yet
+    screenshots_dir - where a failing check's tab is saved as MultiTab_<name>_Failed.png
+    on_open - called with the driver focused on each new tab, e.g. to register page scripts
+    """
+
+    def __init__(self, driver, tabs=3, wait_seconds=30, poll_seconds=0.05, screenshots_dir=None, on_open=None):
+        self.driver = driver
+        self.tab_count = max(1, tabs)
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self.screenshots_dir = screenshots_dir
+        self.on_open = on_open
+        self.tabs = []
+
+    def open_tabs(self):
+        """Use the current window as the first tab and open the others."""
+        if self.tabs:
+            return self.tabs
+        first = self.driver.current_window_handle
+        _focused[self.driver] = first
+        handles = [first]
+        for _ in range(self.tab_count - 1):
+            self.driver.switch_to.new_window("tab")
+            handles.append(self.driver.current_window_handle)
+            _focused[self.driver] = handles[-1]
+        self.tabs = [Tab(self.driver, handle, index) for index, handle in enumerate(handles)]
+        if self.on_open:
+            for tab in self.tabs:
+                tab.focus()
+                self.on_open(self.driver)
+        logger.info(f"Opened {len(self.tabs)} tabs for the interleaved checks")
+        return self.tabs
+
+    def run(self, checks):
+        """Run {name: check function} and return {name: Outcome} once every check finished."""
+        queue = collections.deque(checks.items())
+        outcomes = {}
+        tabs = self.open_tabs()
+        start = time.perf_counter()
+
+        while queue or any(tab.check for tab in tabs):
+            progressed = False
+            for tab in tabs:
+                if tab.check is None and queue:
+                    name, check = queue.popleft()
+                    self._start(tab, name, check)
+                    outcomes[name] = tab.outcome
+                    progressed = True
+                elif tab.check is not None:
+                    progressed |= self._poll(tab)
+            if not progressed:
+                time.sleep(self.poll_seconds)
+
+        passed = sum(outcome.passed for outcome in outcomes.values())
+        logger.info(f"{passed} of {len(outcomes)} checks passed in {len(tabs)} tabs "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return outcomes
+
+    def _start(self, tab, name, check):
+        logger.info(f"Starting check {name} in tab {tab.index}")
+        tab.name = name
+        tab.outcome = Outcome(name, tab.index)
+        tab.focus()
+        generator = check(tab)
+        self._advance(tab, lambda: generator.send(None), generator)
+
+    def _poll(self, tab):
+        """Evaluate the condition the tab waits for; resume the check when it holds. True when the check advanced."""
+        tab.focus()
+        try:
+            value = tab.condition(tab.driver)
+        except IGNORED_EXCEPTIONS:
+            value = None
+        except Exception as e:
+            self._advance(tab, lambda: tab.check.throw(e))
+            return True
+
+        if value:
+            self._advance(tab, lambda: tab.check.send(value))
+            return True
+        if time.monotonic() > tab.deadline:
+            error = TimeoutException(f"{getattr(tab.condition, '__name__', tab.condition)} not met "
+                                     f"within {self.wait_seconds:g}s in tab {tab.index}")
+            self._advance(tab, lambda: tab.check.throw(error))
+            return True
+        return False
+
+    def _advance(self, tab, resume, generator=None):
+        """Run the check until its next condition (or its end), recording its page-object steps apart."""
+        previous = step_timer.swap_steps(tab.outcome.steps)
+        try:
+            condition = resume()
+        except StopIteration:
+            self._finish(tab, None)
+            return
+        except Exception as e:
+            self._finish(tab, e)
+            return
+        finally:
+            step_timer.swap_steps(previous)
+
+        if generator is not None:
+            tab.check = generator
+        tab.condition = condition
+        tab.deadline = time.monotonic() + self.wait_seconds
+
+    def _finish(self, tab, error):
+        outcome = tab.outcome
+        outcome.duration = time.perf_counter() - outcome.started
+        outcome.error = error
+        if error is None:
+            logger.info(f"Check {tab.name} passed in tab {tab.index} ({outcome.duration:.2f}s)")
+        else:
+            logger.error(f"Check {tab.name} failed in tab {tab.index}: {error}")
+            if self.screenshots_dir:
+                outcome.screenshot = os.path.join(self.screenshots_dir, f"MultiTab_{tab.name}_Failed.png")
+                try:
+                    tab.driver.switch_to.default_content()
+                    tab.driver.save_screenshot(outcome.screenshot)
+                except Exception as e:
+                    logger.warning(f"Could not save the screenshot of tab {tab.index}: {e}")
+        tab.name = tab.check = tab.condition = tab.deadline = None
@@ -0,0 +1,291 @@
+"""
+visual_diff.py
+
+Visual regression check of the test screenshots against stored baselines.
+
+Each screenshot in screenshots/ is compared with the file of the same name in
+the baseline folder:
+    1. perceptual hash (DCT pHash) of both images: when the hashes are within
+       hash_threshold bits, the screenshot matches and no diff is computed
+    2. otherwise a vectorized NumPy diff: per-pixel (share of pixels whose
+       colour moved more than `tolerance`) or SSIM (structural similarity)
+
+Regions with dynamic content (carousels, counters, the Dobby bubble, ...) are
+masked with rectangles from the masks JSON file:
+    {"TC9_Verify_dobby.png": [[x, y, width, height]], "*": [[0, 0, 1920, 80]]}
+Keys are file name patterns, "*" applies to every screenshot.
+
+Comparisons run in a process pool. For every differing screenshot a diff
+image is written (changed pixels in red over the dimmed screenshot) and an
+index.html links them all.
+
+Usage (from the repository root):
+    python -m Project1_Guvi_Automation.utils.visual_diff
+    python -m Project1_Guvi_Automation.utils.visual_diff --method ssim
+    python -m Project1_Guvi_Automation.utils.visual_diff --update TC1_Verify_url.png
+    python -m Project1_Guvi_Automation.utils.visual_diff --screenshots matrix_results/chrome-default/screenshots
+"""
+import argparse
+import fnmatch
+import html
+import json
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from Project1_Guvi_Automation.config_reader import artifact_path, get_config, project_path
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# SSIM stabilising constants for 8-bit images
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+SSIM_WINDOW = 7
+
+
+# ---------------------- IMAGES ----------------------
+
+def load_image(path):
+    """Load an image as an RGB uint8 array of shape (height, width, 3)."""
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def grayscale(rgb):
+    """Luma of an RGB array as float32 (ITU-R BT.601 weights)."""
+    return rgb.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def mask_regions(actual, baseline, regions):
+    """Copy the baseline pixels into the masked regions of actual, so they never differ."""
+    if not regions:
+        return actual
+    actual = actual.copy()
+    for x, y, width, height in regions:
+        actual[y:y + height, x:x + width] = baseline[y:y + height, x:x + width]
+    return actual
+
+
+def masks_for(name, masks):
+    """Rectangles of all mask patterns matching a screenshot name."""
+    return [region for pattern, regions in masks.items() if fnmatch.fnmatch(name, pattern) for region in regions]
+
+
+def _dct_matrix(size):
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix * np.sqrt(2 / size)
+
+
+_DCT_32 = _dct_matrix(32)
+
+
+def phash(rgb):
+    """64-bit perceptual hash: signs of the low DCT frequencies of a 32x32 thumbnail."""
+    thumbnail = Image.fromarray(rgb).convert("L").resize((32, 32), Image.LANCZOS)
+    dct = _DCT_32 @ np.asarray(thumbnail, dtype=np.float64) @ _DCT_32.T
+    low = dct[:8, :8].flatten()[1:]   # skip the DC term, it only says how bright the image is
+    bits = low > np.median(low)
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+# ---------------------- DIFFS ----------------------
+
+def pixel_diff(actual, baseline, tolerance):
+    """Boolean map of the pixels whose colour changed by more than tolerance in any channel."""
+    return (np.abs(actual.astype(np.int16) - baseline.astype(np.int16)) > tolerance).any(axis=2)
+
+
+def _box_mean(image, window):
+    """Mean over a window x window box around every pixel, through an integral image."""
+    pad = window // 2
+    padded = np.pad(image, pad + 1, mode="edge")
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    height, width = image.shape
+    total = (integral[window:window + height, window:window + width]
+             - integral[:height, window:window + width]
+             - integral[window:window + height, :width]
+             + integral[:height, :width])
+    return total / (window * window)
+
+
+def ssim(actual, baseline, window=SSIM_WINDOW):
+    """Mean structural similarity of two RGB arrays (1.0 = identical)."""
+    a, b = grayscale(actual).astype(np.float64), grayscale(baseline).astype(np.float64)
+    mu_a, mu_b = _box_mean(a, window), _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a ** 2
+    var_b = _box_mean(b * b, window) - mu_b ** 2
+    covariance = _box_mean(a * b, window) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + SSIM_C1) * (2 * covariance + SSIM_C2)) / \
+               ((mu_a ** 2 + mu_b ** 2 + SSIM_C1) * (var_a + var_b + SSIM_C2))
+    return float(ssim_map.mean())
+
+
+def diff_image(actual, changed, regions):
+    """Dimmed screenshot with the changed pixels in red and the masked regions in grey."""
+    image = (grayscale(actual) * 0.35 + 100).astype(np.uint8)
+    image = np.repeat(image[:, :, None], 3, axis=2)
+    for x, y, width, height in regions:
+        image[y:y + height, x:x + width] = (200, 200, 200)
+    image[changed] = (255, 0, 0)
+    return Image.fromarray(image)
+
+
+# ---------------------- COMPARING ----------------------
+
+def compare_pair(name, actual_path, baseline_path, diff_path, regions, method, tolerance, hash_threshold, limit):
+    """
+    Compare one screenshot with its baseline. Runs in a worker process.
+    status is new (no baseline), size (dimensions differ), match or diff.
+    """
+    result = {"name": name, "status": "match", "hash_distance": None, "score": None, "diff": None}
+    if not os.path.exists(baseline_path):
+        result["status"] = "new"
+        return result
+
+    actual, baseline = load_image(actual_path), load_image(baseline_path)
+    if actual.shape != baseline.shape:
+        result["status"] = "size"
+        result["score"] = f"{actual.shape[1]}x{actual.shape[0]} vs {baseline.shape[1]}x{baseline.shape[0]}"
+        return result
+
+    actual = mask_regions(actual, baseline, regions)
+    result["hash_distance"] = hamming(phash(actual), phash(baseline))
+    if result["hash_distance"] <= hash_threshold:
+        return result
+
+    changed = pixel_diff(actual, baseline, tolerance)
+    if method == "ssim":
+        result["score"] = ssim(actual, baseline)
+        differs = result["score"] < limit
+    else:
+        result["score"] = float(changed.mean())
+        differs = result["score"] > limit
+
+    if differs:
+        result["status"] = "diff"
+        os.makedirs(os.path.dirname(diff_path), exist_ok=True)
+        diff_image(actual, changed, regions).save(diff_path)
+        result["diff"] = diff_path
+    return result
+
+
+def load_masks(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_all(names=None, method=None, workers=None, screenshots_dir=None):
+    """
+    Compare the screenshots (all of them, or the given file names) with their
+    baselines in a process pool and return the list of results.
+    screenshots_dir defaults to the project's [visual_diff] screenshots_dir.
+    """
+    screenshots_dir = screenshots_dir or project_path(get_config("visual_diff", "screenshots_dir", "screenshots"))
+    baseline_dir = project_path(get_config("visual_diff", "baseline_dir", "visual_baselines"))
+    diff_dir = artifact_path(get_config("visual_diff", "diff_dir", "visual_diffs"))
+    masks = load_masks(project_path(get_config("visual_diff", "masks_path", "visual_masks.json")))
+    method = method or get_config("visual_diff", "method", "pixel")
+    tolerance = int(get_config("visual_diff", "tolerance", "16"))
+    hash_threshold = int(get_config("visual_diff", "hash_threshold", "0"))
+    if method == "ssim":
+        limit = float(get_config("visual_diff", "min_ssim", "0.995"))
+    else:
+        limit = float(get_config("visual_diff", "max_diff_ratio", "0.001"))
+    workers = workers or int(get_config("visual_diff", "workers", "0")) or os.cpu_count()
+
+    if names is None:
+        names = sorted(n for n in os.listdir(screenshots_dir) if n.lower().endswith(".png"))
+    tasks = [
+        (name, os.path.join(screenshots_dir, name), os.path.join(baseline_dir, name),
+         os.path.join(diff_dir, name), masks_for(name, masks), method, tolerance, hash_threshold, limit)
+        for name in names
+    ]
+    if not tasks:
+        return []
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        results = list(pool.map(compare_pair, *zip(*tasks), chunksize=max(1, len(tasks) // (workers * 4))))
+    write_index(diff_dir, results, screenshots_dir, baseline_dir)
+    return results
+
+
+def update_baselines(names, screenshots_dir=None):
+    """Copy the given screenshots into the baseline folder."""
+    screenshots_dir = screenshots_dir or project_path(get_config("visual_diff", "screenshots_dir", "screenshots"))
+    baseline_dir = project_path(get_config("visual_diff", "baseline_dir", "visual_baselines"))
+    os.makedirs(baseline_dir, exist_ok=True)
+    for name in names:
+        shutil.copy2(os.path.join(screenshots_dir, name), os.path.join(baseline_dir, name))
+        logger.info(f"Baseline updated: {name}")
+
+
+def write_index(diff_dir, results, screenshots_dir, baseline_dir):
+    """HTML page linking baseline, screenshot and diff image of every differing screenshot."""
+    os.makedirs(diff_dir, exist_ok=True)
+    rows = []
+    for result in results:
+        if result["status"] == "match":
+            continue
+        cells = [html.escape(result["name"]), result["status"], html.escape(str(result["score"]))]
+        images = [os.path.join(baseline_dir, result["name"]), os.path.join(screenshots_dir, result["name"])]
+        if result["diff"]:
+            images.append(result["diff"])
+        links = " ".join(
+            f'<a href="{html.escape(os.path.relpath(p, diff_dir))}"><img src="{html.escape(os.path.relpath(p, diff_dir))}" '
+            f'loading="lazy" width="320"></a>' for p in images if os.path.exists(p)
+        )
+        rows.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + f"<td>{links}</td></tr>")
+    matched = sum(1 for r in results if r["status"] == "match")
+    with open(os.path.join(diff_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Visual diff</title></head><body>"
+            f"<h1>Visual diff</h1><p>{matched} of {len(results)} screenshots match their baseline.</p>"
+            "<table border='1' cellpadding='4'><tr><th>Screenshot</th><th>Status</th><th>Score</th>"
+            "<th>Baseline / Screenshot / Diff</th></tr>" + "".join(rows) + "</table></body></html>"
+        )
+
+
+# ---------------------- CLI ----------------------
+
+def main(argv=None):
+    """Compare the screenshots with their baselines; exits with 1 when any differs."""
+    parser = argparse.ArgumentParser(description="Compare test screenshots with their baselines")
+    parser.add_argument("names", nargs="*", help="screenshot file names (default: all)")
+    parser.add_argument("--method", choices=["pixel", "ssim"], default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--update", action="store_true", help="store the screenshots as the new baselines")
+    parser.add_argument("--screenshots", default=None,
+                        help="folder the tests saved the screenshots to (default: [visual_diff] screenshots_dir "
+                             "in the project folder), e.g. matrix_results/chrome-default/screenshots")
+    args = parser.parse_args(argv)
+
+    screenshots_dir = os.path.abspath(args.screenshots) if args.screenshots else None
+    results = compare_all(args.names or None, args.method, args.workers, screenshots_dir)
+    if args.update:
+        update_baselines([r["name"] for r in results if r["status"] != "match"], screenshots_dir)
+        return 0
+
+    for result in results:
+        print(f"{result['name']:<45} {result['status']:<6} hash={result['hash_distance']} score={result['score']}")
+    failed = [r for r in results if r["status"] in ("diff", "size")]
+    print(f"{len(results) - len(failed)} of {len(results)} screenshots OK, {len(failed)} differ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())